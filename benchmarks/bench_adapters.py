@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+from oracle.adapters import (
+    emit_birdseye_trace,
+    emit_coverage_summary,
+    emit_hunter_events,
+    emit_pytest_hypothesis_case,
+    emit_snoop_trace,
+    emit_viztracer_trace,
+)
+
+
+def _adapter_calls(records: int) -> dict[str, tuple[Callable[..., Any], dict[str, Any], int]]:
+    hunter = [{"kind": "call", "function": f"f{n}", "filepath": "algo.py", "lineno": n} for n in range(records)]
+    viztracer = [{"name": f"f{n}", "duration_us": n, "start_us": n * 2} for n in range(records)]
+    snoop = [{"seq": n, "message": f"x={n}", "filepath": "algo.py", "lineno": n} for n in range(records)]
+    birdseye = [{"module": "algo", "function": f"f{n}", "filepath": "algo.py", "lineno": n} for n in range(records)]
+    # name -> (adapter, keyword arguments, events emitted per call)
+    return {
+        "pytest_hypothesis": (
+            emit_pytest_hypothesis_case,
+            {"nodeid": "tests/test_algo.py::test_sort", "outcome": "pass", "hypothesis_example": {"xs": [3, 1, 2]}},
+            4,
+        ),
+        "coverage": (emit_coverage_summary, {"covered_lines": 90, "total_lines": 100}, 4),
+        "hunter": (emit_hunter_events, {"events": hunter}, records + 3),
+        "viztracer": (emit_viztracer_trace, {"records": viztracer}, records + 3),
+        "snoop": (emit_snoop_trace, {"records": snoop}, records + 3),
+        "birdseye": (emit_birdseye_trace, {"frames": birdseye}, records + 3),
+    }
+
+
+def run_adapters(records: int, calls: int) -> list[dict[str, Any]]:
+    results = []
+    for name, (adapter, kwargs, events_per_call) in _adapter_calls(records).items():
+        rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+        started = time.perf_counter()
+        for seq in range(calls):
+            adapter(rt, run_id="bench", seq=seq, run_label="bench", **kwargs)
+        elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "benchmark": "adapter",
+                "adapter": name,
+                "records": records,
+                "calls": calls,
+                "call_us": elapsed * 1e6 / calls,
+                "events_per_second": calls * events_per_call / elapsed,
+            }
+        )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-call cost of each emit_* adapter.")
+    parser.add_argument("--records", type=int, default=100, help="records per trace adapter call")
+    parser.add_argument("--calls", type=int, default=1_000)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    payload = json.dumps({"benchmark": "adapters", "results": run_adapters(args.records, args.calls)}, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
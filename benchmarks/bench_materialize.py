@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime, materialize_dsa_steps
+
+
+EVENT_SCALES = (1_000, 10_000, 100_000, 1_000_000)
+EVENTS_PER_SPAN = 100
+_KEYS = ("oracle.demo.n", "oracle.demo.label")
+
+
+def build_spans(events: int) -> OTelRuntime:
+    # Each step carries a guard, an invariant and trace events up to
+    # EVENTS_PER_SPAN, the shape the adapters produce.
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    per_span = min(events, EVENTS_PER_SPAN)
+    rows = [(n, "row") for n in range(max(0, per_span - 2))]
+    for seq in range(max(1, events // EVENTS_PER_SPAN)):
+        with rt.step_span(run_id="bench", step_id=f"step-{seq % 10}", seq=seq, run_label="bench"):
+            rt.emit_events("oracle.demo.event", rows, keys=_KEYS)
+            rt.emit_guard("n >= 0", "pass")
+            rt.emit_invariant("demo.bounded", "n stays bounded", "pass")
+    return rt
+
+
+def run_materialize(events: int) -> dict[str, Any]:
+    rt = build_spans(events)
+    spans = list(rt.spans)
+    total = sum(len(span.events) for span in spans)
+    started = time.perf_counter()
+    materialized = materialize_dsa_steps(spans)
+    elapsed = time.perf_counter() - started
+    return {
+        "benchmark": "materialize",
+        "events": total,
+        "steps": len(materialized["steps"]),
+        "materialize_seconds": elapsed,
+        "events_per_second": total / elapsed,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="materialize_dsa_steps time by event count.")
+    parser.add_argument("--scales", nargs="+", type=int, default=list(EVENT_SCALES))
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    payload = json.dumps({"benchmark": "materialize", "results": [run_materialize(n) for n in args.scales]}, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
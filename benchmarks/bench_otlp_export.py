@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+from oracle.otlp_receiver import OTLPReceiver
+
+
+RECEIVER_DELAYS_MS = (0.0, 5.0, 50.0)
+
+
+def run_export(spans: int, events_per_span: int, delay_ms: float, env: dict[str, str]) -> dict[str, Any]:
+    with OTLPReceiver(delay_seconds=delay_ms / 1e3) as receiver:
+        rt = OTelRuntime.from_env({**receiver.worker_env(), **env})
+        if not rt.otel_enabled:
+            return {"benchmark": "otlp_export", "delay_ms": delay_ms, "skipped": rt.otel_error}
+        rows = [(n,) for n in range(events_per_span)]
+        started = time.perf_counter()
+        for seq in range(spans):
+            with rt.step_span(run_id="bench", step_id="otlp", seq=seq, run_label="bench"):
+                rt.emit_events("oracle.demo.event", rows, keys=("oracle.demo.n",))
+        emitted = time.perf_counter() - started
+        rt.shutdown()
+        drained = time.perf_counter() - started
+        export = rt.otel_export_stats(flush=False)
+        received = receiver.stats()
+    return {
+        "benchmark": "otlp_export",
+        "delay_ms": delay_ms,
+        "spans": spans,
+        "emit_spans_per_second": spans / emitted,
+        "end_to_end_spans_per_second": received["spans"] / drained,
+        "dropped_spans": export["dropped"],
+        "failed_spans": export["failed"],
+        "received_spans": received["spans"],
+        "requests": received["requests"],
+        "export_lag_p95_ms": received["export_lag"].get("p95_ms"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="OTLP/HTTP exporter throughput and backpressure against a local receiver.")
+    parser.add_argument("--spans", type=int, default=20_000)
+    parser.add_argument("--events-per-span", type=int, default=10)
+    parser.add_argument("--delays-ms", nargs="+", type=float, default=list(RECEIVER_DELAYS_MS))
+    parser.add_argument("--max-queue-size", type=int, default=None, help="OTEL_BSP_MAX_QUEUE_SIZE")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    env = {"OTEL_BSP_SCHEDULE_DELAY": "100"}
+    if args.max_queue_size is not None:
+        env["OTEL_BSP_MAX_QUEUE_SIZE"] = str(args.max_queue_size)
+    results = [run_export(args.spans, args.events_per_span, delay, env) for delay in args.delays_ms]
+    payload = json.dumps({"benchmark": "otlp_export", "results": results}, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
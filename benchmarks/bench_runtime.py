@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+
+
+EXPORTER_MODES = ("none", "console", "inmemory")
+EVENT_SCALES = (1_000, 10_000, 100_000, 1_000_000)
+EVENTS_PER_SPAN = 100
+_KEYS = ("oracle.demo.n", "oracle.demo.label")
+
+
+@contextmanager
+def quiet_stdout() -> Iterator[None]:
+    # The console exporter holds a reference to the original sys.stdout, so
+    # silence it at the file-descriptor level.
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def make_runtime(mode: str) -> tuple[OTelRuntime | None, str | None]:
+    try:
+        rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": mode})
+    except ValueError as exc:
+        return None, str(exc)
+    if mode != "none" and not rt.otel_enabled:
+        return None, rt.otel_error or f"{mode} exporter unavailable"
+    return rt, None
+
+
+def _span_count(events: int) -> int:
+    return max(1, events // EVENTS_PER_SPAN)
+
+
+def _time_spans(rt: OTelRuntime, spans: int) -> float:
+    started = time.perf_counter()
+    for seq in range(spans):
+        with rt.step_span(run_id="bench", step_id="span", seq=seq, run_label="bench"):
+            pass
+    return time.perf_counter() - started
+
+
+def _time_emit_event(rt: OTelRuntime, spans: int, per_span: int) -> float:
+    started = time.perf_counter()
+    for seq in range(spans):
+        with rt.step_span(run_id="bench", step_id="emit_event", seq=seq, run_label="bench"):
+            for n in range(per_span):
+                rt.emit_event("oracle.demo.event", {"oracle.demo.n": n, "oracle.demo.label": "row"})
+    return time.perf_counter() - started
+
+
+def _emit_bulk(rt: OTelRuntime, spans: int, rows: list[tuple[Any, ...]]) -> None:
+    for seq in range(spans):
+        with rt.step_span(run_id="bench", step_id="emit_events", seq=seq, run_label="bench"):
+            rt.emit_events("oracle.demo.event", rows, keys=_KEYS)
+
+
+def run_runtime(mode: str, events: int) -> dict[str, Any]:
+    result: dict[str, Any] = {"benchmark": "runtime", "mode": mode, "events": events}
+    spans = _span_count(events)
+    per_span = min(events, EVENTS_PER_SPAN)
+    rows = [(n, "row") for n in range(per_span)]
+    total = spans * per_span
+
+    with quiet_stdout():
+        rt, reason = make_runtime(mode)
+        if rt is None:
+            return {**result, "skipped": reason}
+        span_seconds = _time_spans(rt, spans)
+        rt.shutdown()
+
+        rt, _ = make_runtime(mode)
+        emit_event_seconds = _time_emit_event(rt, spans, per_span)
+        rt.shutdown()
+
+        rt, _ = make_runtime(mode)
+        started = time.perf_counter()
+        _emit_bulk(rt, spans, rows)
+        emit_events_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        rt.shutdown()
+        flush_seconds = time.perf_counter() - started
+        dropped_spans = rt.otel_export_stats(flush=False)["dropped"]
+
+        # Retained bytes per event, with the runtime (and its span store) alive.
+        tracemalloc.start()
+        rt, _ = make_runtime(mode)
+        baseline = tracemalloc.get_traced_memory()[0]
+        _emit_bulk(rt, spans, rows)
+        len(rt.spans)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rt.shutdown()
+
+    return {
+        **result,
+        "spans": spans,
+        "step_span_ns": span_seconds * 1e9 / spans,
+        "emit_event_per_second": total / emit_event_seconds,
+        "emit_events_per_second": total / emit_events_seconds,
+        "flush_seconds": flush_seconds,
+        "otel_dropped_spans": dropped_spans,
+        "bytes_per_event": (current - baseline) / total,
+        "peak_bytes_per_event": (peak - baseline) / total,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Span and event emission cost per exporter mode.")
+    parser.add_argument("--modes", nargs="+", choices=EXPORTER_MODES, default=list(EXPORTER_MODES))
+    parser.add_argument("--scales", nargs="+", type=int, default=list(EVENT_SCALES))
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    results = [run_runtime(mode, events) for mode in args.modes for events in args.scales]
+    payload = json.dumps({"benchmark": "runtime", "results": results}, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+
+
+THREAD_COUNTS = (1, 4, 16, 64)
+_KEYS = ("oracle.demo.n", "oracle.demo.label")
+
+
+def run_emission(threads: int, spans_per_thread: int, events_per_span: int) -> dict[str, float]:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    barrier = threading.Barrier(threads + 1)
+    rows = [(n, "row") for n in range(events_per_span)]
+
+    def worker(thread_idx: int) -> None:
+        barrier.wait()
+        for seq in range(spans_per_thread):
+            with rt.step_span(run_id=f"bench-{thread_idx}", step_id="bench", seq=seq, run_label="bench"):
+                rt.emit_events("oracle.demo.event", rows, keys=_KEYS)
+
+    workers = [threading.Thread(target=worker, args=(idx,)) for idx in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    emitted = time.perf_counter() - started
+
+    started = time.perf_counter()
+    total_spans = len(rt.spans)
+    merged = time.perf_counter() - started
+
+    total_events = total_spans * events_per_span
+    return {
+        "threads": threads,
+        "spans": total_spans,
+        "events": total_events,
+        "emit_seconds": emitted,
+        "merge_seconds": merged,
+        "spans_per_second": total_spans / emitted,
+        "events_per_second": total_events / emitted,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Span emission throughput across thread counts.")
+    parser.add_argument("--spans", type=int, default=20_000, help="total spans per run, split across threads")
+    parser.add_argument("--events-per-span", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_emission(threads, max(1, args.spans // threads), args.events_per_span) for threads in THREAD_COUNTS
+    ]
+    payload = json.dumps({"benchmark": "span_threads", "results": results}, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+from bench_adapters import run_adapters
+from bench_materialize import run_materialize
+from bench_runtime import EVENT_SCALES, EXPORTER_MODES, run_runtime
+
+
+QUICK_SCALES = (1_000, 10_000)
+# Fields that identify a result row across runs; everything numeric beyond
+# these is a metric.
+_IDENTITY_FIELDS = ("benchmark", "mode", "adapter", "events", "records", "calls")
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(scales: list[int], modes: list[str], adapter_calls: int) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    for mode in modes:
+        for events in scales:
+            results.append(run_runtime(mode, events))
+    results.extend(run_adapters(records=100, calls=adapter_calls))
+    for events in scales:
+        results.append(run_materialize(events))
+    return {
+        "suite": "oracle",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _row_key(row: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(row.get(field) for field in _IDENTITY_FIELDS)
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_second")
+
+
+# Returns one line per metric that moved in the wrong direction by more than
+# `tolerance` (a fraction) relative to the baseline run.
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[str]:
+    previous = {_row_key(row): row for row in baseline.get("results", ())}
+    regressions = []
+    for row in current.get("results", ()):
+        before = previous.get(_row_key(row))
+        if before is None or "skipped" in row or "skipped" in before:
+            continue
+        for metric, value in row.items():
+            if metric in _IDENTITY_FIELDS or not isinstance(value, (int, float)):
+                continue
+            old = before.get(metric)
+            if not isinstance(old, (int, float)) or old <= 0:
+                continue
+            change = (value - old) / old
+            worse = -change if _higher_is_better(metric) else change
+            if worse > tolerance:
+                label = "/".join(str(part) for part in _row_key(row) if part is not None)
+                regressions.append(f"{label} {metric}: {old:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the oracle benchmark suite and write JSON results.")
+    parser.add_argument("--scales", nargs="+", type=int, default=None, help="event counts (default 10^3..10^6)")
+    parser.add_argument("--quick", action="store_true", help=f"only run scales {QUICK_SCALES}")
+    parser.add_argument("--modes", nargs="+", choices=EXPORTER_MODES, default=list(EXPORTER_MODES))
+    parser.add_argument("--adapter-calls", type=int, default=1_000)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression as a fraction")
+    args = parser.parse_args(argv)
+
+    scales = args.scales or list(QUICK_SCALES if args.quick else EVENT_SCALES)
+    suite = run_suite(scales, args.modes, args.adapter_calls)
+    payload = json.dumps(suite, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(baseline, suite, args.tolerance)
+        for line in regressions:
+            print(f"[bench] regression {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
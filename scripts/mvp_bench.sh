@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$REPO_ROOT"
+
+OUTPUT_DIR="${ORACLE_BENCH_OUTPUT_DIR:-bench_results}"
+mkdir -p "$OUTPUT_DIR"
+OUTPUT_FILE="$OUTPUT_DIR/bench-$(git rev-parse --short HEAD 2>/dev/null || echo local).json"
+
+echo "[bench] oracle benchmark suite -> $OUTPUT_FILE"
+uv run python benchmarks/run_benchmarks.py --output "$OUTPUT_FILE" "$@"
@@ -1,11 +1,66 @@
-from .otel_runtime import EventRecord, OTelConfig, OTelRuntime, SpanRecord, load_otel_config
-from .materializers import materialize_dsa_steps
-
-__all__ = [
-    "EventRecord",
-    "OTelConfig",
-    "OTelRuntime",
-    "SpanRecord",
-    "load_otel_config",
-    "materialize_dsa_steps",
-]
+from __future__ import annotations
+
+from importlib import import_module
+
+# Spelled out instead of imported so a cold `import` does not load `typing`.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .collector import SocketSpanSink, SpanCollector
+    from .file_sink import FileSpanSink
+    from .materializers import materialize_dsa_steps
+    from .otel_runtime import (
+        BatchProcessorConfig,
+        EventRecord,
+        EventSamplingPolicy,
+        FileExporterConfig,
+        OTelConfig,
+        OTelRuntime,
+        SpanHandle,
+        SpanRecord,
+        SpanSink,
+        SpanStore,
+        load_otel_config,
+    )
+    from .span_codec import read_span_file
+    from .span_store import RingSpanStore, SpillSpanStore
+
+
+# Public names resolve on first attribute access so `import oracle` stays cheap
+# for test workers and notebook kernels that only touch part of the package.
+_LAZY_EXPORTS = {
+    "BatchProcessorConfig": ".otel_runtime",
+    "EventRecord": ".otel_runtime",
+    "EventSamplingPolicy": ".otel_runtime",
+    "FileExporterConfig": ".otel_runtime",
+    "FileSpanSink": ".file_sink",
+    "OTelConfig": ".otel_runtime",
+    "OTelRuntime": ".otel_runtime",
+    "RingSpanStore": ".span_store",
+    "SocketSpanSink": ".collector",
+    "SpanCollector": ".collector",
+    "SpanHandle": ".otel_runtime",
+    "SpanRecord": ".otel_runtime",
+    "SpanSink": ".otel_runtime",
+    "SpanStore": ".otel_runtime",
+    "SpillSpanStore": ".span_store",
+    "load_otel_config": ".otel_runtime",
+    "materialize_dsa_steps": ".materializers",
+    "read_span_file": ".span_codec",
+}
+
+__all__ = sorted(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
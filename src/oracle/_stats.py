@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Sequence, TypeVar
+
+
+_Number = TypeVar("_Number", int, float)
+
+
+# Nearest-rank percentile of an ascending, non-empty sequence: the smallest
+# value with at least `percentile` percent of the values at or below it.
+def nearest_rank(ordered: Sequence[_Number], percentile: int) -> _Number:
+    return ordered[max(1, -(-percentile * len(ordered) // 100)) - 1]
@@ -1,13 +1,52 @@
-from .coverage_pytest_cov import emit_coverage_summary
-from .hunter_viztracer import emit_hunter_events, emit_viztracer_trace
-from .pytest_hypothesis import emit_pytest_hypothesis_case
-from .snoop_birdseye import emit_birdseye_trace, emit_snoop_trace
-
-__all__ = [
-    "emit_birdseye_trace",
-    "emit_coverage_summary",
-    "emit_hunter_events",
-    "emit_pytest_hypothesis_case",
-    "emit_snoop_trace",
-    "emit_viztracer_trace",
-]
+from __future__ import annotations
+
+from importlib import import_module
+
+# Spelled out instead of imported so a cold `import` does not load `typing`.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .birdseye_db import ingest_birdseye_db
+    from .coverage_db import CoverageDBState, ingest_coverage_db
+    from .coverage_pytest_cov import emit_coverage_summary
+    from .hunter_live import trace_hunter
+    from .hunter_viztracer import emit_hunter_events, emit_viztracer_trace
+    from .pytest_hypothesis import HypothesisCaseAggregator, HypothesisExampleTable, emit_pytest_hypothesis_case
+    from .snoop_birdseye import emit_birdseye_trace, emit_snoop_trace
+    from .snoop_live import trace_snoop
+    from .viztracer_file import ingest_viztracer_file
+
+
+# Each adapter module is imported only when one of its entry points is used.
+_LAZY_EXPORTS = {
+    "CoverageDBState": ".coverage_db",
+    "HypothesisCaseAggregator": ".pytest_hypothesis",
+    "HypothesisExampleTable": ".pytest_hypothesis",
+    "emit_birdseye_trace": ".snoop_birdseye",
+    "emit_coverage_summary": ".coverage_pytest_cov",
+    "emit_hunter_events": ".hunter_viztracer",
+    "emit_pytest_hypothesis_case": ".pytest_hypothesis",
+    "emit_snoop_trace": ".snoop_birdseye",
+    "emit_viztracer_trace": ".hunter_viztracer",
+    "ingest_birdseye_db": ".birdseye_db",
+    "ingest_coverage_db": ".coverage_db",
+    "ingest_viztracer_file": ".viztracer_file",
+    "trace_hunter": ".hunter_live",
+    "trace_snoop": ".snoop_live",
+}
+
+__all__ = sorted(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
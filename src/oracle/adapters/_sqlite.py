@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+
+# Opens an existing SQLite file read-only through a URI, so ingesting a tool's
+# database can neither create it nor take a write lock on it.
+def connect_readonly(path: str | os.PathLike[str]) -> sqlite3.Connection:
+    return sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
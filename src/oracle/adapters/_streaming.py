@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Iterable, Sequence
+
+from oracle.otel_runtime import OTelRuntime
+
+
+# Running totals for an adapter that walks its input once: records seen,
+# whether every record passed the adapter's invariant, and the last sequence
+# value for monotonicity checks.
+class StreamTally:
+    __slots__ = ("count", "ok", "last")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.ok = True
+        self.last: Any = None
+
+
+def emit_rows(runtime: OTelRuntime, name: str, rows: Iterable[tuple[Any, ...]], keys: Sequence[str]) -> None:
+    # Drives the single pass over an adapter's input. Below full recording the
+    # rows are still consumed so the tally (count, invariants) is complete.
+    if runtime.records_events:
+        runtime.emit_events(name, rows, keys=keys)
+    else:
+        deque(rows, maxlen=0)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Iterable, Iterator
+
+from oracle.adapters._sqlite import connect_readonly
+from oracle.adapters._streaming import StreamTally
+from oracle.adapters.snoop_birdseye import _BIRDSEYE_FRAME_KEYS
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
+
+
+_BIRDSEYE_CALL_KEYS = _BIRDSEYE_FRAME_KEYS + (
+    "oracle.birdseye.call_id",
+    "oracle.birdseye.start_time",
+    "oracle.birdseye.exception",
+)
+# birdseye stores DateTime columns through SQLAlchemy, which writes SQLite
+# timestamps in this fixed-width form, so string comparison orders them.
+_SQLITE_TIMESTAMP = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _timestamp(value: datetime | str) -> str:
+    return value.strftime(_SQLITE_TIMESTAMP) if isinstance(value, datetime) else value
+
+
+def _module_name(file: str) -> str:
+    return os.path.splitext(os.path.basename(file))[0]
+
+
+# Pages through birdseye's `call` table joined to `function`, ordered by
+# (start_time, id) and resumed with a keyset cursor, so each page is one
+# indexed query and no OFFSET scan. Yields one list of rows per page.
+def _call_pages(
+    conn: sqlite3.Connection,
+    *,
+    table_prefix: str,
+    functions: Iterable[str] | None,
+    files: Iterable[str] | None,
+    since: datetime | str | None,
+    until: datetime | str | None,
+    page_size: int,
+) -> Iterator[list[tuple[Any, ...]]]:
+    call_table = f'"{table_prefix}call"'
+    function_table = f'"{table_prefix}function"'
+    clauses = []
+    params: list[Any] = []
+    if functions is not None:
+        names = sorted(set(functions))
+        clauses.append(f"f.name IN ({','.join('?' * len(names))})")
+        params.extend(names)
+    if files is not None:
+        paths = sorted(set(files))
+        clauses.append(f"f.file IN ({','.join('?' * len(paths))})")
+        params.extend(paths)
+    if since is not None:
+        clauses.append("c.start_time >= ?")
+        params.append(_timestamp(since))
+    if until is not None:
+        clauses.append("c.start_time < ?")
+        params.append(_timestamp(until))
+    base = (
+        "SELECT c.start_time, c.id, f.file, f.name, f.lineno, c.exception IS NOT NULL"
+        f" FROM {call_table} AS c JOIN {function_table} AS f ON f.id = c.function_id"
+    )
+    order = " ORDER BY c.start_time, c.id LIMIT ?"
+    first = base + (" WHERE " + " AND ".join(clauses) if clauses else "") + order
+    after = base + " WHERE " + " AND ".join(clauses + ["(c.start_time, c.id) > (?, ?)"]) + order
+
+    page = conn.execute(first, (*params, page_size)).fetchall()
+    while page:
+        yield page
+        if len(page) < page_size:
+            return
+        start_time, call_id = page[-1][0], page[-1][1]
+        page = conn.execute(after, (*params, start_time, call_id, page_size)).fetchall()
+
+
+# Streams recorded calls out of a birdseye SQLite database into one step
+# span, one `oracle.birdseye.frame` event per call with the frame keys of
+# emit_birdseye_trace plus the call id, start time and whether it raised.
+# Calls are read `page_size` at a time and emitted page by page, so memory is
+# bounded by the page, not the number of calls. `functions`/`files` filter by
+# birdseye function name or source file, `since`/`until` by start time.
+def ingest_birdseye_db(
+    runtime: OTelRuntime,
+    path: str | os.PathLike[str],
+    *,
+    run_id: str,
+    seq: int,
+    functions: Iterable[str] | None = None,
+    files: Iterable[str] | None = None,
+    since: datetime | str | None = None,
+    until: datetime | str | None = None,
+    page_size: int = 1000,
+    table_prefix: str = "",
+    variant_id: str | None = None,
+    run_label: str | None = None,
+    step_id: str = "birdseye.trace",
+) -> SpanHandle:
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    if table_prefix and not table_prefix.replace("_", "").isalnum():
+        raise ValueError(f"invalid birdseye table prefix: {table_prefix!r}")
+    if not runtime.records_spans:
+        return NULL_SPAN
+
+    with runtime.step_span(
+        run_id=run_id,
+        step_id=step_id,
+        seq=seq,
+        variant_id=variant_id,
+        run_label=run_label,
+        attributes={
+            "oracle.adapter.family": "snoop+birdseye",
+            "oracle.adapter.source": "birdseye.db",
+        },
+    ) as span:
+        tally = StreamTally()
+        raised = 0
+        with closing(connect_readonly(path)) as conn:
+            pages = _call_pages(
+                conn,
+                table_prefix=table_prefix,
+                functions=functions,
+                files=files,
+                since=since,
+                until=until,
+                page_size=page_size,
+            )
+            for page in pages:
+                rows = []
+                for start_time, call_id, file, function, lineno, exception in page:
+                    tally.count += 1
+                    if not function:
+                        tally.ok = False
+                    raised += exception
+                    rows.append(
+                        (
+                            run_id,
+                            step_id,
+                            tally.count,
+                            _module_name(file or ""),
+                            function or "",
+                            file or "",
+                            int(lineno or 0),
+                            str(call_id),
+                            str(start_time or ""),
+                            bool(exception),
+                        )
+                    )
+                if runtime.records_events:
+                    runtime.emit_events("oracle.birdseye.frame", rows, keys=_BIRDSEYE_CALL_KEYS)
+        runtime.set_span_attributes(
+            {"oracle.birdseye.count": tally.count, "oracle.birdseye.exceptions": raised}, span=span
+        )
+
+        guard_status = "pass" if tally.count else "skip"
+        runtime.emit_guard("birdseye.frames > 0", guard_status)
+        runtime.emit_invariant(
+            "birdseye.frame.identity",
+            "birdseye frames include module+function identity",
+            "pass" if tally.ok else "fail",
+        )
+        if runtime.records_events:
+            runtime.emit_explanation(f"birdseye calls ingested: {tally.count}")
+        return span
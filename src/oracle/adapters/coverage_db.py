@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import base64
+import os
+from contextlib import closing
+from typing import Any, Iterable, Iterator
+
+from oracle.adapters._sqlite import connect_readonly
+from oracle.adapters.coverage_pytest_cov import _VALID_SOURCES, _percent
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
+
+
+_FILE_EVENT_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.adapter.seq",
+    "code.filepath",
+    "oracle.coverage.covered_lines",
+    "oracle.coverage.total_lines",
+    "oracle.coverage.percent",
+    "oracle.coverage.source_parsed",
+    "oracle.coverage.lines_numbits",
+)
+
+
+# Line sets are held as Python ints in coverage.py's "numbits" layout: bit
+# `n` is line `n`, so unions, intersections and counts are single big-int
+# operations instead of set arithmetic.
+def _numbits_to_int(numbits: bytes) -> int:
+    return int.from_bytes(numbits, "little")
+
+
+def _int_to_numbits(lines: int) -> bytes:
+    return lines.to_bytes((lines.bit_length() + 7) // 8, "little")
+
+
+# Statement bitmap of one source file, plus the (line, first line) pairs of
+# multi-line statements so executed lines can be normalized the way
+# coverage.py reports them.
+class _SourceLines:
+    __slots__ = ("statements", "remap")
+
+    def __init__(self, statements: int, remap: tuple[tuple[int, int], ...]):
+        self.statements = statements
+        self.remap = remap
+
+    def covered(self, executed: int) -> int:
+        for line, first in self.remap:
+            if executed >> line & 1:
+                executed |= 1 << first
+        return executed & self.statements
+
+
+def _parse_source(path: str, exclude: str | None) -> _SourceLines | None:
+    try:
+        from coverage.config import DEFAULT_EXCLUDE
+        from coverage.exceptions import CoverageException
+        from coverage.misc import join_regex
+        from coverage.parser import PythonParser
+    except ImportError:
+        return None
+    try:
+        parser = PythonParser(filename=path, exclude=exclude if exclude is not None else join_regex(DEFAULT_EXCLUDE))
+        parser.parse_source()
+    except (OSError, UnicodeDecodeError, CoverageException):
+        return None
+    statements = 0
+    for line in parser.statements:
+        statements |= 1 << line
+    last_line = parser.text.count("\n") + 1
+    remap = tuple((line, first) for line in range(1, last_line + 1) if (first := parser.first_line(line)) != line)
+    return _SourceLines(statements, remap)
+
+
+# Carries what earlier ingest_coverage_db calls read, so a later call only
+# touches what changed: the data file's (mtime_ns, size), executed-line
+# bitmaps per file and context, and parsed statement bitmaps per source file.
+class CoverageDBState:
+    def __init__(self) -> None:
+        self.db_stamp: tuple[int, int] | None = None
+        self.lines: dict[str, dict[str, int]] = {}
+        self.sources: dict[str, _SourceLines | None] = {}
+        self._source_stamps: dict[str, tuple[int, int] | None] = {}
+
+    def _drop(self, files: set[str] | None, contexts: set[str] | None) -> None:
+        for path in list(self.lines) if files is None else files & self.lines.keys():
+            if contexts is None:
+                del self.lines[path]
+                continue
+            by_context = self.lines[path]
+            for context in contexts & by_context.keys():
+                del by_context[context]
+
+    def _source(self, path: str, exclude: str | None) -> tuple[_SourceLines | None, bool]:
+        try:
+            stat = os.stat(path)
+            stamp: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if path in self.sources and self._source_stamps.get(path) == stamp:
+            return self.sources[path], False
+        parsed = None if stamp is None else _parse_source(path, exclude)
+        self.sources[path] = parsed
+        self._source_stamps[path] = stamp
+        return parsed, True
+
+
+def _where(files: set[str] | None, contexts: set[str] | None) -> tuple[str, list[str]]:
+    clauses = []
+    params: list[str] = []
+    if files is not None:
+        clauses.append(f"file.path IN ({','.join('?' * len(files))})")
+        params.extend(sorted(files))
+    if contexts is not None:
+        clauses.append(f"context.context IN ({','.join('?' * len(contexts))})")
+        params.extend(sorted(contexts))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+# Executed lines per (file, context) straight from the data file, one query
+# per table. Branch-coverage files store arcs instead of line bits; their
+# positive endpoints are the executed lines.
+def _read_executed(
+    path: str | os.PathLike[str], files: set[str] | None, contexts: set[str] | None
+) -> Iterator[tuple[str, str, int]]:
+    where, params = _where(files, contexts)
+    with closing(connect_readonly(path)) as conn:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        if meta.get("has_arcs") in ("1", "True", "true"):
+            executed: dict[tuple[str, str], int] = {}
+            rows = conn.execute(
+                "SELECT file.path, context.context, arc.fromno, arc.tono FROM arc"
+                " JOIN file ON file.id = arc.file_id JOIN context ON context.id = arc.context_id" + where,
+                params,
+            )
+            for file_path, context, fromno, tono in rows:
+                bits = executed.get((file_path, context), 0)
+                if fromno > 0:
+                    bits |= 1 << fromno
+                if tono > 0:
+                    bits |= 1 << tono
+                executed[(file_path, context)] = bits
+            for (file_path, context), bits in executed.items():
+                yield file_path, context, bits
+            return
+        rows = conn.execute(
+            "SELECT file.path, context.context, line_bits.numbits FROM line_bits"
+            " JOIN file ON file.id = line_bits.file_id JOIN context ON context.id = line_bits.context_id" + where,
+            params,
+        )
+        for file_path, context, numbits in rows:
+            yield file_path, context, _numbits_to_int(numbits)
+
+
+# Reads a coverage.py SQLite data file directly (no `coverage report`) and
+# emits one `oracle.coverage.file` event per measured file plus the usual
+# `oracle.coverage.summary`. Totals come from coverage.py's parser when it is
+# installed and the source is readable; otherwise a file counts only its
+# executed lines and reports `source_parsed=False`. Pass the same `state`
+# across calls to skip an unchanged data file and unchanged sources, and
+# `files`/`contexts` to re-read just those rows on top of the cached rest.
+def ingest_coverage_db(
+    runtime: OTelRuntime,
+    path: str | os.PathLike[str],
+    *,
+    run_id: str,
+    seq: int,
+    state: CoverageDBState | None = None,
+    files: Iterable[str] | None = None,
+    contexts: Iterable[str] | None = None,
+    exclude: str | None = None,
+    source: str = "coverage",
+    threshold_percent: float | None = None,
+    variant_id: str | None = None,
+    run_label: str | None = None,
+    step_id: str = "coverage.files",
+) -> SpanHandle:
+    if source not in _VALID_SOURCES:
+        raise ValueError(f"invalid coverage source: {source}")
+    if not runtime.records_spans:
+        return NULL_SPAN
+
+    state = state if state is not None else CoverageDBState()
+    file_scope = set(files) if files is not None else None
+    context_scope = set(contexts) if contexts is not None else None
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    contexts_read: set[str] = set()
+    if state.db_stamp != stamp or file_scope is not None or context_scope is not None:
+        state._drop(file_scope, context_scope)
+        for file_path, context, bits in _read_executed(path, file_scope, context_scope):
+            by_context = state.lines.setdefault(file_path, {})
+            by_context[context] = by_context.get(context, 0) | bits
+            contexts_read.add(context)
+        state.db_stamp = stamp
+
+    root = os.path.dirname(os.fspath(path))
+    reported = sorted(state.lines if file_scope is None else file_scope & state.lines.keys())
+    rows: list[tuple[Any, ...]] = []
+    covered_total = 0
+    lines_total = 0
+    sources_parsed = 0
+    for idx, file_path in enumerate(reported, start=1):
+        executed = 0
+        for bits in state.lines[file_path].values():
+            executed |= bits
+        source_lines, parsed = state._source(os.path.join(root, file_path), exclude)
+        sources_parsed += parsed
+        if source_lines is None:
+            lines = executed
+            total = executed.bit_count()
+        else:
+            lines = source_lines.covered(executed)
+            total = source_lines.statements.bit_count()
+        covered = lines.bit_count()
+        covered_total += covered
+        lines_total += total
+        rows.append(
+            (
+                run_id,
+                step_id,
+                idx,
+                file_path,
+                covered,
+                total,
+                _percent(covered, total),
+                source_lines is not None,
+                base64.b64encode(_int_to_numbits(lines)).decode("ascii"),
+            )
+        )
+    percent = _percent(covered_total, lines_total)
+
+    with runtime.step_span(
+        run_id=run_id,
+        step_id=step_id,
+        seq=seq,
+        variant_id=variant_id,
+        run_label=run_label,
+        attributes={
+            "oracle.adapter.family": "coverage+pytest-cov",
+            "oracle.adapter.source": source,
+        },
+    ) as span:
+        runtime.set_span_attributes(
+            {
+                "oracle.coverage.files": len(rows),
+                "oracle.coverage.covered_lines": covered_total,
+                "oracle.coverage.total_lines": lines_total,
+                "oracle.coverage.percent": percent,
+                "oracle.coverage.contexts_read": len(contexts_read),
+                "oracle.coverage.sources_parsed": sources_parsed,
+            },
+            span=span,
+        )
+        if runtime.records_events:
+            runtime.emit_events("oracle.coverage.file", rows, keys=_FILE_EVENT_KEYS)
+            runtime.emit_event(
+                "oracle.coverage.summary",
+                {
+                    "oracle.run_id": run_id,
+                    "oracle.step_id": step_id,
+                    "oracle.adapter.seq": seq,
+                    "oracle.coverage.covered_lines": covered_total,
+                    "oracle.coverage.total_lines": lines_total,
+                    "oracle.coverage.percent": percent,
+                },
+            )
+
+        guard_status = "pass"
+        if lines_total == 0:
+            guard_status = "skip"
+        if threshold_percent is not None and lines_total > 0 and percent < threshold_percent:
+            guard_status = "fail"
+        runtime.emit_guard("coverage.percent >= threshold", guard_status)
+        runtime.emit_invariant(
+            "coverage.percent.range",
+            "0 <= coverage.percent <= 100",
+            "pass" if 0.0 <= percent <= 100.0 else "fail",
+        )
+        if runtime.records_events:
+            runtime.emit_explanation(f"{source} coverage: {percent:.2f}% across {len(rows)} files")
+        return span
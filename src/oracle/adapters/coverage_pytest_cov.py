@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from oracle.otel_runtime import OTelRuntime, SpanRecord
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
 
 
 _VALID_SOURCES = {"coverage", "pytest-cov"}
 
 
+def _percent(covered_lines: int, total_lines: int) -> float:
+    return 0.0 if total_lines == 0 else round((covered_lines / total_lines) * 100.0, 4)
+
+
 def emit_coverage_summary(
     runtime: OTelRuntime,
     *,
@@ -18,15 +22,17 @@ def emit_coverage_summary(
     variant_id: str | None = None,
     run_label: str | None = None,
     step_id: str = "coverage.summary",
-) -> SpanRecord:
+) -> SpanHandle:
     if source not in _VALID_SOURCES:
         raise ValueError(f"invalid coverage source: {source}")
     if covered_lines < 0 or total_lines < 0:
         raise ValueError("coverage values must be non-negative")
     if covered_lines > total_lines:
         raise ValueError("covered_lines cannot exceed total_lines")
+    if not runtime.records_spans:
+        return NULL_SPAN
 
-    percent = 0.0 if total_lines == 0 else round((covered_lines / total_lines) * 100.0, 4)
+    percent = _percent(covered_lines, total_lines)
 
     with runtime.step_span(
         run_id=run_id,
@@ -39,17 +45,18 @@ def emit_coverage_summary(
             "oracle.adapter.source": source,
         },
     ) as span:
-        runtime.emit_event(
-            "oracle.coverage.summary",
-            {
-                "oracle.run_id": run_id,
-                "oracle.step_id": step_id,
-                "oracle.adapter.seq": seq,
-                "oracle.coverage.covered_lines": covered_lines,
-                "oracle.coverage.total_lines": total_lines,
-                "oracle.coverage.percent": percent,
-            },
-        )
+        if runtime.records_events:
+            runtime.emit_event(
+                "oracle.coverage.summary",
+                {
+                    "oracle.run_id": run_id,
+                    "oracle.step_id": step_id,
+                    "oracle.adapter.seq": seq,
+                    "oracle.coverage.covered_lines": covered_lines,
+                    "oracle.coverage.total_lines": total_lines,
+                    "oracle.coverage.percent": percent,
+                },
+            )
 
         guard_status = "pass"
         if total_lines == 0:
@@ -62,5 +69,6 @@ def emit_coverage_summary(
             "0 <= coverage.percent <= 100",
             "pass" if 0.0 <= percent <= 100.0 else "fail",
         )
-        runtime.emit_explanation(f"{source} coverage: {percent:.2f}%")
+        if runtime.records_events:
+            runtime.emit_explanation(f"{source} coverage: {percent:.2f}%")
         return span
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Sequence
+
+from oracle.adapters._streaming import StreamTally
+from oracle.adapters.hunter_viztracer import _HUNTER_EVENT_KEYS
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
+
+
+_DEFAULT_KINDS = ("call", "return")
+
+
+# Live counterpart of emit_hunter_events: installs a hunter tracer for the
+# duration of a `with` block and feeds its events straight into the block's
+# step span. Events are staged in a ring buffer of `buffer_size` rows and
+# flushed to the span in batches of `flush_every`, so the tracer itself holds
+# a constant number of rows however long the run (pair with an
+# EventSamplingPolicy to bound the span too). With `flush_every=None` nothing
+# is flushed until the block exits: the ring keeps the last `buffer_size`
+# events, flight-recorder style, and the overwritten ones are counted in
+# `oracle.hunter.dropped`.
+class HunterLiveTrace:
+    def __init__(
+        self,
+        runtime: OTelRuntime,
+        *,
+        run_id: str,
+        seq: int,
+        modules: Sequence[str] | None = None,
+        max_depth: int | None = None,
+        kinds: Sequence[str] | None = _DEFAULT_KINDS,
+        stdlib: bool = False,
+        threading_support: bool = False,
+        buffer_size: int = 4096,
+        flush_every: int | None = 1024,
+        variant_id: str | None = None,
+        run_label: str | None = None,
+        step_id: str = "hunter.trace",
+    ):
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be positive")
+        if flush_every is not None and not 0 < flush_every <= buffer_size:
+            raise ValueError("flush_every must be between 1 and buffer_size")
+        self.runtime = runtime
+        self.run_id = run_id
+        self.seq = seq
+        self.step_id = step_id
+        self.variant_id = variant_id
+        self.run_label = run_label
+        self.modules = tuple(modules) if modules else None
+        self.max_depth = max_depth
+        self.kinds = tuple(kinds) if kinds else None
+        self.stdlib = stdlib
+        self.threading_support = threading_support
+        self.flush_every = flush_every
+        self.span: SpanHandle = NULL_SPAN
+        self.tally = StreamTally()
+        self.dropped = 0
+        self._buffer: deque[tuple[Any, ...]] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._span_cm: Any = None
+        self._tracer: Any = None
+
+    def _filters(self) -> dict[str, Any]:
+        filters: dict[str, Any] = {"stdlib": self.stdlib}
+        if self.modules:
+            filters["module_startswith"] = self.modules
+        if self.max_depth is not None:
+            filters["depth_lte"] = self.max_depth
+        if self.kinds:
+            filters["kind_in"] = self.kinds
+        return filters
+
+    def _on_event(self, event: Any) -> None:
+        function = event.function or ""
+        with self._lock:
+            tally = self.tally
+            tally.count += 1
+            if not function:
+                tally.ok = False
+            if not self.runtime.records_events:
+                return
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(
+                (
+                    self.run_id,
+                    self.step_id,
+                    tally.count,
+                    str(event.kind),
+                    str(function),
+                    str(event.filename or ""),
+                    int(event.lineno or 0),
+                )
+            )
+            if self.flush_every is not None and len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        rows = list(self._buffer)
+        self._buffer.clear()
+        self.runtime.emit_events("oracle.hunter.event", rows, keys=_HUNTER_EVENT_KEYS, span=self.span)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def __enter__(self) -> HunterLiveTrace:
+        if not self.runtime.records_spans:
+            return self
+        import hunter
+
+        self._span_cm = self.runtime.step_span(
+            run_id=self.run_id,
+            step_id=self.step_id,
+            seq=self.seq,
+            variant_id=self.variant_id,
+            run_label=self.run_label,
+            attributes={
+                "oracle.adapter.family": "hunter+viztracer",
+                "oracle.adapter.source": "hunter.live",
+            },
+        )
+        self.span = self._span_cm.__enter__()
+        self._tracer = hunter.trace(
+            action=self._on_event,
+            threading_support=self.threading_support,
+            **self._filters(),
+        )
+        return self
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        if self._span_cm is None:
+            return None
+        self._tracer.stop()
+        self._tracer = None
+        runtime = self.runtime
+        span = self.span
+        try:
+            self.flush()
+            count = self.tally.count
+            attrs: dict[str, Any] = {"oracle.hunter.count": count}
+            if self.dropped:
+                attrs["oracle.hunter.dropped"] = self.dropped
+            runtime.set_span_attributes(attrs, span=span)
+            runtime.emit_guard("hunter.events > 0", "pass" if count else "skip", span=span)
+            runtime.emit_invariant(
+                "hunter.call.identity",
+                "hunter events include function identity",
+                "pass" if self.tally.ok else "fail",
+                span=span,
+            )
+            if runtime.records_events:
+                runtime.emit_explanation(f"hunter events traced live: {count}", span=span)
+        finally:
+            span_cm, self._span_cm = self._span_cm, None
+            result = span_cm.__exit__(*exc_info)
+        return result
+
+
+def trace_hunter(runtime: OTelRuntime, *, run_id: str, seq: int, **options: Any) -> HunterLiveTrace:
+    return HunterLiveTrace(runtime, run_id=run_id, seq=seq, **options)
@@ -1,8 +1,172 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Sequence
+import heapq
+from array import array
+from typing import Any, Iterable, Iterator, Mapping
 
-from oracle.otel_runtime import OTelRuntime, SpanRecord
+from oracle._stats import nearest_rank
+from oracle.adapters._streaming import StreamTally, emit_rows
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
+
+
+_HUNTER_EVENT_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.adapter.seq",
+    "oracle.hunter.kind",
+    "oracle.hunter.function",
+    "code.filepath",
+    "code.lineno",
+)
+_VIZTRACER_EVENT_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.adapter.seq",
+    "oracle.viztracer.name",
+    "oracle.viztracer.duration_us",
+    "oracle.viztracer.start_us",
+)
+
+_VIZTRACER_ROLLUP_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.viztracer.name",
+    "oracle.viztracer.count",
+    "oracle.viztracer.total_us",
+    "oracle.viztracer.self_us",
+    "oracle.viztracer.min_us",
+    "oracle.viztracer.mean_us",
+    "oracle.viztracer.max_us",
+    "oracle.viztracer.p95_us",
+)
+
+
+def _hunter_rows(
+    run_id: str, step_id: str, events: Iterable[Mapping[str, Any]], tally: StreamTally
+) -> Iterator[tuple[Any, ...]]:
+    for idx, event in enumerate(events, start=1):
+        function = event.get("function", "")
+        if not function:
+            tally.ok = False
+        tally.count = idx
+        yield (
+            run_id,
+            step_id,
+            idx,
+            str(event.get("kind", "")),
+            str(function),
+            str(event.get("filepath", "")),
+            int(event.get("lineno", 0) or 0),
+        )
+
+
+def _viztracer_row(
+    run_id: str, step_id: str, idx: int, record: Mapping[str, Any], tally: StreamTally
+) -> tuple[Any, ...]:
+    duration_us = int(record.get("duration_us", 0) or 0)
+    if duration_us < 0:
+        tally.ok = False
+    tally.count = idx
+    return (
+        run_id,
+        step_id,
+        idx,
+        str(record.get("name", "")),
+        duration_us,
+        int(record.get("start_us", 0) or 0),
+    )
+
+
+def _viztracer_rows(
+    run_id: str, step_id: str, records: Iterable[Mapping[str, Any]], tally: StreamTally
+) -> Iterator[tuple[Any, ...]]:
+    for idx, record in enumerate(records, start=1):
+        yield _viztracer_row(run_id, step_id, idx, record, tally)
+
+
+# Per-function accumulation for rollup mode. Each distinct name gets a slot in
+# parallel arrays (count, total, self, min, max) plus an array of its
+# durations for the p95, so a record costs one array append rather than an
+# event. Self time subtracts direct children, found per (pid, tid) among the
+# calls that finished inside the current one; this assumes calls arrive in
+# end order, as VizTracer writes them, and otherwise self time equals total.
+class _ViztracerRollup:
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self.slots: dict[str, int] = {}
+        self.counts = array("q")
+        self.totals = array("q")
+        self.selfs = array("q")
+        self.mins = array("q")
+        self.maxs = array("q")
+        self.durations: list[array] = []
+        self.slowest: list[tuple[int, int, tuple[Any, ...]]] = []
+        self._finished: dict[tuple[Any, Any], tuple[array, array]] = {}
+
+    def _child_time(self, thread: tuple[Any, Any], start: int, end: int) -> int:
+        starts, ends = self._finished.setdefault(thread, (array("q"), array("q")))
+        child_time = 0
+        while starts and starts[-1] >= start and ends[-1] <= end:
+            child_time += ends.pop() - starts.pop()
+        starts.append(start)
+        ends.append(end)
+        return child_time
+
+    def add(self, row: tuple[Any, ...], thread: tuple[Any, Any]) -> None:
+        name, duration_us, start_us = row[3], row[4], row[5]
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.counts)
+            self.counts.append(0)
+            self.totals.append(0)
+            self.selfs.append(0)
+            self.mins.append(duration_us)
+            self.maxs.append(duration_us)
+            self.durations.append(array("q"))
+        child_time = self._child_time(thread, start_us, start_us + duration_us)
+        self.counts[slot] += 1
+        self.totals[slot] += duration_us
+        self.selfs[slot] += duration_us - child_time
+        if duration_us < self.mins[slot]:
+            self.mins[slot] = duration_us
+        if duration_us > self.maxs[slot]:
+            self.maxs[slot] = duration_us
+        self.durations[slot].append(duration_us)
+        if self.top_k:
+            entry = (duration_us, -row[2], row)
+            if len(self.slowest) < self.top_k:
+                heapq.heappush(self.slowest, entry)
+            elif entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def summary_rows(self, run_id: str, step_id: str) -> Iterator[tuple[Any, ...]]:
+        for name, slot in sorted(self.slots.items(), key=lambda item: -self.totals[item[1]]):
+            count = self.counts[slot]
+            p95 = nearest_rank(sorted(self.durations[slot]), 95)
+            yield (
+                run_id,
+                step_id,
+                name,
+                count,
+                self.totals[slot],
+                self.selfs[slot],
+                self.mins[slot],
+                self.totals[slot] / count,
+                self.maxs[slot],
+                p95,
+            )
+
+    def slowest_rows(self) -> list[tuple[Any, ...]]:
+        return [row for _, _, row in sorted(self.slowest, key=lambda entry: entry[2][2])]
+
+
+def _viztracer_rollup(
+    run_id: str, step_id: str, records: Iterable[Mapping[str, Any]], tally: StreamTally, top_k: int
+) -> _ViztracerRollup:
+    rollup = _ViztracerRollup(top_k)
+    for idx, record in enumerate(records, start=1):
+        rollup.add(_viztracer_row(run_id, step_id, idx, record, tally), (record.get("pid"), record.get("tid")))
+    return rollup
 
 
 def emit_hunter_events(
@@ -10,11 +174,14 @@ def emit_hunter_events(
     *,
     run_id: str,
     seq: int,
-    events: Sequence[Mapping[str, Any]],
+    events: Iterable[Mapping[str, Any]],
     variant_id: str | None = None,
     run_label: str | None = None,
     step_id: str = "hunter.trace",
-) -> SpanRecord:
+) -> SpanHandle:
+    if not runtime.records_spans:
+        return NULL_SPAN
+
     with runtime.step_span(
         run_id=run_id,
         step_id=step_id,
@@ -24,32 +191,22 @@ def emit_hunter_events(
         attributes={
             "oracle.adapter.family": "hunter+viztracer",
             "oracle.adapter.source": "hunter",
-            "oracle.hunter.count": len(events),
         },
     ) as span:
-        for idx, event in enumerate(events, start=1):
-            runtime.emit_event(
-                "oracle.hunter.event",
-                {
-                    "oracle.run_id": run_id,
-                    "oracle.step_id": step_id,
-                    "oracle.adapter.seq": idx,
-                    "oracle.hunter.kind": str(event.get("kind", "")),
-                    "oracle.hunter.function": str(event.get("function", "")),
-                    "code.filepath": str(event.get("filepath", "")),
-                    "code.lineno": int(event.get("lineno", 0) or 0),
-                },
-            )
+        tally = StreamTally()
+        emit_rows(runtime, "oracle.hunter.event", _hunter_rows(run_id, step_id, events, tally), _HUNTER_EVENT_KEYS)
+        runtime.set_span_attributes({"oracle.hunter.count": tally.count}, span=span)
 
-        guard_status = "pass" if events else "skip"
-        invariant_status = "pass" if all(e.get("function") for e in events) else "fail"
+        guard_status = "pass" if tally.count else "skip"
+        invariant_status = "pass" if tally.ok else "fail"
         runtime.emit_guard("hunter.events > 0", guard_status)
         runtime.emit_invariant(
             "hunter.call.identity",
             "hunter events include function identity",
             invariant_status,
         )
-        runtime.emit_explanation(f"hunter events materialized: {len(events)}")
+        if runtime.records_events:
+            runtime.emit_explanation(f"hunter events materialized: {tally.count}")
         return span
 
 
@@ -58,11 +215,18 @@ def emit_viztracer_trace(
     *,
     run_id: str,
     seq: int,
-    records: Sequence[Mapping[str, Any]],
+    records: Iterable[Mapping[str, Any]],
     variant_id: str | None = None,
     run_label: str | None = None,
     step_id: str = "viztracer.trace",
-) -> SpanRecord:
+    rollup: bool = False,
+    top_k: int = 10,
+) -> SpanHandle:
+    if top_k < 0:
+        raise ValueError("top_k must be non-negative")
+    if not runtime.records_spans:
+        return NULL_SPAN
+
     with runtime.step_span(
         run_id=run_id,
         step_id=step_id,
@@ -72,34 +236,35 @@ def emit_viztracer_trace(
         attributes={
             "oracle.adapter.family": "hunter+viztracer",
             "oracle.adapter.source": "viztracer",
-            "oracle.viztracer.count": len(records),
         },
     ) as span:
-        for idx, record in enumerate(records, start=1):
-            runtime.emit_event(
+        tally = StreamTally()
+        if rollup and runtime.records_events:
+            summary = _viztracer_rollup(run_id, step_id, records, tally, top_k)
+            runtime.emit_events(
+                "oracle.viztracer.rollup", summary.summary_rows(run_id, step_id), keys=_VIZTRACER_ROLLUP_KEYS
+            )
+            runtime.emit_events("oracle.viztracer.event", summary.slowest_rows(), keys=_VIZTRACER_EVENT_KEYS)
+            runtime.set_span_attributes(
+                {"oracle.viztracer.count": tally.count, "oracle.viztracer.functions": len(summary.slots)}, span=span
+            )
+        else:
+            emit_rows(
+                runtime,
                 "oracle.viztracer.event",
-                {
-                    "oracle.run_id": run_id,
-                    "oracle.step_id": step_id,
-                    "oracle.adapter.seq": idx,
-                    "oracle.viztracer.name": str(record.get("name", "")),
-                    "oracle.viztracer.duration_us": int(record.get("duration_us", 0) or 0),
-                    "oracle.viztracer.start_us": int(record.get("start_us", 0) or 0),
-                },
+                _viztracer_rows(run_id, step_id, records, tally),
+                _VIZTRACER_EVENT_KEYS,
             )
+            runtime.set_span_attributes({"oracle.viztracer.count": tally.count}, span=span)
 
-        guard_status = "pass" if records else "skip"
-        invariant_status = "pass"
-        for record in records:
-            duration_us = int(record.get("duration_us", 0) or 0)
-            if duration_us < 0:
-                invariant_status = "fail"
-                break
+        guard_status = "pass" if tally.count else "skip"
+        invariant_status = "pass" if tally.ok else "fail"
         runtime.emit_guard("viztracer.records > 0", guard_status)
         runtime.emit_invariant(
             "viztracer.duration.non_negative",
             "viztracer durations are non-negative",
             invariant_status,
         )
-        runtime.emit_explanation(f"viztracer records materialized: {len(records)}")
+        if runtime.records_events:
+            runtime.emit_explanation(f"viztracer records materialized: {tally.count}")
         return span
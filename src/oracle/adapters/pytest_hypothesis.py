@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 from typing import Any, Mapping
 
-from oracle.otel_runtime import OTelRuntime, SpanRecord
+from oracle._stats import nearest_rank
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
 
 
 _VALID_CASE_OUTCOMES = {"pass", "fail", "skip"}
+_EXAMPLE_SIZE_BUCKETS = (16, 64, 256, 1024, 4096)
 
 
 def _normalize_example(example: Mapping[str, Any] | None) -> str | None:
@@ -15,6 +22,147 @@ def _normalize_example(example: Mapping[str, Any] | None) -> str | None:
     return json.dumps(example, sort_keys=True, separators=(",", ":"))
 
 
+def _example_hash(example_json: str) -> str:
+    return hashlib.blake2b(example_json.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# Content-addressed store of normalized Hypothesis examples. Each distinct
+# example is kept once under a 16-hex-digit blake2b digest, and case events
+# carry only the digest; the example itself is emitted the first time the
+# table sees it. Strings, containers and the final JSON are cut to the given
+# limits, with markers saying how much was dropped. Serialization is memoized
+# on a digest of the example's repr (an LRU of `memo_size` entries); for the
+# JSON value types examples are made of, the repr identifies the value, so
+# repeated shrink steps skip `json.dumps` and the limit checks.
+class HypothesisExampleTable:
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 4096,
+        max_string: int = 256,
+        max_items: int = 64,
+        memo_size: int = 1024,
+    ):
+        if min(max_bytes, max_string, max_items, memo_size) <= 0:
+            raise ValueError("example table limits must be positive")
+        self.max_bytes = max_bytes
+        self.max_string = max_string
+        self.max_items = max_items
+        self.memo_size = memo_size
+        self.examples: dict[str, str] = {}
+        self.truncated: set[str] = set()
+        self.memo_hits = 0
+        self._memo: OrderedDict[bytes, tuple[str, str]] = OrderedDict()
+
+    def _truncate(self, value: Any) -> Any:
+        if isinstance(value, str):
+            if len(value) <= self.max_string:
+                return value
+            return f"{value[: self.max_string]}...[+{len(value) - self.max_string} chars]"
+        if isinstance(value, Mapping):
+            keys = sorted(value, key=str)
+            out = {str(key): self._truncate(value[key]) for key in keys[: self.max_items]}
+            if len(keys) > self.max_items:
+                out["..."] = f"+{len(keys) - self.max_items} keys"
+            return out
+        if isinstance(value, (list, tuple)):
+            out_items = [self._truncate(item) for item in value[: self.max_items]]
+            if len(value) > self.max_items:
+                out_items.append(f"...[+{len(value) - self.max_items} items]")
+            return out_items
+        return value
+
+    def _serialize(self, example: Mapping[str, Any]) -> str:
+        example_json = _normalize_example(self._truncate(example))
+        if len(example_json) > self.max_bytes:
+            example_json = json.dumps(
+                {"...": f"+{len(example_json) - self.max_bytes} chars", "prefix": example_json[: self.max_bytes]},
+                separators=(",", ":"),
+            )
+        return example_json
+
+    # Returns (digest, normalized JSON) without storing the example.
+    def serialize(self, example: Mapping[str, Any]) -> tuple[str, str]:
+        memo_key = hashlib.blake2b(repr(example).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            self._memo.move_to_end(memo_key)
+            self.memo_hits += 1
+            digest, example_json = cached
+        else:
+            full_json = _normalize_example(example)
+            example_json = full_json if self._within_limits(example, full_json) else self._serialize(example)
+            digest = _example_hash(example_json)
+            if example_json is not full_json:
+                self.truncated.add(digest)
+            self._memo[memo_key] = (digest, example_json)
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return digest, example_json
+
+    # Returns (digest, normalized JSON, first time this table stored it).
+    def add(self, example: Mapping[str, Any]) -> tuple[str, str, bool]:
+        digest, example_json = self.serialize(example)
+        is_new = digest not in self.examples
+        if is_new:
+            self.examples[digest] = example_json
+        return digest, example_json, is_new
+
+    def _within_limits(self, example: Mapping[str, Any], example_json: str) -> bool:
+        if len(example_json) > self.max_bytes or len(example) > self.max_items:
+            return False
+        # Too short to hold an over-long string or an over-full container.
+        if len(example_json) <= min(self.max_string, 2 * self.max_items):
+            return True
+        stack: list[Any] = list(example.values())
+        while stack:
+            value = stack.pop()
+            if value is None or isinstance(value, (int, float)):
+                continue
+            if isinstance(value, str):
+                if len(value) > self.max_string:
+                    return False
+            elif isinstance(value, Mapping):
+                if len(value) > self.max_items:
+                    return False
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                if len(value) > self.max_items:
+                    return False
+                stack.extend(value)
+        return True
+
+    def get(self, digest: str) -> str | None:
+        return self.examples.get(digest)
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+
+def _attach_example(
+    runtime: OTelRuntime,
+    case_event: dict[str, Any],
+    example: Mapping[str, Any] | None,
+    example_table: HypothesisExampleTable | None,
+) -> None:
+    if example is None:
+        return
+    if example_table is None:
+        case_event["oracle.hypothesis.example"] = _normalize_example(example)
+        return
+    digest, example_json, is_new = example_table.add(example)
+    case_event["oracle.hypothesis.example_hash"] = digest
+    if is_new:
+        runtime.emit_event(
+            "oracle.hypothesis.example",
+            {
+                "oracle.hypothesis.example_hash": digest,
+                "oracle.hypothesis.example": example_json,
+                "oracle.hypothesis.example_truncated": digest in example_table.truncated,
+            },
+        )
+
+
 def emit_pytest_hypothesis_case(
     runtime: OTelRuntime,
     *,
@@ -27,9 +175,12 @@ def emit_pytest_hypothesis_case(
     variant_id: str | None = None,
     run_label: str | None = None,
     step_id: str | None = None,
-) -> SpanRecord:
+    example_table: HypothesisExampleTable | None = None,
+) -> SpanHandle:
     if outcome not in _VALID_CASE_OUTCOMES:
         raise ValueError(f"invalid test outcome: {outcome}")
+    if not runtime.records_spans:
+        return NULL_SPAN
 
     resolved_step_id = step_id or f"pytest:{nodeid}"
     source = "pytest+hypothesis" if hypothesis_example is not None else "pytest"
@@ -47,19 +198,18 @@ def emit_pytest_hypothesis_case(
         run_label=run_label,
         attributes=span_attrs,
     ) as span:
-        case_event = {
-            "oracle.run_id": run_id,
-            "oracle.step_id": resolved_step_id,
-            "oracle.pytest.nodeid": nodeid,
-            "oracle.pytest.outcome": outcome,
-            "oracle.adapter.seq": seq,
-        }
-        example_json = _normalize_example(hypothesis_example)
-        if example_json is not None:
-            case_event["oracle.hypothesis.example"] = example_json
-        if failure_message:
-            case_event["oracle.pytest.failure_message"] = failure_message
-        runtime.emit_event("oracle.pytest.case", case_event)
+        if runtime.records_events:
+            case_event = {
+                "oracle.run_id": run_id,
+                "oracle.step_id": resolved_step_id,
+                "oracle.pytest.nodeid": nodeid,
+                "oracle.pytest.outcome": outcome,
+                "oracle.adapter.seq": seq,
+            }
+            _attach_example(runtime, case_event, hypothesis_example, example_table)
+            if failure_message:
+                case_event["oracle.pytest.failure_message"] = failure_message
+            runtime.emit_event("oracle.pytest.case", case_event)
 
         guard_status = "pass" if outcome == "pass" else "skip" if outcome == "skip" else "fail"
         runtime.emit_guard("oracle.pytest.outcome == pass", guard_status)
@@ -68,5 +218,179 @@ def emit_pytest_hypothesis_case(
             "pytest case nodeid is non-empty",
             "pass" if bool(nodeid.strip()) else "fail",
         )
-        runtime.emit_explanation(f"{nodeid} outcome: {outcome}")
+        if runtime.records_events:
+            runtime.emit_explanation(f"{nodeid} outcome: {outcome}")
         return span
+
+
+# Running totals for one nodeid: outcome counts, a histogram of normalized
+# example sizes, per-example durations, and the smallest failing example
+# seen so far (shortest JSON, then lexicographically first, which tracks
+# Hypothesis' own shrink order closely enough for reporting).
+class _CaseStats:
+    __slots__ = ("seq", "outcomes", "sizes", "durations", "min_failure")
+
+    def __init__(self, seq: int, buckets: int):
+        self.seq = seq
+        self.outcomes = {"pass": 0, "fail": 0, "skip": 0}
+        self.sizes = array("q", bytes(8 * (buckets + 1)))
+        self.durations = array("q")
+        self.min_failure: tuple[int, str, Mapping[str, Any], str | None] | None = None
+
+
+# Aggregating alternative to one emit_pytest_hypothesis_case span per
+# example: `record` only updates per-nodeid totals, and `flush` emits one
+# summary step per nodeid with the outcome counts, the example-size
+# histogram (`size_buckets` are upper bounds in bytes of normalized JSON,
+# plus an overflow bucket), duration percentiles, and the minimal failing
+# example as an `oracle.pytest.case` event. Nodeids get seqs from `seq_start`
+# in the order they are first recorded. Usable as a context manager that
+# flushes on exit.
+class HypothesisCaseAggregator:
+    def __init__(
+        self,
+        runtime: OTelRuntime,
+        *,
+        run_id: str,
+        seq_start: int = 1,
+        size_buckets: tuple[int, ...] = _EXAMPLE_SIZE_BUCKETS,
+        example_table: HypothesisExampleTable | None = None,
+        variant_id: str | None = None,
+        run_label: str | None = None,
+    ):
+        if list(size_buckets) != sorted(set(size_buckets)) or not size_buckets:
+            raise ValueError("size_buckets must be strictly increasing and non-empty")
+        self.runtime = runtime
+        self.run_id = run_id
+        self.size_buckets = tuple(size_buckets)
+        self.example_table = example_table
+        self.variant_id = variant_id
+        self.run_label = run_label
+        self._next_seq = seq_start
+        self._stats: dict[str, _CaseStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        nodeid: str,
+        outcome: str,
+        *,
+        hypothesis_example: Mapping[str, Any] | None = None,
+        duration_ns: int | None = None,
+        failure_message: str | None = None,
+    ) -> None:
+        if outcome not in _VALID_CASE_OUTCOMES:
+            raise ValueError(f"invalid test outcome: {outcome}")
+        if not self.runtime.records_spans:
+            return
+        example_json = None
+        if hypothesis_example is not None:
+            if self.example_table is not None:
+                example_json = self.example_table.serialize(hypothesis_example)[1]
+            else:
+                example_json = _normalize_example(hypothesis_example)
+        with self._lock:
+            stats = self._stats.get(nodeid)
+            if stats is None:
+                stats = self._stats[nodeid] = _CaseStats(self._next_seq, len(self.size_buckets))
+                self._next_seq += 1
+            stats.outcomes[outcome] += 1
+            if example_json is not None:
+                size = len(example_json)
+                stats.sizes[bisect_left(self.size_buckets, size)] += 1
+                if outcome == "fail":
+                    current = stats.min_failure
+                    if current is None or (size, example_json) < (current[0], current[1]):
+                        stats.min_failure = (size, example_json, hypothesis_example, failure_message)
+            if duration_ns is not None:
+                stats.durations.append(duration_ns)
+
+    def flush(self) -> list[SpanHandle]:
+        with self._lock:
+            pending, self._stats = self._stats, {}
+        return [self._emit_summary(nodeid, stats) for nodeid, stats in pending.items()]
+
+    def _emit_summary(self, nodeid: str, stats: _CaseStats) -> SpanHandle:
+        runtime = self.runtime
+        step_id = f"pytest:{nodeid}"
+        outcomes = stats.outcomes
+        examples = sum(outcomes.values())
+        with runtime.step_span(
+            run_id=self.run_id,
+            step_id=step_id,
+            seq=stats.seq,
+            variant_id=self.variant_id,
+            run_label=self.run_label,
+            attributes={
+                "oracle.adapter.family": "pytest+hypothesis",
+                "oracle.adapter.source": "hypothesis.aggregate",
+                "oracle.pytest.nodeid": nodeid,
+            },
+        ) as span:
+            runtime.set_span_attributes(
+                {
+                    "oracle.hypothesis.examples": examples,
+                    "oracle.hypothesis.passed": outcomes["pass"],
+                    "oracle.hypothesis.failed": outcomes["fail"],
+                    "oracle.hypothesis.skipped": outcomes["skip"],
+                },
+                span=span,
+            )
+            if runtime.records_events:
+                summary: dict[str, Any] = {
+                    "oracle.run_id": self.run_id,
+                    "oracle.step_id": step_id,
+                    "oracle.pytest.nodeid": nodeid,
+                    "oracle.hypothesis.examples": examples,
+                    "oracle.hypothesis.passed": outcomes["pass"],
+                    "oracle.hypothesis.failed": outcomes["fail"],
+                    "oracle.hypothesis.skipped": outcomes["skip"],
+                    "oracle.hypothesis.size_buckets": self.size_buckets,
+                    "oracle.hypothesis.size_histogram": tuple(stats.sizes),
+                }
+                if stats.durations:
+                    ordered = sorted(stats.durations)
+                    summary.update(
+                        {
+                            "oracle.hypothesis.duration_mean_ns": sum(ordered) // len(ordered),
+                            "oracle.hypothesis.duration_p50_ns": nearest_rank(ordered, 50),
+                            "oracle.hypothesis.duration_p95_ns": nearest_rank(ordered, 95),
+                            "oracle.hypothesis.duration_max_ns": ordered[-1],
+                        }
+                    )
+                runtime.emit_event("oracle.hypothesis.summary", summary)
+                if stats.min_failure is not None:
+                    _, _, example, failure_message = stats.min_failure
+                    case_event: dict[str, Any] = {
+                        "oracle.run_id": self.run_id,
+                        "oracle.step_id": step_id,
+                        "oracle.pytest.nodeid": nodeid,
+                        "oracle.pytest.outcome": "fail",
+                        "oracle.adapter.seq": stats.seq,
+                    }
+                    _attach_example(runtime, case_event, example, self.example_table)
+                    if failure_message:
+                        case_event["oracle.pytest.failure_message"] = failure_message
+                    runtime.emit_event("oracle.pytest.case", case_event)
+
+            if outcomes["fail"]:
+                guard_status = "fail"
+            elif outcomes["pass"]:
+                guard_status = "pass"
+            else:
+                guard_status = "skip"
+            runtime.emit_guard("oracle.pytest.outcome == pass", guard_status)
+            runtime.emit_invariant(
+                "pytest.case.identity",
+                "pytest case nodeid is non-empty",
+                "pass" if bool(nodeid.strip()) else "fail",
+            )
+            if runtime.records_events:
+                runtime.emit_explanation(f"{nodeid}: {examples} examples, {outcomes['fail']} failed")
+            return span
+
+    def __enter__(self) -> HypothesisCaseAggregator:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
@@ -1,8 +1,28 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Sequence
+from typing import Any, Iterable, Iterator, Mapping
 
-from oracle.otel_runtime import OTelRuntime, SpanRecord
+from oracle.adapters._streaming import StreamTally, emit_rows
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
+
+
+_SNOOP_EVENT_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.adapter.seq",
+    "oracle.snoop.message",
+    "code.filepath",
+    "code.lineno",
+)
+_BIRDSEYE_FRAME_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.adapter.seq",
+    "oracle.birdseye.module",
+    "oracle.birdseye.function",
+    "code.filepath",
+    "code.lineno",
+)
 
 
 def _event_seq(record: Mapping[str, Any], fallback: int) -> int:
@@ -13,13 +33,43 @@ def _event_seq(record: Mapping[str, Any], fallback: int) -> int:
         return fallback
 
 
-def _is_monotonic(values: Sequence[int]) -> bool:
-    if not values:
-        return True
-    for idx in range(1, len(values)):
-        if values[idx] < values[idx - 1]:
-            return False
-    return True
+def _snoop_rows(
+    run_id: str, step_id: str, records: Iterable[Mapping[str, Any]], tally: StreamTally
+) -> Iterator[tuple[Any, ...]]:
+    # tally.ok tracks whether record sequence numbers are non-decreasing.
+    for idx, record in enumerate(records, start=1):
+        record_seq = _event_seq(record, idx)
+        if tally.last is not None and record_seq < tally.last:
+            tally.ok = False
+        tally.last = record_seq
+        tally.count = idx
+        yield (
+            run_id,
+            step_id,
+            record_seq,
+            str(record.get("message", "")),
+            str(record.get("filepath", "")),
+            int(record.get("lineno", 0) or 0),
+        )
+
+
+def _birdseye_rows(
+    run_id: str, step_id: str, frames: Iterable[Mapping[str, Any]], tally: StreamTally
+) -> Iterator[tuple[Any, ...]]:
+    for idx, frame in enumerate(frames, start=1):
+        function = frame.get("function", "")
+        if not function:
+            tally.ok = False
+        tally.count = idx
+        yield (
+            run_id,
+            step_id,
+            idx,
+            str(frame.get("module", "")),
+            str(function),
+            str(frame.get("filepath", "")),
+            int(frame.get("lineno", 0) or 0),
+        )
 
 
 def emit_snoop_trace(
@@ -27,11 +77,14 @@ def emit_snoop_trace(
     *,
     run_id: str,
     seq: int,
-    records: Sequence[Mapping[str, Any]],
+    records: Iterable[Mapping[str, Any]],
     variant_id: str | None = None,
     run_label: str | None = None,
     step_id: str = "snoop.trace",
-) -> SpanRecord:
+) -> SpanHandle:
+    if not runtime.records_spans:
+        return NULL_SPAN
+
     with runtime.step_span(
         run_id=run_id,
         step_id=step_id,
@@ -41,30 +94,18 @@ def emit_snoop_trace(
         attributes={
             "oracle.adapter.family": "snoop+birdseye",
             "oracle.adapter.source": "snoop",
-            "oracle.snoop.count": len(records),
         },
     ) as span:
-        seq_values: list[int] = []
-        for idx, record in enumerate(records, start=1):
-            record_seq = _event_seq(record, idx)
-            seq_values.append(record_seq)
-            runtime.emit_event(
-                "oracle.snoop.event",
-                {
-                    "oracle.run_id": run_id,
-                    "oracle.step_id": step_id,
-                    "oracle.adapter.seq": record_seq,
-                    "oracle.snoop.message": str(record.get("message", "")),
-                    "code.filepath": str(record.get("filepath", "")),
-                    "code.lineno": int(record.get("lineno", 0) or 0),
-                },
-            )
-
-        guard_status = "pass" if records else "skip"
-        invariant_status = "pass" if _is_monotonic(seq_values) else "fail"
+        tally = StreamTally()
+        emit_rows(runtime, "oracle.snoop.event", _snoop_rows(run_id, step_id, records, tally), _SNOOP_EVENT_KEYS)
+        runtime.set_span_attributes({"oracle.snoop.count": tally.count}, span=span)
+
+        guard_status = "pass" if tally.count else "skip"
+        invariant_status = "pass" if tally.ok else "fail"
         runtime.emit_guard("snoop.records > 0", guard_status)
         runtime.emit_invariant("snoop.seq.monotonic", "snoop sequence is monotonic", invariant_status)
-        runtime.emit_explanation(f"snoop records materialized: {len(records)}")
+        if runtime.records_events:
+            runtime.emit_explanation(f"snoop records materialized: {tally.count}")
         return span
 
 
@@ -73,11 +114,14 @@ def emit_birdseye_trace(
     *,
     run_id: str,
     seq: int,
-    frames: Sequence[Mapping[str, Any]],
+    frames: Iterable[Mapping[str, Any]],
     variant_id: str | None = None,
     run_label: str | None = None,
     step_id: str = "birdseye.trace",
-) -> SpanRecord:
+) -> SpanHandle:
+    if not runtime.records_spans:
+        return NULL_SPAN
+
     with runtime.step_span(
         run_id=run_id,
         step_id=step_id,
@@ -87,29 +131,19 @@ def emit_birdseye_trace(
         attributes={
             "oracle.adapter.family": "snoop+birdseye",
             "oracle.adapter.source": "birdseye",
-            "oracle.birdseye.count": len(frames),
         },
     ) as span:
-        for idx, frame in enumerate(frames, start=1):
-            runtime.emit_event(
-                "oracle.birdseye.frame",
-                {
-                    "oracle.run_id": run_id,
-                    "oracle.step_id": step_id,
-                    "oracle.adapter.seq": idx,
-                    "oracle.birdseye.module": str(frame.get("module", "")),
-                    "oracle.birdseye.function": str(frame.get("function", "")),
-                    "code.filepath": str(frame.get("filepath", "")),
-                    "code.lineno": int(frame.get("lineno", 0) or 0),
-                },
-            )
-
-        guard_status = "pass" if frames else "skip"
+        tally = StreamTally()
+        emit_rows(runtime, "oracle.birdseye.frame", _birdseye_rows(run_id, step_id, frames, tally), _BIRDSEYE_FRAME_KEYS)
+        runtime.set_span_attributes({"oracle.birdseye.count": tally.count}, span=span)
+
+        guard_status = "pass" if tally.count else "skip"
         runtime.emit_guard("birdseye.frames > 0", guard_status)
         runtime.emit_invariant(
             "birdseye.frame.identity",
             "birdseye frames include module+function identity",
-            "pass" if all(frame.get("function") for frame in frames) else "fail",
+            "pass" if tally.ok else "fail",
         )
-        runtime.emit_explanation(f"birdseye frames materialized: {len(frames)}")
+        if runtime.records_events:
+            runtime.emit_explanation(f"birdseye frames materialized: {tally.count}")
         return span
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import functools
+import itertools
+import linecache
+import reprlib
+import sys
+from types import CodeType, FrameType
+from typing import Any, Callable, Sequence
+
+from oracle.adapters._streaming import StreamTally
+from oracle.adapters.snoop_birdseye import _SNOOP_EVENT_KEYS
+from oracle.otel_runtime import NULL_SPAN, OTelRuntime, SpanHandle
+
+
+_SNOOP_VARIABLE_KEYS = (
+    "oracle.run_id",
+    "oracle.step_id",
+    "oracle.adapter.seq",
+    "oracle.snoop.variable",
+    "oracle.snoop.value",
+    "code.filepath",
+    "code.lineno",
+)
+_SNOOP_LIVE_KEYS = {"oracle.snoop.event": _SNOOP_EVENT_KEYS, "oracle.snoop.variable": _SNOOP_VARIABLE_KEYS}
+
+
+# Live counterpart of emit_snoop_trace: traces the lines of a `with` block
+# (or, as a decorator, of each call to the function) and feeds snoop-style
+# records into the block's step span. Line, call and return events are
+# sampled per source line: every `sample_every`-th execution is kept, up to
+# `max_per_line` samples per line, so a hot loop costs memory in proportion
+# to the samples rather than the iterations. On each kept line, the watched
+# locals (all of them when `watch` is None) whose repr changed are recorded
+# as `oracle.snoop.variable` events, with reprs cut to `max_repr` characters.
+# Both kinds of row share one buffer, flushed to the span in execution order
+# in batches of `batch_size`. `depth` > 1 also traces callees up to that many
+# frames below the traced one.
+class SnoopLiveTrace:
+    def __init__(
+        self,
+        runtime: OTelRuntime,
+        *,
+        run_id: str,
+        seq: int,
+        watch: Sequence[str] | None = None,
+        sample_every: int = 1,
+        max_per_line: int | None = None,
+        max_repr: int = 80,
+        depth: int = 1,
+        batch_size: int = 256,
+        variant_id: str | None = None,
+        run_label: str | None = None,
+        step_id: str = "snoop.trace",
+    ):
+        if sample_every <= 0 or batch_size <= 0 or depth <= 0 or max_repr <= 3:
+            raise ValueError("sample_every, batch_size and depth must be positive and max_repr above 3")
+        if max_per_line is not None and max_per_line <= 0:
+            raise ValueError("max_per_line must be positive")
+        self.runtime = runtime
+        self.run_id = run_id
+        self.seq = seq
+        self.step_id = step_id
+        self.variant_id = variant_id
+        self.run_label = run_label
+        self.watch = tuple(watch) if watch is not None else None
+        self.sample_every = sample_every
+        self.max_per_line = max_per_line
+        self.max_repr = max_repr
+        self.depth = depth
+        self.batch_size = batch_size
+        self.span: SpanHandle = NULL_SPAN
+        self.tally = StreamTally()
+        self.seen = 0
+        self.sampled_out = 0
+        self._repr = reprlib.Repr()
+        self._repr.maxstring = self._repr.maxother = max_repr
+        self._hits: dict[tuple[CodeType, str, int], int] = {}
+        self._last_values: dict[FrameType, dict[str, str]] = {}
+        self._rows: list[tuple[str, tuple[Any, ...]]] = []
+        self._codes: frozenset[CodeType] = frozenset()
+        self._frame: FrameType | None = None
+        self._previous_trace: Any = None
+        self._previous_frame_trace: Any = None
+        self._span_cm: Any = None
+
+    def _options(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "seq": self.seq,
+            "watch": self.watch,
+            "sample_every": self.sample_every,
+            "max_per_line": self.max_per_line,
+            "max_repr": self.max_repr,
+            "depth": self.depth,
+            "batch_size": self.batch_size,
+            "variant_id": self.variant_id,
+            "run_label": self.run_label,
+            "step_id": self.step_id,
+        }
+
+    # Used as a decorator, every call of `func` gets its own trace and span.
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        options = self._options()
+        runtime = self.runtime
+
+        @functools.wraps(func)
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            trace = SnoopLiveTrace(runtime, **options)
+            trace._codes = frozenset((func.__code__,))
+            with trace:
+                return func(*args, **kwargs)
+
+        return traced
+
+    def _short_repr(self, value: Any) -> str:
+        try:
+            text = self._repr.repr(value)
+        except Exception as exc:
+            text = f"<repr failed: {type(exc).__name__}>"
+        if len(text) > self.max_repr:
+            text = text[: self.max_repr - 3] + "..."
+        return text
+
+    def _keep(self, key: tuple[CodeType, str, int]) -> bool:
+        hits = self._hits.get(key, 0)
+        self._hits[key] = hits + 1
+        self.seen += 1
+        if hits % self.sample_every or (
+            self.max_per_line is not None and hits // self.sample_every >= self.max_per_line
+        ):
+            self.sampled_out += 1
+            return False
+        return True
+
+    def _record(self, frame: FrameType, message: str) -> None:
+        tally = self.tally
+        tally.count += 1
+        if not self.runtime.records_events:
+            return
+        code = frame.f_code
+        self._rows.append(
+            ("oracle.snoop.event", (self.run_id, self.step_id, tally.count, message, code.co_filename, frame.f_lineno))
+        )
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def _record_variables(self, frame: FrameType) -> None:
+        if not self.runtime.records_events:
+            return
+        local_vars = frame.f_locals
+        last = self._last_values.setdefault(frame, {})
+        names = self.watch if self.watch is not None else tuple(local_vars)
+        for name in names:
+            if name not in local_vars:
+                continue
+            value = self._short_repr(local_vars[name])
+            if last.get(name) == value:
+                continue
+            last[name] = value
+            self.tally.count += 1
+            self._rows.append(
+                (
+                    "oracle.snoop.variable",
+                    (self.run_id, self.step_id, self.tally.count, name, value, frame.f_code.co_filename, frame.f_lineno),
+                )
+            )
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    # Emits buffered rows in the order they were recorded, one emit_events
+    # call per run of same-named rows.
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        for name, group in itertools.groupby(rows, key=lambda entry: entry[0]):
+            self.runtime.emit_events(name, [row for _, row in group], keys=_SNOOP_LIVE_KEYS[name], span=self.span)
+
+    # Reads the rows back from the span and checks that their sequence numbers
+    # still rise in execution order after being split across emit_events calls.
+    def _check_seq_order(self) -> None:
+        tally = self.tally
+        for event in self.span.events:
+            if event.name not in _SNOOP_LIVE_KEYS:
+                continue
+            seq = event.attributes["oracle.adapter.seq"]
+            if tally.last is not None and seq <= tally.last:
+                tally.ok = False
+            tally.last = seq
+
+    def _is_traced(self, frame: FrameType) -> bool:
+        if frame.f_code in self._codes:
+            return True
+        if frame.f_code.co_filename == __file__:
+            return False
+        parent = frame.f_back
+        for _ in range(self.depth - 1):
+            if parent is None:
+                return False
+            if parent is self._frame or parent.f_code in self._codes:
+                return True
+            parent = parent.f_back
+        return False
+
+    # Tracers installed before the block (coverage, pdb, hunter) keep getting
+    # their events: the global one sees every call first, and a traced frame's
+    # local tracer forwards to the one it replaced until that one returns None.
+    def _chain(self, previous: Any) -> Any:
+        if previous is None:
+            return self._trace_frame
+        trace_frame = self._trace_frame
+
+        def trace(frame: FrameType, event: str, arg: Any) -> Any:
+            nonlocal previous
+            if previous is not None:
+                previous = previous(frame, event, arg)
+            trace_frame(frame, event, arg)
+            return trace
+
+        return trace
+
+    def _trace_call(self, frame: FrameType, event: str, arg: Any) -> Any:
+        previous = self._previous_trace
+        local = previous(frame, event, arg) if previous is not None else None
+        if event != "call" or not self._is_traced(frame):
+            return local
+        code = frame.f_code
+        if self._keep((code, "call", code.co_firstlineno)):
+            self._record(frame, f">>> call {code.co_qualname}")
+            self._record_variables(frame)
+        return self._chain(local)
+
+    def _trace_frame(self, frame: FrameType, event: str, arg: Any) -> Any:
+        if event == "line":
+            code = frame.f_code
+            if self._keep((code, event, frame.f_lineno)):
+                self._record(frame, linecache.getline(code.co_filename, frame.f_lineno).strip())
+                self._record_variables(frame)
+        elif event == "return":
+            code = frame.f_code
+            if self._keep((code, event, frame.f_lineno)):
+                self._record(frame, f"<<< return {self._short_repr(arg)}")
+            self._last_values.pop(frame, None)
+        return self._trace_frame
+
+    def __enter__(self) -> SnoopLiveTrace:
+        if not self.runtime.records_spans:
+            return self
+        self._span_cm = self.runtime.step_span(
+            run_id=self.run_id,
+            step_id=self.step_id,
+            seq=self.seq,
+            variant_id=self.variant_id,
+            run_label=self.run_label,
+            attributes={
+                "oracle.adapter.family": "snoop+birdseye",
+                "oracle.adapter.source": "snoop.live",
+            },
+        )
+        self.span = self._span_cm.__enter__()
+        self._previous_trace = sys.gettrace()
+        if not self._codes:
+            # Context-manager use traces the frame that entered the block.
+            self._frame = sys._getframe(1)
+            self._previous_frame_trace = self._frame.f_trace
+            self._frame.f_trace = self._chain(self._previous_frame_trace)
+        sys.settrace(self._trace_call)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        if self._span_cm is None:
+            return None
+        sys.settrace(self._previous_trace)
+        if self._frame is not None:
+            self._frame.f_trace = self._previous_frame_trace
+            self._frame = None
+            self._previous_frame_trace = None
+        self._last_values.clear()
+        runtime = self.runtime
+        span = self.span
+        try:
+            self.flush()
+            self._check_seq_order()
+            count = self.tally.count
+            runtime.set_span_attributes(
+                {"oracle.snoop.count": count, "oracle.snoop.seen": self.seen, "oracle.snoop.sampled_out": self.sampled_out},
+                span=span,
+            )
+            runtime.emit_guard("snoop.records > 0", "pass" if count else "skip", span=span)
+            runtime.emit_invariant(
+                "snoop.seq.monotonic", "snoop sequence is monotonic", "pass" if self.tally.ok else "fail", span=span
+            )
+            if runtime.records_events:
+                runtime.emit_explanation(
+                    f"snoop records traced live: {count} of {self.seen} events sampled", span=span
+                )
+        finally:
+            span_cm, self._span_cm = self._span_cm, None
+            result = span_cm.__exit__(*exc_info)
+        return result
+
+
+def trace_snoop(runtime: OTelRuntime, *, run_id: str, seq: int, **options: Any) -> SnoopLiveTrace:
+    return SnoopLiveTrace(runtime, run_id=run_id, seq=seq, **options)
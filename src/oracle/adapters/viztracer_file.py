@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import codecs
+import json
+import mmap
+import os
+import re
+from typing import Any, Iterable, Iterator
+
+from oracle.adapters.hunter_viztracer import emit_viztracer_trace
+from oracle.otel_runtime import OTelRuntime, SpanHandle
+
+
+_CHUNK_SIZE = 1 << 20
+_SEPARATORS = frozenset(" \t\r\n,")
+_TRACE_EVENTS_KEY = re.compile(rb'"traceEvents"\s*:\s*\[')
+
+
+def _trace_events_start(data: mmap.mmap) -> int:
+    # Chrome traces are either {"traceEvents": [...], ...} or a bare array.
+    head = data[:64].lstrip()
+    if head.startswith(b"["):
+        return data.find(b"[") + 1
+    match = _TRACE_EVENTS_KEY.search(data)
+    if match is None:
+        raise ValueError("no traceEvents array in trace file")
+    return match.end()
+
+
+# Yields the objects of the trace's `traceEvents` array one at a time. The
+# file is memory-mapped and decoded in `chunk_size` slices, so resident
+# memory is one chunk plus the event being parsed, not the whole file.
+def iter_trace_events(path: str | os.PathLike[str], *, chunk_size: int = _CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            raise ValueError("empty trace file")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            pos = _trace_events_start(data)
+            decoder = json.JSONDecoder()
+            utf8 = codecs.getincrementaldecoder("utf-8")()
+            buffer = ""
+            idx = 0
+
+            while True:
+                while idx < len(buffer) and buffer[idx] in _SEPARATORS:
+                    idx += 1
+                if idx < len(buffer) and buffer[idx] == "]":
+                    return
+                if idx < len(buffer):
+                    try:
+                        event, idx = decoder.raw_decode(buffer, idx)
+                    except json.JSONDecodeError:
+                        if pos >= size:
+                            raise ValueError("truncated trace event") from None
+                    else:
+                        yield event
+                        continue
+                if pos >= size:
+                    raise ValueError("unterminated traceEvents array")
+                end = min(pos + chunk_size, size)
+                buffer = buffer[idx:] + utf8.decode(data[pos:end], final=end == size)
+                pos = end
+                idx = 0
+
+
+# Turns Chrome trace events into emit_viztracer_trace records: complete
+# events (ph "X") map directly, and begin/end pairs (ph "B"/"E") are matched
+# per (pid, tid) stack. Metadata, instant and counter events are skipped, as
+# are end events without a matching begin.
+def iter_viztracer_records(events: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    open_begins: dict[tuple[Any, Any], list[dict[str, Any]]] = {}
+    for event in events:
+        phase = event.get("ph")
+        if phase == "X":
+            yield {
+                "name": event.get("name", ""),
+                "start_us": round(event.get("ts") or 0),
+                "duration_us": round(event.get("dur") or 0),
+                "pid": event.get("pid"),
+                "tid": event.get("tid"),
+            }
+        elif phase == "B":
+            open_begins.setdefault((event.get("pid"), event.get("tid")), []).append(event)
+        elif phase == "E":
+            stack = open_begins.get((event.get("pid"), event.get("tid")))
+            if not stack:
+                continue
+            begin = stack.pop()
+            start = begin.get("ts") or 0
+            yield {
+                "name": begin.get("name", ""),
+                "start_us": round(start),
+                "duration_us": round((event.get("ts") or 0) - start),
+                "pid": begin.get("pid"),
+                "tid": begin.get("tid"),
+            }
+
+
+def ingest_viztracer_file(
+    runtime: OTelRuntime,
+    path: str | os.PathLike[str],
+    *,
+    run_id: str,
+    seq: int,
+    chunk_size: int = _CHUNK_SIZE,
+    variant_id: str | None = None,
+    run_label: str | None = None,
+    step_id: str = "viztracer.trace",
+    rollup: bool = False,
+    top_k: int = 10,
+) -> SpanHandle:
+    return emit_viztracer_trace(
+        runtime,
+        run_id=run_id,
+        seq=seq,
+        records=iter_viztracer_records(iter_trace_events(path, chunk_size=chunk_size)),
+        variant_id=variant_id,
+        run_label=run_label,
+        step_id=step_id,
+        rollup=rollup,
+        top_k=top_k,
+    )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import socket
+import threading
+from typing import Any
+
+from oracle.otel_runtime import SpanRecord
+from oracle.span_codec import encode_span_binary, iter_binary_spans
+
+
+def parse_collector_address(raw: str) -> tuple[str, int]:
+    host, sep, port = raw.strip().rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"invalid collector address: {raw}")
+    return host, int(port)
+
+
+def _span_order_key(span: SpanRecord) -> tuple[str, int]:
+    try:
+        seq = int(span.attributes.get("oracle.seq", 0))
+    except (TypeError, ValueError):
+        seq = 0
+    return str(span.attributes.get("oracle.run_id", "")), seq
+
+
+# Worker-side sink: each finished span is sent as one binary frame. Sending is
+# synchronous so spans already handed to the kernel survive an abrupt worker
+# exit (process pools skip atexit handlers). A send on an established
+# connection that fails is retried once on a fresh one; a span that still
+# cannot be sent is counted in `dropped` (last error in `error`) rather than
+# raised, and the next span reconnects.
+class SocketSpanSink:
+    def __init__(self, address: tuple[str, int] | str, *, timeout: float = 10.0):
+        self.address = parse_collector_address(address) if isinstance(address, str) else address
+        self.timeout = timeout
+        self.sent = 0
+        self.dropped = 0
+        self.error: str | None = None
+        self._socket: socket.socket | None = None
+        self._lock = threading.Lock()
+
+    def _send(self, frame: bytes) -> None:
+        if self._socket is None:
+            self._socket = socket.create_connection(self.address, timeout=self.timeout)
+        try:
+            self._socket.sendall(frame)
+        except OSError:
+            self._close_socket()
+            raise
+
+    def _close_socket(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def export(self, span: SpanRecord) -> None:
+        frame = encode_span_binary(span)
+        with self._lock:
+            reconnect = self._socket is not None
+            try:
+                try:
+                    self._send(frame)
+                except OSError:
+                    if not reconnect:
+                        raise
+                    self._send(frame)
+            except OSError as exc:
+                self._close_socket()
+                self.dropped += 1
+                self.error = f"{type(exc).__name__}: {exc}"
+                return
+            self.sent += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._close_socket()
+
+
+# Parent-side collector: accepts worker connections on localhost and merges
+# their spans into one store ordered by (oracle.run_id, oracle.seq, arrival).
+# It is also a SpanSink, so the parent runtime can feed it directly.
+class SpanCollector:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = socket.create_server((host, port))
+        self.address: tuple[str, int] = self._server.getsockname()[:2]
+        self._lock = threading.Lock()
+        self._spans: list[SpanRecord] = []
+        self._ordered: list[SpanRecord] | None = []
+        self._readers: list[threading.Thread] = []
+        self.errors: list[str] = []
+        self._closed = False
+        self._acceptor = threading.Thread(target=self._accept_loop, name="oracle-collector", daemon=True)
+        self._acceptor.start()
+
+    @property
+    def address_string(self) -> str:
+        host, port = self.address
+        return f"{host}:{port}"
+
+    def worker_env(self) -> dict[str, str]:
+        return {
+            "OTEL_TRACES_EXPORTER": "collector",
+            "ORACLE_COLLECTOR_ADDRESS": self.address_string,
+        }
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            conn.settimeout(None)
+            reader = threading.Thread(target=self._read_loop, args=(conn,), name="oracle-collector-reader", daemon=True)
+            with self._lock:
+                self._readers.append(reader)
+            reader.start()
+
+    def _read_loop(self, conn: socket.socket) -> None:
+        try:
+            with conn, conn.makefile("rb") as stream:
+                for span in iter_binary_spans(stream):
+                    self.export(span)
+        except (OSError, ValueError) as exc:
+            with self._lock:
+                self.errors.append(str(exc))
+
+    def export(self, span: SpanRecord) -> None:
+        with self._lock:
+            self._spans.append(span)
+            self._ordered = None
+
+    @property
+    def spans(self) -> list[SpanRecord]:
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = sorted(self._spans, key=_span_order_key)
+            return list(self._ordered)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._spans)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # Wakes the blocked accept() on platforms where close() alone does not.
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        self._acceptor.join(timeout)
+        with self._lock:
+            readers = list(self._readers)
+        for reader in readers:
+            reader.join(timeout)
+
+    def shutdown(self) -> None:
+        # The collector outlives the parent runtime that feeds it; its owner
+        # closes it once the workers are done.
+        return None
+
+    def __enter__(self) -> SpanCollector:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from typing import Any, Callable
+
+from oracle.otel_runtime import SpanRecord
+from oracle.span_codec import SPAN_FILE_FORMATS, encode_span_binary, encode_span_json
+
+
+BACKPRESSURE_POLICIES = ("block", "drop", "count")
+DROPPED_MARKER_SPAN = "oracle.sink.dropped"
+
+_STOP = object()
+# How often a blocked put re-checks that the writer thread is still alive.
+_PUT_POLL_SECONDS = 0.1
+
+
+# Writes finished spans from a background thread through a bounded queue. When
+# the queue is full, `block` waits for space, `drop` discards the span, and
+# `count` discards it but also writes an `oracle.sink.dropped` marker span with
+# the running drop count so the loss is visible in the file itself. A span
+# that fails to encode or write is counted in `failed` (last error in
+# `error`) and the writer moves on to the next one.
+class FileSpanSink:
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        format: str = "jsonl",
+        queue_size: int = 2048,
+        backpressure: str = "block",
+    ):
+        if format not in SPAN_FILE_FORMATS:
+            raise ValueError(f"unsupported span file format: {format}")
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"unsupported backpressure policy: {backpressure}")
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        self.path = os.fspath(path)
+        self.format = format
+        self.backpressure = backpressure
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.error: str | None = None
+        self._reported_dropped = 0
+        self._encode: Callable[[SpanRecord], bytes] = (
+            encode_span_binary if format == "binary" else encode_span_json
+        )
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._handle = open(self.path, "ab")
+        self._thread = threading.Thread(target=self._run, name="oracle-file-sink", daemon=True)
+        self._thread.start()
+
+    def export(self, span: SpanRecord) -> None:
+        if self._closed:
+            raise RuntimeError("span sink is shut down")
+        if self.backpressure == "block":
+            if not self._put_blocking(span):
+                with self._lock:
+                    self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    # Waits for queue space like a plain put, but gives up once the writer
+    # thread is gone, so a dead writer cannot hang export() or shutdown().
+    def _put_blocking(self, item: Any) -> bool:
+        while True:
+            try:
+                self._queue.put(item, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                if not self._thread.is_alive():
+                    return False
+
+    def _dropped_marker(self) -> SpanRecord | None:
+        if self.backpressure != "count":
+            return None
+        with self._lock:
+            dropped = self.dropped
+        if dropped == self._reported_dropped:
+            return None
+        self._reported_dropped = dropped
+        return SpanRecord(name=DROPPED_MARKER_SPAN, attributes={"oracle.sink.dropped_spans": dropped})
+
+    def _write(self, span: SpanRecord) -> None:
+        self._handle.write(self._encode(span))
+        self.written += 1
+
+    def _write_safely(self, span: SpanRecord) -> None:
+        try:
+            self._write(span)
+        except Exception as exc:
+            self.failed += 1
+            self.error = f"{type(exc).__name__}: {exc}"
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                marker = self._dropped_marker()
+                if marker is not None:
+                    self._write_safely(marker)
+                if item is not _STOP:
+                    self._write_safely(item)
+                if item is _STOP or self._queue.empty():
+                    try:
+                        self._handle.flush()
+                    except Exception as exc:
+                        self.error = f"{type(exc).__name__}: {exc}"
+                if item is _STOP:
+                    return
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def shutdown(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._put_blocking(_STOP):
+            self._thread.join()
+        self._handle.close()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Iterable
 
+from oracle._stats import nearest_rank
 from oracle.otel_runtime import SpanRecord
 
 
@@ -12,9 +13,26 @@ def _to_int(value: Any, default: int = 0) -> int:
         return default
 
 
+# Per-step_id latency over spans that carry timing; spans decoded from older
+# files without timestamps are left out rather than counted as zero.
+def _latency_summary(durations: dict[Any, list[int]]) -> dict[str, dict[str, int]]:
+    summary: dict[str, dict[str, int]] = {}
+    for step_id, values in durations.items():
+        ordered = sorted(values)
+        summary[str(step_id)] = {
+            "count": len(ordered),
+            "mean_ns": sum(ordered) // len(ordered),
+            "p50_ns": nearest_rank(ordered, 50),
+            "p95_ns": nearest_rank(ordered, 95),
+            "p99_ns": nearest_rank(ordered, 99),
+        }
+    return summary
+
+
 def materialize_dsa_steps(spans: Iterable[SpanRecord]) -> dict[str, Any]:
     ordered = sorted((span for span in spans if span.name == "oracle.step"), key=lambda s: _to_int(s.attributes.get("oracle.seq")))
     steps: list[dict[str, Any]] = []
+    durations: dict[Any, list[int]] = {}
 
     for span in ordered:
         guards: list[dict[str, Any]] = []
@@ -42,6 +60,10 @@ def materialize_dsa_steps(spans: Iterable[SpanRecord]) -> dict[str, Any]:
             if key in span.attributes:
                 provenance[key] = span.attributes[key]
 
+        duration_ns = span.duration_ns
+        if duration_ns is not None:
+            durations.setdefault(span.attributes.get("oracle.step_id"), []).append(duration_ns)
+
         steps.append(
             {
                 "run_id": span.attributes.get("oracle.run_id"),
@@ -54,7 +76,10 @@ def materialize_dsa_steps(spans: Iterable[SpanRecord]) -> dict[str, Any]:
                 "guards": guards,
                 "invariants": invariants,
                 "provenance": provenance,
+                "start_ns": span.start_ns or None,
+                "end_ns": span.end_ns or None,
+                "duration_ns": duration_ns,
             }
         )
 
-    return {"steps": steps}
+    return {"steps": steps, "latency": _latency_summary(durations)}
@@ -1,15 +1,54 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
+from array import array
+from bisect import bisect_right
+from collections import deque
+from contextlib import AbstractContextManager, contextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, Mapping, Protocol, Sequence
 
+import functools
+import heapq
+import itertools
 import os
+import random
+import sys
+import threading
+import time
 
 
 _VALID_STATUS = {"pass", "fail", "skip"}
 _SCHEMA_VERSION = "1.0.0"
+_MAX_PROVENANCE_DEPTH = 8
+
+
+_TRACES_EXPORTERS = {"none", "console", "otlp", "inmemory", "file", "collector"}
+_SDK_EXPORTERS = frozenset({"console", "otlp", "inmemory"})
+
+# off: spans and emit_* calls are no-ops; guards: spans plus guard/invariant
+# events only; full: everything.
+RECORDING_LEVELS = ("off", "guards", "full")
+_GUARD_EVENT_NAMES = frozenset({"oracle.guard", "oracle.invariant"})
+
+
+@dataclass(frozen=True)
+class FileExporterConfig:
+    path: str = "oracle-spans.jsonl"
+    format: str = "jsonl"
+    queue_size: int = 2048
+    backpressure: str = "block"
+
+
+# Mirrors the SDK's OTEL_BSP_* settings and defaults; applies to the SDK
+# exporters (console, otlp, inmemory).
+@dataclass(frozen=True)
+class BatchProcessorConfig:
+    max_queue_size: int = 2048
+    schedule_delay_millis: int = 5000
+    max_export_batch_size: int = 512
+    export_timeout_millis: int = 30000
 
 
 @dataclass(frozen=True)
@@ -18,19 +57,487 @@ class OTelConfig:
     traces_exporter: str
     otlp_endpoint: str | None
     resource_attributes: dict[str, str]
+    file_exporter: FileExporterConfig | None = None
+    collector_address: str | None = None
+    recording_level: str = "full"
+    batch_processor: BatchProcessorConfig = field(default_factory=BatchProcessorConfig)
+
+
+class _KeyShape:
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: position for position, key in enumerate(keys)}
+
 
+_KEY_SHAPES: dict[tuple[str, ...], _KeyShape] = {}
 
-@dataclass
+
+def _key_shape(keys: tuple[str, ...]) -> _KeyShape:
+    shape = _KEY_SHAPES.get(keys)
+    if shape is None:
+        interned = tuple(sys.intern(key) for key in keys)
+        shape = _KEY_SHAPES.setdefault(interned, _KeyShape(interned))
+        _KEY_SHAPES.setdefault(keys, shape)
+    return shape
+
+
+class EventAttributes(Mapping[str, Any]):
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, shape: _KeyShape, values: tuple[Any, ...]):
+        self._shape = shape
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._shape.index[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self._shape.keys, self._values)))
+
+
+# Events keep their values in a tuple and their keys in a process-wide table of
+# interned key shapes, so events emitted by the same adapter share one key tuple.
 class EventRecord:
-    name: str
-    attributes: dict[str, Any] = field(default_factory=dict)
+    __slots__ = ("name", "time_ns", "_shape", "_values")
+
+    def __init__(self, name: str, attributes: Mapping[str, Any] | None = None, time_ns: int = 0):
+        attrs = attributes or {}
+        self.name = name
+        self.time_ns = time_ns
+        self._shape = _key_shape(tuple(attrs))
+        self._values = tuple(attrs.values())
+
+    @classmethod
+    def _from_shape(cls, name: str, shape: _KeyShape, values: tuple[Any, ...], time_ns: int = 0) -> EventRecord:
+        event = cls.__new__(cls)
+        event.name = name
+        event.time_ns = time_ns
+        event._shape = shape
+        event._values = values
+        return event
+
+    @property
+    def attributes(self) -> EventAttributes:
+        return EventAttributes(self._shape, self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EventRecord):
+            return NotImplemented
+        return self.name == other.name and dict(self.attributes) == dict(other.attributes)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EventRecord(name={self.name!r}, attributes={self.attributes!r})"
+
+    def __reduce__(self):
+        return (EventRecord, (self.name, dict(self.attributes), self.time_ns))
+
+
+# Columnar event storage for one span: consecutive events that share a name and
+# key shape form a segment, so each event costs one values tuple in `_values`
+# and one slot in the `_times` array.
+class EventBuffer(Sequence[EventRecord]):
+    __slots__ = ("_starts", "_segments", "_values", "_times", "_lock")
+
+    def __init__(self, events: Iterable[EventRecord] = ()):
+        self._starts: list[int] = []
+        self._segments: list[tuple[str, _KeyShape]] = []
+        self._values: list[tuple[Any, ...]] = []
+        self._times = array("q")
+        # Held by writers for a whole batch; reentrant so a row generator can
+        # emit on the same span while its batch is being consumed.
+        self._lock = threading.RLock()
+        for event in events:
+            self.append(event)
+
+    # Bulk appenders for rows of one event name and key shape; callers hold
+    # `_lock`. Returns the values and times appenders and the segment they
+    # fill. A caller that lets other code run between rows (a row generator
+    # can emit a guard on the same span mid-batch) checks that the segment is
+    # still the tail before each row and reopens it with `_open_segment` if
+    # not, so later rows are never filed under another event's name and keys.
+    def _row_appender(
+        self, name: str, shape: _KeyShape
+    ) -> tuple[Callable[[tuple[Any, ...]], None], Callable[[int], None], tuple[str, _KeyShape] | None]:
+        segments = self._segments
+        if segments and segments[-1][0] == name and segments[-1][1] is shape:
+            segment = segments[-1]
+        else:
+            segment = (name, shape)
+            self._open_segment(segment)
+        return self._values.append, self._times.append, segment
+
+    def _open_segment(self, segment: tuple[str, _KeyShape]) -> None:
+        self._starts.append(len(self._values))
+        self._segments.append(segment)
+
+    # Appends one row; callers hold `_lock`.
+    def _append_row(self, name: str, shape: _KeyShape, row: tuple[Any, ...], time_ns: int) -> None:
+        segments = self._segments
+        if not segments or segments[-1][0] != name or segments[-1][1] is not shape:
+            self._open_segment((name, shape))
+        self._values.append(row)
+        self._times.append(time_ns)
+
+    def append(self, event: EventRecord) -> None:
+        lock = self._lock
+        lock.acquire()
+        try:
+            self._append_row(event.name, event._shape, event._values, event.time_ns)
+        finally:
+            lock.release()
+
+    def extend(self, events: Iterable[EventRecord]) -> None:
+        for event in events:
+            self.append(event)
+
+    def clear(self) -> None:
+        self._starts.clear()
+        self._segments.clear()
+        self._values.clear()
+        del self._times[:]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self._values)))]
+        if index < 0:
+            index += len(self._values)
+        if not 0 <= index < len(self._values):
+            raise IndexError("event index out of range")
+        name, shape = self._segments[bisect_right(self._starts, index) - 1]
+        return EventRecord._from_shape(name, shape, self._values[index], self._times[index])
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        starts = self._starts
+        values = self._values
+        times = self._times
+        for position, (name, shape) in enumerate(self._segments):
+            start = starts[position]
+            end = starts[position + 1] if position + 1 < len(starts) else len(values)
+            for row, time_ns in zip(values[start:end], times[start:end]):
+                yield EventRecord._from_shape(name, shape, row, time_ns)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EventBuffer({list(self)!r})"
 
+    def __reduce__(self):
+        return (EventBuffer, (list(self),))
 
-@dataclass
+
+@dataclass(frozen=True)
+class EventSamplingPolicy:
+    head: int = 1000
+    tail: int = 1000
+    reservoir: int = 1000
+    always_keep: frozenset[str] = frozenset({"oracle.guard", "oracle.invariant", "oracle.explanation"})
+    keep_failures: bool = True
+    seed: int | None = 0
+
+    def __post_init__(self) -> None:
+        if self.head < 0 or self.tail < 0 or self.reservoir < 0:
+            raise ValueError("sampling head/tail/reservoir must be non-negative")
+
+
+_FAILURE_STATUS_KEYS = ("oracle.guard.status", "oracle.invariant.status", "oracle.pytest.outcome")
+
+# (emission index, name, key shape, values, time_ns)
+_SampledEntry = tuple[int, str, _KeyShape, tuple[Any, ...], int]
+
+
+def _discard_time(time_ns: int) -> None:
+    return None
+
+
+# Keeps the first `head` and last `tail` events, reservoir-samples the events in
+# between, and always keeps the policy's protected names and failing events.
+# Kept events are held as (index, name, shape, values) until `finalize` writes
+# them back in emission order.
+class SampledEventBuffer(EventBuffer):
+    __slots__ = ("policy", "seen", "_head", "_tail", "_reservoir", "_kept", "_middle_seen", "_dropped", "_rng", "_failure_slots")
+
+    def __init__(self, policy: EventSamplingPolicy):
+        super().__init__()
+        self.policy = policy
+        self.seen = 0
+        self._head: list[_SampledEntry] = []
+        self._tail: deque[_SampledEntry] = deque()
+        self._reservoir: list[_SampledEntry] = []
+        self._kept: list[_SampledEntry] = []
+        self._middle_seen = 0
+        self._dropped: dict[str, int] = {}
+        self._rng: random.Random | None = random.Random(policy.seed)
+        self._failure_slots: dict[_KeyShape, tuple[int, ...]] = {}
+
+    @property
+    def sampling(self) -> bool:
+        return self._rng is not None
+
+    def _is_failure(self, shape: _KeyShape, values: tuple[Any, ...]) -> bool:
+        slots = self._failure_slots.get(shape)
+        if slots is None:
+            slots = self._failure_slots[shape] = tuple(
+                shape.index[key] for key in _FAILURE_STATUS_KEYS if key in shape.index
+            )
+        return any(values[slot] == "fail" for slot in slots)
+
+    def _drop(self, name: str) -> None:
+        self._dropped[name] = self._dropped.get(name, 0) + 1
+
+    def _offer(self, name: str, shape: _KeyShape, values: tuple[Any, ...], time_ns: int) -> None:
+        policy = self.policy
+        entry = (self.seen, name, shape, values, time_ns)
+        self.seen += 1
+        if name in policy.always_keep or (policy.keep_failures and self._is_failure(shape, values)):
+            self._kept.append(entry)
+            return
+        if len(self._head) < policy.head:
+            self._head.append(entry)
+            return
+        self._tail.append(entry)
+        if len(self._tail) <= policy.tail:
+            return
+        entry = self._tail.popleft()
+        self._middle_seen += 1
+        if len(self._reservoir) < policy.reservoir:
+            self._reservoir.append(entry)
+            return
+        slot = self._rng.randrange(self._middle_seen)
+        if slot < policy.reservoir:
+            self._drop(self._reservoir[slot][1])
+            self._reservoir[slot] = entry
+        else:
+            self._drop(entry[1])
+
+    def _row_appender(
+        self, name: str, shape: _KeyShape
+    ) -> tuple[Callable[[tuple[Any, ...]], None], Callable[[int], None], tuple[str, _KeyShape] | None]:
+        if not self.sampling:
+            return super()._row_appender(name, shape)
+
+        # Sampled rows carry their own name and shape, so there is no segment
+        # to keep at the tail.
+        def append(values: tuple[Any, ...]) -> None:
+            self._offer(name, shape, values, time.perf_counter_ns())
+
+        return append, _discard_time, None
+
+    def _append_row(self, name: str, shape: _KeyShape, row: tuple[Any, ...], time_ns: int) -> None:
+        if not self.sampling:
+            super()._append_row(name, shape, row, time_ns)
+            return
+        self._offer(name, shape, row, time_ns)
+
+    def _ordered(self) -> list[_SampledEntry]:
+        return sorted([*self._head, *self._kept, *self._reservoir, *self._tail], key=lambda entry: entry[0])
+
+    def finalize(self) -> dict[str, Any]:
+        if not self.sampling:
+            return {}
+        ordered = self._ordered()
+        self._rng = None
+        for _, name, shape, values, time_ns in ordered:
+            super()._append_row(name, shape, values, time_ns)
+        self._head, self._kept, self._reservoir = [], [], []
+        self._tail.clear()
+
+        dropped = sum(self._dropped.values())
+        stats: dict[str, Any] = {
+            "oracle.sampling.events_seen": self.seen,
+            "oracle.sampling.events_kept": len(ordered),
+            "oracle.sampling.events_dropped": dropped,
+        }
+        if dropped:
+            names = sorted(self._dropped)
+            stats["oracle.sampling.dropped_event_names"] = names
+            stats["oracle.sampling.dropped_event_counts"] = [self._dropped[name] for name in names]
+        return stats
+
+    def __len__(self) -> int:
+        if self.sampling:
+            return len(self._head) + len(self._kept) + len(self._reservoir) + len(self._tail)
+        return super().__len__()
+
+    def __getitem__(self, index):
+        if self.sampling:
+            return list(self)[index]
+        return super().__getitem__(index)
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        if not self.sampling:
+            return super().__iter__()
+        return iter(
+            [EventRecord._from_shape(name, shape, values, time_ns) for _, name, shape, values, time_ns in self._ordered()]
+        )
+
+
+@dataclass(slots=True)
 class SpanRecord:
     name: str
     attributes: dict[str, Any] = field(default_factory=dict)
-    events: list[EventRecord] = field(default_factory=list)
+    events: EventBuffer = field(default_factory=EventBuffer)
+    start_ns: int = field(default=0, compare=False)
+    end_ns: int = field(default=0, compare=False)
+    otel_span: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.events, EventBuffer):
+            self.events = EventBuffer(self.events)
+
+    @property
+    def duration_ns(self) -> int | None:
+        if not self.start_ns or self.end_ns < self.start_ns:
+            return None
+        return self.end_ns - self.start_ns
+
+
+# Provenance is a chain of immutable frames; each frame caches its merged view
+# and, per attribute key tuple, the key shape and values it contributes.
+class _ProvenanceFrame:
+    __slots__ = ("parent", "values", "depth", "_merged", "_shapes")
+
+    def __init__(self, parent: _ProvenanceFrame | None, values: tuple[tuple[str, Any], ...]):
+        keys = {key for key, _ in values}
+        while parent is not None and all(key in keys for key, _ in parent.values):
+            parent = parent.parent
+        if parent is not None and parent.depth >= _MAX_PROVENANCE_DEPTH:
+            collapsed = dict(parent.merged)
+            collapsed.update(values)
+            parent = None
+            values = tuple(collapsed.items())
+        self.parent = parent
+        self.values = values
+        self.depth = 1 if parent is None else parent.depth + 1
+        self._merged: Mapping[str, Any] | None = None
+        self._shapes: dict[tuple[str, ...], tuple[_KeyShape, tuple[Any, ...]]] = {}
+
+    @property
+    def merged(self) -> Mapping[str, Any]:
+        if self._merged is None:
+            out = dict(self.parent.merged) if self.parent is not None else {}
+            out.update(self.values)
+            self._merged = MappingProxyType(out)
+        return self._merged
+
+    def shape_for(self, keys: tuple[str, ...]) -> tuple[_KeyShape, tuple[Any, ...]]:
+        cached = self._shapes.get(keys)
+        if cached is None:
+            extra = [(key, value) for key, value in self.merged.items() if key not in keys]
+            shape = _key_shape(keys + tuple(key for key, _ in extra))
+            cached = self._shapes[keys] = (shape, tuple(value for _, value in extra))
+        return cached
+
+
+_ROOT_PROVENANCE = _ProvenanceFrame(None, ())
+
+
+class _ProvenanceScope:
+    __slots__ = ("_var", "_frame", "_token")
+
+    def __init__(self, var: ContextVar[_ProvenanceFrame], frame: _ProvenanceFrame):
+        self._var = var
+        self._frame = frame
+        self._token = None
+
+    def __enter__(self) -> Mapping[str, Any]:
+        self._token = self._var.set(self._frame)
+        return self._frame.merged
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._var.reset(self._token)
+
+
+class SpanSink(Protocol):
+    def export(self, span: SpanRecord) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+_SHARD_FLUSH_SIZE = 256
+
+
+# Finished spans are appended to a buffer owned by the closing thread, so the
+# hot path never takes a shared lock. Buffers are merged into the span store in
+# close order when a buffer fills up or when `spans` is read. Each drain also
+# forgets the emptied buffers of threads that have exited, so pools that churn
+# threads do not grow the shard list. A configured span store (ring, spill)
+# bounds memory itself, so it gets each span as it closes through
+# `append_through` instead; its limits and counters then hold at all times.
+class _SpanShards:
+    def __init__(self, flush_size: int = _SHARD_FLUSH_SIZE):
+        self.flush_size = flush_size
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, list[tuple[int, SpanRecord]]]] = []
+        self._ordinals = itertools.count()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list[tuple[int, SpanRecord]]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: list[tuple[int, SpanRecord]] = []
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    def append(self, span: SpanRecord) -> bool:
+        shard = self._shard()
+        shard.append((next(self._ordinals), span))
+        return len(shard) >= self.flush_size
+
+    def append_through(self, span: SpanRecord, store: SpanStore) -> None:
+        with self._lock:
+            store.append(span)
+
+    def drain_into(self, store: SpanStore) -> None:
+        with self._lock:
+            batches = []
+            live = []
+            for thread, shard in self._shards:
+                # Checked before reading the shard: a thread found dead here
+                # cannot append after the read, so its shard is left empty.
+                alive = thread.is_alive()
+                count = len(shard)
+                if count:
+                    batches.append(shard[:count])
+                    del shard[:count]
+                if alive:
+                    live.append((thread, shard))
+            self._shards = live
+            if not batches:
+                return
+            for _, span in heapq.merge(*batches, key=lambda entry: entry[0]):
+                store.append(span)
+
+
+class SpanStore(Protocol):
+    def append(self, span: SpanRecord) -> None: ...
+
+    def __iter__(self) -> Iterator[SpanRecord]: ...
+
+    def __len__(self) -> int: ...
 
 
 def _parse_resource_attributes(raw: str | None) -> dict[str, str]:
@@ -48,10 +555,58 @@ def _parse_resource_attributes(raw: str | None) -> dict[str, str]:
     return out
 
 
+def _env_int(source: Mapping[str, str], name: str, default: int) -> int:
+    raw = source.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        raise ValueError(f"invalid integer for {name}: {raw}") from None
+    if value <= 0:
+        raise ValueError(f"{name} must be positive: {raw}")
+    return value
+
+
+def _load_file_exporter_config(source: Mapping[str, str]) -> FileExporterConfig:
+    defaults = FileExporterConfig()
+    path = source.get("ORACLE_TRACES_FILE", "").strip() or defaults.path
+    file_format = source.get("ORACLE_TRACES_FILE_FORMAT", "").strip().lower() or defaults.format
+    if file_format not in {"jsonl", "binary"}:
+        raise ValueError(f"unsupported ORACLE_TRACES_FILE_FORMAT: {file_format}")
+    backpressure = source.get("ORACLE_TRACES_FILE_BACKPRESSURE", "").strip().lower() or defaults.backpressure
+    if backpressure not in {"block", "drop", "count"}:
+        raise ValueError(f"unsupported ORACLE_TRACES_FILE_BACKPRESSURE: {backpressure}")
+    return FileExporterConfig(
+        path=path,
+        format=file_format,
+        queue_size=_env_int(source, "ORACLE_TRACES_FILE_QUEUE_SIZE", defaults.queue_size),
+        backpressure=backpressure,
+    )
+
+
+def _load_batch_processor_config(source: Mapping[str, str]) -> BatchProcessorConfig:
+    defaults = BatchProcessorConfig()
+    config = BatchProcessorConfig(
+        max_queue_size=_env_int(source, "OTEL_BSP_MAX_QUEUE_SIZE", defaults.max_queue_size),
+        schedule_delay_millis=_env_int(source, "OTEL_BSP_SCHEDULE_DELAY", defaults.schedule_delay_millis),
+        max_export_batch_size=_env_int(source, "OTEL_BSP_MAX_EXPORT_BATCH_SIZE", defaults.max_export_batch_size),
+        export_timeout_millis=_env_int(source, "OTEL_BSP_EXPORT_TIMEOUT", defaults.export_timeout_millis),
+    )
+    if config.max_export_batch_size > config.max_queue_size:
+        raise ValueError("OTEL_BSP_MAX_EXPORT_BATCH_SIZE must not exceed OTEL_BSP_MAX_QUEUE_SIZE")
+    return config
+
+
+def _otlp_http_traces_url(endpoint: str) -> str:
+    base = endpoint.rstrip("/")
+    return base if base.endswith("/v1/traces") else f"{base}/v1/traces"
+
+
 def load_otel_config(env: Mapping[str, str] | None = None) -> OTelConfig:
     source = env if env is not None else os.environ
     traces_exporter = source.get("OTEL_TRACES_EXPORTER", "none").strip().lower() or "none"
-    if traces_exporter not in {"none", "console", "otlp"}:
+    if traces_exporter not in _TRACES_EXPORTERS:
         raise ValueError(f"unsupported OTEL_TRACES_EXPORTER: {traces_exporter}")
 
     service_name = source.get("OTEL_SERVICE_NAME", "oracle").strip() or "oracle"
@@ -62,86 +617,322 @@ def load_otel_config(env: Mapping[str, str] | None = None) -> OTelConfig:
     if "service.name" not in resource_attributes:
         resource_attributes["service.name"] = service_name
 
+    file_exporter = None
+    if traces_exporter == "file":
+        file_exporter = _load_file_exporter_config(source)
+
+    recording_level = source.get("ORACLE_RECORDING_LEVEL", "full").strip().lower() or "full"
+    if recording_level not in RECORDING_LEVELS:
+        raise ValueError(f"unsupported ORACLE_RECORDING_LEVEL: {recording_level}")
+
+    batch_processor = BatchProcessorConfig()
+    if traces_exporter in _SDK_EXPORTERS:
+        batch_processor = _load_batch_processor_config(source)
+
+    collector_address = None
+    if traces_exporter == "collector":
+        collector_address = source.get("ORACLE_COLLECTOR_ADDRESS", "").strip()
+        if not collector_address:
+            raise ValueError("OTEL_TRACES_EXPORTER=collector requires ORACLE_COLLECTOR_ADDRESS")
+
     return OTelConfig(
         service_name=service_name,
         traces_exporter=traces_exporter,
         otlp_endpoint=endpoint,
         resource_attributes=resource_attributes,
+        file_exporter=file_exporter,
+        collector_address=collector_address,
+        recording_level=recording_level,
+        batch_processor=batch_processor,
     )
 
 
+# The SDK subclasses are built on first use so importing this module never
+# imports the OpenTelemetry SDK.
+@functools.cache
+def _counting_batch_processor_type() -> type:
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+    # Counts the spans the wrapped exporter accepted or failed.
+    class CountingSpanExporter(SpanExporter):
+        def __init__(self, exporter: Any):
+            self.exporter = exporter
+            self.exported = 0
+            self.failed = 0
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence[Any]) -> Any:
+            result = self.exporter.export(spans)
+            with self._lock:
+                if result is SpanExportResult.SUCCESS:
+                    self.exported += len(spans)
+                else:
+                    self.failed += len(spans)
+            return result
+
+        def shutdown(self) -> None:
+            self.exporter.shutdown()
+
+        def force_flush(self, timeout_millis: int = 30000) -> bool:
+            return self.exporter.force_flush(timeout_millis)
+
+    # The SDK drops spans with only a log line when its queue is full and
+    # keeps no public counter, so drops are derived from submitted spans minus
+    # what reached the exporter once the queue has been flushed.
+    class CountingBatchSpanProcessor(BatchSpanProcessor):
+        def __init__(self, exporter: Any, config: BatchProcessorConfig):
+            self.counter = CountingSpanExporter(exporter)
+            self.submitted = 0
+            self._count_lock = threading.Lock()
+            super().__init__(
+                self.counter,
+                max_queue_size=config.max_queue_size,
+                schedule_delay_millis=config.schedule_delay_millis,
+                max_export_batch_size=config.max_export_batch_size,
+                export_timeout_millis=config.export_timeout_millis,
+            )
+
+        def on_end(self, span: Any) -> None:
+            if span.context and span.context.trace_flags.sampled:
+                with self._count_lock:
+                    self.submitted += 1
+            super().on_end(span)
+
+        def stats(self, *, flush: bool = True) -> dict[str, int]:
+            if flush:
+                self.force_flush()
+            with self._count_lock:
+                submitted = self.submitted
+            exported = self.counter.exported
+            failed = self.counter.failed
+            return {
+                "submitted": submitted,
+                "exported": exported,
+                "failed": failed,
+                "dropped": max(0, submitted - exported - failed),
+            }
+
+    return CountingBatchSpanProcessor
+
+
+# Shared stand-in returned by run_span/step_span when recording is off. It is
+# its own context manager, so entering a disabled span allocates nothing.
+class _NullSpan:
+    __slots__ = ()
+
+    name = "oracle.null"
+    attributes: Mapping[str, Any] = MappingProxyType({})
+    events: Sequence[EventRecord] = ()
+    start_ns = 0
+    end_ns = 0
+    duration_ns = None
+    otel_span = None
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def __repr__(self) -> str:
+        return "NULL_SPAN"
+
+
+NULL_SPAN = _NullSpan()
+# What run_span/step_span yield and the adapters return: a recorded span, or
+# NULL_SPAN when the recording level leaves spans off.
+SpanHandle = SpanRecord | _NullSpan
+
+
 class OTelRuntime:
     _active_spans: ContextVar[tuple[SpanRecord, ...]] = ContextVar("oracle_active_spans", default=())
-    _provenance: ContextVar[dict[str, Any] | None] = ContextVar("oracle_provenance", default=None)
+    _provenance: ContextVar[_ProvenanceFrame] = ContextVar("oracle_provenance", default=_ROOT_PROVENANCE)
 
-    def __init__(self, config: OTelConfig):
+    def __init__(
+        self,
+        config: OTelConfig,
+        *,
+        span_store: SpanStore | None = None,
+        event_sampling: EventSamplingPolicy | None = None,
+        span_sinks: Sequence[SpanSink] = (),
+    ):
         self.config = config
-        self.spans: list[SpanRecord] = []
+        if config.recording_level not in RECORDING_LEVELS:
+            raise ValueError(f"unsupported recording level: {config.recording_level}")
+        self.recording_level = config.recording_level
+        # Plain attributes rather than properties: they are read on every
+        # emit_* call, including inside hot loops with recording off.
+        self.records_spans = config.recording_level != "off"
+        self.records_events = config.recording_level == "full"
+        self._store: SpanStore = span_store if span_store is not None else []
+        self._store_direct = span_store is not None
+        self._shards = _SpanShards()
+        self.event_sampling = event_sampling
+        self.span_sinks: list[SpanSink] = list(span_sinks)
+        self.sink_errors = 0
+        self.sink_error: str | None = None
         self._otel_enabled = False
         self._otel_error: str | None = None
         self._tracer = None
-        self._configure_otel()
+        self._otel_provider: Any = None
+        self._otel_processor: Any = None
+        self._otel_exporter: Any = None
+        self._otel_trace: Any = None
+        self._otel_context: Any = None
+        # The SDK is imported and the provider built on the first span, so
+        # runtimes that never open one never pay for the OpenTelemetry import.
+        self._otel_pending = config.traces_exporter in _SDK_EXPORTERS
+        self._otel_lock = threading.Lock()
+        self._configure_sinks()
 
     @classmethod
-    def from_env(cls, env: Mapping[str, str] | None = None) -> OTelRuntime:
-        return cls(load_otel_config(env))
+    def from_env(
+        cls,
+        env: Mapping[str, str] | None = None,
+        *,
+        span_store: SpanStore | None = None,
+        event_sampling: EventSamplingPolicy | None = None,
+        span_sinks: Sequence[SpanSink] = (),
+    ) -> OTelRuntime:
+        return cls(
+            load_otel_config(env),
+            span_store=span_store,
+            event_sampling=event_sampling,
+            span_sinks=span_sinks,
+        )
+
+    @property
+    def spans(self) -> SpanStore:
+        self._shards.drain_into(self._store)
+        return self._store
 
     @property
     def otel_enabled(self) -> bool:
+        self._ensure_otel()
         return self._otel_enabled
 
     @property
     def otel_error(self) -> str | None:
+        self._ensure_otel()
         return self._otel_error
 
-    def _configure_otel(self) -> None:
-        if self.config.traces_exporter == "none":
+    @property
+    def otel_exporter(self) -> Any:
+        # The SDK exporter behind the batch processor, e.g. the
+        # InMemorySpanExporter for `inmemory`; None when OTel is not enabled.
+        self._ensure_otel()
+        return self._otel_exporter
+
+    def otel_export_stats(self, *, flush: bool = True) -> dict[str, int]:
+        # Spans handed to the batch processor and what became of them. The SDK
+        # drops spans when its queue is full; `dropped` is exact once the queue
+        # is flushed (the default) or the runtime is shut down.
+        self._ensure_otel()
+        if self._otel_processor is None:
+            return {"submitted": 0, "exported": 0, "failed": 0, "dropped": 0}
+        return self._otel_processor.stats(flush=flush and self._otel_provider is not None)
+
+    @property
+    def otel_dropped_spans(self) -> int:
+        return self.otel_export_stats()["dropped"]
+
+    def _ensure_otel(self) -> None:
+        if not self._otel_pending:
+            return
+        with self._otel_lock:
+            if self._otel_pending:
+                try:
+                    self._configure_otel()
+                finally:
+                    self._otel_pending = False
+
+    def _configure_sinks(self) -> None:
+        if self.config.traces_exporter == "file":
+            from oracle.file_sink import FileSpanSink
+
+            file_config = self.config.file_exporter or FileExporterConfig()
+            self.span_sinks.append(
+                FileSpanSink(
+                    file_config.path,
+                    format=file_config.format,
+                    queue_size=file_config.queue_size,
+                    backpressure=file_config.backpressure,
+                )
+            )
             return
+        if self.config.traces_exporter == "collector":
+            from oracle.collector import SocketSpanSink
 
+            self.span_sinks.append(SocketSpanSink(self.config.collector_address or ""))
+
+    def _configure_otel(self) -> None:
         try:
-            from opentelemetry import trace
+            from opentelemetry import context, trace
             from opentelemetry.sdk.resources import Resource
             from opentelemetry.sdk.trace import TracerProvider
-            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+            CountingBatchSpanProcessor = _counting_batch_processor_type()
         except Exception as exc:  # pragma: no cover - optional dependency path
             self._otel_error = f"otel import unavailable: {exc}"
             return
 
         provider = TracerProvider(resource=Resource.create(self.config.resource_attributes))
-        processor = None
+        exporter: Any = None
 
         if self.config.traces_exporter == "console":
-            processor = BatchSpanProcessor(ConsoleSpanExporter())
+            exporter = ConsoleSpanExporter()
+        elif self.config.traces_exporter == "inmemory":
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+            exporter = InMemorySpanExporter()
         elif self.config.traces_exporter == "otlp":
-            exporter = None
-            kwargs: dict[str, Any] = {}
-            if self.config.otlp_endpoint:
-                kwargs["endpoint"] = self.config.otlp_endpoint
+            endpoint = self.config.otlp_endpoint
             try:
                 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 
-                exporter = OTLPSpanExporter(**kwargs)
+                # OTEL_EXPORTER_OTLP_ENDPOINT is a base URL, while the HTTP
+                # exporter's `endpoint` argument is the full signal URL.
+                exporter = OTLPSpanExporter(endpoint=_otlp_http_traces_url(endpoint) if endpoint else None)
             except Exception:
                 try:
                     from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
-                    exporter = OTLPSpanExporter(**kwargs)
+                    exporter = OTLPSpanExporter(endpoint=endpoint)
                 except Exception as exc:  # pragma: no cover - optional dependency path
                     self._otel_error = f"otlp exporter unavailable: {exc}"
                     return
-            processor = BatchSpanProcessor(exporter)
 
-        if processor is not None:
+        if exporter is not None:
+            processor = CountingBatchSpanProcessor(exporter, self.config.batch_processor)
             provider.add_span_processor(processor)
-            trace.set_tracer_provider(provider)
-            self._tracer = trace.get_tracer("oracle.otel_runtime")
+            # The runtime traces through its own provider; the global one is
+            # only installed once so later runtimes do not trip the SDK's
+            # override warning.
+            if isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+                trace.set_tracer_provider(provider)
+            self._otel_provider = provider
+            self._otel_processor = processor
+            self._otel_exporter = exporter
+            self._tracer = provider.get_tracer("oracle.otel_runtime")
+            self._otel_trace = trace
+            self._otel_context = context
             self._otel_enabled = True
 
+    def shutdown(self) -> None:
+        for sink in self.span_sinks:
+            sink.shutdown()
+        if self._otel_provider is not None:
+            # Flushes spans still queued in the batch processor.
+            self._otel_provider.shutdown()
+            self._otel_provider = None
+
     def _merged_with_provenance(self, attrs: dict[str, Any] | None = None) -> dict[str, Any]:
         out = dict(attrs or {})
-        provenance = self._provenance.get() or {}
-        for key, value in provenance.items():
-            out.setdefault(key, value)
+        frame = self._provenance.get()
+        if frame.values:
+            shape, extra_values = frame.shape_for(tuple(out))
+            out.update(zip(shape.keys[len(out) :], extra_values))
         return out
 
     def _current_span(self) -> SpanRecord | None:
@@ -152,26 +943,69 @@ class OTelRuntime:
 
     @contextmanager
     def _open_span(self, name: str, attributes: dict[str, Any]):
-        span_record = SpanRecord(name=name, attributes=dict(attributes))
+        span_record = SpanRecord(name=name, attributes=dict(attributes), start_ns=time.perf_counter_ns())
+        if self.event_sampling is not None:
+            span_record.events = SampledEventBuffer(self.event_sampling)
+        if self._otel_pending:
+            self._ensure_otel()
         stack = self._active_spans.get()
         token = self._active_spans.set(stack + (span_record,))
 
-        otel_cm = None
+        otel_span = None
+        otel_token = None
         if self._otel_enabled and self._tracer is not None:
-            otel_cm = self._tracer.start_as_current_span(name)
-            otel_span = otel_cm.__enter__()
-            for key, value in attributes.items():
-                otel_span.set_attribute(key, value)
+            # Parent on the enclosing local span's SDK handle rather than the
+            # ambient OTel context, then make the new span current so user
+            # instrumentation nests under it.
+            parent = stack[-1].otel_span if stack else None
+            parent_context = self._otel_trace.set_span_in_context(parent) if parent is not None else None
+            otel_span = self._tracer.start_span(name, context=parent_context, attributes=span_record.attributes)
+            span_record.otel_span = otel_span
+            otel_token = self._otel_context.attach(self._otel_trace.set_span_in_context(otel_span))
 
         try:
             yield span_record
         finally:
-            if otel_cm is not None:
-                otel_cm.__exit__(None, None, None)
-            self.spans.append(span_record)
-            self._active_spans.reset(token)
+            # The span leaves the active stack whatever happens below, so a
+            # failure here never re-parents later spans in this context.
+            try:
+                span_record.end_ns = time.perf_counter_ns()
+                if isinstance(span_record.events, SampledEventBuffer):
+                    stats = span_record.events.finalize()
+                    span_record.attributes.update(stats)
+                    if otel_span is not None:  # pragma: no cover - requires optional dependency
+                        otel_span.set_attributes(stats)
+                        for event in span_record.events:
+                            otel_span.add_event(event.name, event.attributes)
+            finally:
+                if otel_span is not None:
+                    self._otel_context.detach(otel_token)
+                self._active_spans.reset(token)
+            if otel_span is not None:
+                otel_span.end()
+            self._publish(span_record)
+
+    # Hands a closed span to the store and the sinks. A store or sink that
+    # raises is counted in `sink_errors`, with the last failure kept in
+    # `sink_error`, instead of failing the instrumented code.
+    def _publish(self, span_record: SpanRecord) -> None:
+        try:
+            if self._store_direct:
+                self._shards.append_through(span_record, self._store)
+            elif self._shards.append(span_record):
+                self._shards.drain_into(self._store)
+        except Exception as exc:
+            self._sink_failed("span store", exc)
+        for sink in self.span_sinks:
+            try:
+                sink.export(span_record)
+            except Exception as exc:
+                self._sink_failed(type(sink).__name__, exc)
+
+    def _sink_failed(self, where: str, exc: Exception) -> None:
+        self.sink_errors += 1
+        self.sink_error = f"{where} failed: {type(exc).__name__}: {exc}"
 
-    @contextmanager
     def run_span(
         self,
         *,
@@ -180,7 +1014,9 @@ class OTelRuntime:
         variant_id: str | None = None,
         run_label: str | None = None,
         attributes: dict[str, Any] | None = None,
-    ):
+    ) -> AbstractContextManager[SpanHandle]:
+        if not self.records_spans:
+            return NULL_SPAN
         span_attrs: dict[str, Any] = {
             "oracle.evidence.schema_version": _SCHEMA_VERSION,
             "oracle.run_id": run_id,
@@ -192,10 +1028,8 @@ class OTelRuntime:
             span_attrs["oracle.run_label"] = run_label
         span_attrs.update(attributes or {})
         span_attrs = self._merged_with_provenance(span_attrs)
-        with self._open_span("oracle.run", span_attrs) as span_record:
-            yield span_record
+        return self._open_span("oracle.run", span_attrs)
 
-    @contextmanager
     def step_span(
         self,
         *,
@@ -205,7 +1039,9 @@ class OTelRuntime:
         variant_id: str | None = None,
         run_label: str | None = None,
         attributes: dict[str, Any] | None = None,
-    ):
+    ) -> AbstractContextManager[SpanHandle]:
+        if not self.records_spans:
+            return NULL_SPAN
         span_attrs: dict[str, Any] = {
             "oracle.evidence.schema_version": _SCHEMA_VERSION,
             "oracle.run_id": run_id,
@@ -218,38 +1054,152 @@ class OTelRuntime:
             span_attrs["oracle.run_label"] = run_label
         span_attrs.update(attributes or {})
         span_attrs = self._merged_with_provenance(span_attrs)
-        with self._open_span("oracle.step", span_attrs) as span_record:
-            yield span_record
+        return self._open_span("oracle.step", span_attrs)
+
+    def _push_provenance(self, values: tuple[tuple[str, Any], ...]) -> _ProvenanceFrame:
+        return _ProvenanceFrame(self._provenance.get(), values)
 
     def set_provenance_file(self, filepath: str, lineno: int) -> None:
-        current = dict(self._provenance.get() or {})
-        current["code.filepath"] = filepath
-        current["code.lineno"] = lineno
-        self._provenance.set(current)
+        self._provenance.set(self._push_provenance((("code.filepath", filepath), ("code.lineno", lineno))))
 
     def set_provenance_cell(self, notebook_id: str, cell_id: str) -> None:
-        current = dict(self._provenance.get() or {})
-        current["oracle.notebook_id"] = notebook_id
-        current["oracle.cell_id"] = cell_id
-        self._provenance.set(current)
+        self._provenance.set(self._push_provenance((("oracle.notebook_id", notebook_id), ("oracle.cell_id", cell_id))))
+
+    def provenance(
+        self,
+        attributes: Mapping[str, Any] | None = None,
+        *,
+        filepath: str | None = None,
+        lineno: int | None = None,
+        notebook_id: str | None = None,
+        cell_id: str | None = None,
+    ) -> _ProvenanceScope:
+        values = dict(attributes or {})
+        if filepath is not None:
+            values["code.filepath"] = filepath
+        if lineno is not None:
+            values["code.lineno"] = lineno
+        if notebook_id is not None:
+            values["oracle.notebook_id"] = notebook_id
+        if cell_id is not None:
+            values["oracle.cell_id"] = cell_id
+        return _ProvenanceScope(self._provenance, self._push_provenance(tuple(values.items())))
 
-    def _emit_event(self, name: str, attributes: dict[str, Any]) -> None:
-        span = self._current_span()
+    def _event_target(self, span: SpanHandle | None) -> tuple[SpanRecord, _ProvenanceFrame, Any]:
         if span is None:
-            raise RuntimeError("no active span")
-        merged = self._merged_with_provenance(attributes)
-        span.events.append(EventRecord(name=name, attributes=merged))
+            span = self._current_span()
+            if span is None:
+                raise RuntimeError("no active span")
+        elif isinstance(span, _NullSpan):
+            raise RuntimeError("NULL_SPAN does not record events")
+        provenance = self._provenance.get()
 
-        if self._otel_enabled:  # pragma: no cover - requires optional dependency
-            from opentelemetry import trace
+        otel_span = span.otel_span
+        if otel_span is not None and isinstance(span.events, SampledEventBuffer):
+            # Sampled spans export their kept events when they close.
+            otel_span = None
+        return span, provenance, otel_span
 
-            current = trace.get_current_span()
-            current.add_event(name, merged)
+    def set_span_attributes(self, attributes: Mapping[str, Any], *, span: SpanHandle | None = None) -> None:
+        # For values only known once the span's input has been consumed, such
+        # as counts from streaming adapters; mirrored onto the SDK span.
+        if not self.records_spans:
+            return
+        if span is None:
+            span = self._current_span()
+            if span is None:
+                raise RuntimeError("no active span")
+        elif isinstance(span, _NullSpan):
+            raise RuntimeError("NULL_SPAN does not record attributes")
+        span.attributes.update(attributes)
+        if span.otel_span is not None:  # pragma: no cover - requires optional dependency
+            span.otel_span.set_attributes(dict(attributes))
+
+    def _emit_event(self, name: str, attributes: Mapping[str, Any], span: SpanHandle | None = None) -> None:
+        span, provenance, otel_span = self._event_target(span)
+        shape, extra_values = provenance.shape_for(tuple(attributes))
+        values = tuple(attributes.values()) + extra_values
+        events = span.events
+        lock = events._lock
+        lock.acquire()
+        try:
+            events._append_row(name, shape, values, time.perf_counter_ns())
+        finally:
+            lock.release()
+        if otel_span is not None:  # pragma: no cover - requires optional dependency
+            otel_span.add_event(name, EventAttributes(shape, values))
 
-    def emit_event(self, name: str, attributes: dict[str, Any]) -> None:
-        self._emit_event(name, attributes)
+    def emit_event(self, name: str, attributes: dict[str, Any], *, span: SpanHandle | None = None) -> None:
+        if not self.records_events and (not self.records_spans or name not in _GUARD_EVENT_NAMES):
+            return
+        self._emit_event(name, attributes, span)
 
-    def emit_guard(self, condition: str, status: str) -> None:
+    def emit_events(
+        self,
+        name: str,
+        attributes: Iterable[Mapping[str, Any]] | Iterable[Sequence[Any]],
+        *,
+        keys: Sequence[str] | None = None,
+        span: SpanHandle | None = None,
+    ) -> int:
+        # Resolves the span, provenance and OTel handle once per batch. With
+        # `keys`, each item is a tuple of values in key order, which skips
+        # per-event dict construction and key-shape lookups entirely. `span`
+        # targets a specific open span, e.g. from a worker thread.
+        if not self.records_events and (not self.records_spans or name not in _GUARD_EVENT_NAMES):
+            return 0
+        span, provenance, otel_span = self._event_target(span)
+        events = span.events
+        segments = events._segments
+        clock = time.perf_counter_ns
+        count = 0
+
+        # The buffer's lock is held for the whole batch, so another thread
+        # emitting on this span waits instead of splitting the batch.
+        lock = events._lock
+        lock.acquire()
+        try:
+            if keys is not None:
+                shape, extra_values = provenance.shape_for(tuple(keys))
+                width = len(keys)
+                append, append_time, segment = events._row_appender(name, shape)
+                for values in attributes:
+                    row = tuple(values)
+                    if len(row) != width:
+                        raise ValueError(f"expected {width} values for {name}, got {len(row)}")
+                    if extra_values:
+                        row += extra_values
+                    if segment is not None and segments[-1] is not segment:
+                        events._open_segment(segment)
+                    append(row)
+                    append_time(clock())
+                    if otel_span is not None:  # pragma: no cover - requires optional dependency
+                        otel_span.add_event(name, EventAttributes(shape, row))
+                    count += 1
+                return count
+
+            last_keys: tuple[str, ...] | None = None
+            for attrs in attributes:
+                row_keys = tuple(attrs)
+                if row_keys != last_keys:
+                    shape, extra_values = provenance.shape_for(row_keys)
+                    append, append_time, segment = events._row_appender(name, shape)
+                    last_keys = row_keys
+                row = tuple(attrs.values()) + extra_values
+                if segment is not None and segments[-1] is not segment:
+                    events._open_segment(segment)
+                append(row)
+                append_time(clock())
+                if otel_span is not None:  # pragma: no cover - requires optional dependency
+                    otel_span.add_event(name, EventAttributes(shape, row))
+                count += 1
+            return count
+        finally:
+            lock.release()
+
+    def emit_guard(self, condition: str, status: str, *, span: SpanHandle | None = None) -> None:
+        if not self.records_spans:
+            return
         if status not in _VALID_STATUS:
             raise ValueError(f"invalid guard status: {status}")
         self._emit_event(
@@ -258,9 +1208,19 @@ class OTelRuntime:
                 "oracle.guard.condition": condition,
                 "oracle.guard.status": status,
             },
+            span,
         )
 
-    def emit_invariant(self, invariant_id: str, statement: str, status: str) -> None:
+    def emit_invariant(
+        self,
+        invariant_id: str,
+        statement: str,
+        status: str,
+        *,
+        span: SpanHandle | None = None,
+    ) -> None:
+        if not self.records_spans:
+            return
         if status not in _VALID_STATUS:
             raise ValueError(f"invalid invariant status: {status}")
         self._emit_event(
@@ -270,7 +1230,10 @@ class OTelRuntime:
                 "oracle.invariant.statement": statement,
                 "oracle.invariant.status": status,
             },
+            span,
         )
 
-    def emit_explanation(self, text: str) -> None:
-        self._emit_event("oracle.explanation", {"oracle.explanation.text": text})
+    def emit_explanation(self, text: str, *, span: SpanHandle | None = None) -> None:
+        if not self.records_events:
+            return
+        self._emit_event("oracle.explanation", {"oracle.explanation.text": text}, span)
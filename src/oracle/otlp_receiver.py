@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import signal
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable
+
+from oracle._stats import nearest_rank
+
+
+TRACES_PATH = "/v1/traces"
+STATS_PATH = "/stats"
+_PROTOBUF = "application/x-protobuf"
+_JSON = "application/json"
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": nearest_rank(ordered, 50),
+        "p95_ms": nearest_rank(ordered, 95),
+        "p99_ms": nearest_rank(ordered, 99),
+        "max_ms": ordered[-1],
+    }
+
+
+def _iter_json_spans(payload: dict[str, Any]) -> Iterable[tuple[int, int]]:
+    for resource_spans in payload.get("resourceSpans") or ():
+        for scope_spans in resource_spans.get("scopeSpans") or ():
+            for span in scope_spans.get("spans") or ():
+                yield len(span.get("events") or ()), int(span.get("endTimeUnixNano") or 0)
+
+
+def _iter_protobuf_spans(body: bytes) -> Iterable[tuple[int, int]]:
+    from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+    request = ExportTraceServiceRequest.FromString(body)
+    for resource_spans in request.resource_spans:
+        for scope_spans in resource_spans.scope_spans:
+            for span in scope_spans.spans:
+                yield len(span.events), span.end_time_unix_nano
+
+
+# Stand-in OTLP/HTTP trace receiver for load tests: accepts protobuf and JSON
+# export requests on /v1/traces, counts spans and events, and records request
+# handling time plus export lag (receive time minus span end time). It can
+# delay every request and fail a seeded fraction of them to exercise exporter
+# retries and batch-processor backpressure. GET /stats returns the counters.
+class OTLPReceiver:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        delay_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        if delay_seconds < 0:
+            raise ValueError("delay_seconds must be non-negative")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.delay_seconds = delay_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self.address: tuple[str, int] = self._server.server_address[:2]
+        self._closed = False
+        self._thread = threading.Thread(target=self._server.serve_forever, name="oracle-otlp-receiver", daemon=True)
+        self._thread.start()
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    @property
+    def traces_url(self) -> str:
+        return self.endpoint + TRACES_PATH
+
+    def worker_env(self) -> dict[str, str]:
+        return {
+            "OTEL_TRACES_EXPORTER": "otlp",
+            "OTEL_EXPORTER_OTLP_ENDPOINT": self.endpoint,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.spans = 0
+            self.events = 0
+            self.bytes_received = 0
+            self.errors_injected = 0
+            self.rejected = 0
+            self._handle_ms: list[float] = []
+            self._lag_ms: list[float] = []
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "spans": self.spans,
+                "events": self.events,
+                "bytes_received": self.bytes_received,
+                "errors_injected": self.errors_injected,
+                "rejected": self.rejected,
+                "handle_latency": _percentiles(self._handle_ms),
+                "export_lag": _percentiles(self._lag_ms),
+            }
+
+    def wait_for_spans(self, count: int, timeout: float = 10.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if self.spans >= count:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def _ingest(self, content_type: str, body: bytes) -> tuple[int, str, bytes]:
+        started = time.perf_counter()
+        received_ns = time.time_ns()
+        try:
+            if content_type == _JSON:
+                spans = list(_iter_json_spans(json.loads(body or b"{}")))
+                response = (200, _JSON, b"{}")
+            else:
+                spans = list(_iter_protobuf_spans(body))
+                response = (200, _PROTOBUF, b"")
+        except ImportError:
+            with self._lock:
+                self.rejected += 1
+            return 415, "text/plain", b"protobuf payloads need opentelemetry-proto"
+        except Exception as exc:
+            with self._lock:
+                self.rejected += 1
+            return 400, "text/plain", f"invalid export request: {exc}".encode("utf-8")
+
+        handle_ms = (time.perf_counter() - started) * 1e3
+        with self._lock:
+            self.spans += len(spans)
+            self.events += sum(events for events, _ in spans)
+            self._handle_ms.append(handle_ms)
+            self._lag_ms.extend((received_ns - end_ns) / 1e6 for _, end_ns in spans if end_ns)
+        return response
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+            def _reply(self, status: int, content_type: str, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path != STATS_PATH:
+                    self._reply(404, "text/plain", b"not found")
+                    return
+                self._reply(200, _JSON, json.dumps(receiver.stats()).encode("utf-8"))
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path != TRACES_PATH:
+                    self._reply(404, "text/plain", b"not found")
+                    return
+                with receiver._lock:
+                    receiver.requests += 1
+                    receiver.bytes_received += len(body)
+                if receiver.delay_seconds:
+                    time.sleep(receiver.delay_seconds)
+                if receiver._should_fail():
+                    with receiver._lock:
+                        receiver.errors_injected += 1
+                    self._reply(receiver.error_status, "text/plain", b"injected failure")
+                    return
+                encoding = (self.headers.get("Content-Encoding") or "").lower()
+                if encoding == "gzip":
+                    body = gzip.decompress(body)
+                elif encoding == "deflate":
+                    body = zlib.decompress(body)
+                content_type = (self.headers.get("Content-Type") or _PROTOBUF).split(";")[0].strip().lower()
+                self._reply(*receiver._ingest(content_type, body))
+
+        return Handler
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> OTLPReceiver:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local OTLP/HTTP trace receiver for throughput tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="sleep before answering each request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests to fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=None, help="exit after this many seconds")
+    args = parser.parse_args(argv)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    with OTLPReceiver(
+        args.host,
+        args.port,
+        delay_seconds=args.delay_ms / 1e3,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    ) as receiver:
+        # The first line is the endpoint, so a parent process can read it
+        # when the port was chosen by the OS.
+        print(receiver.endpoint, flush=True)
+        stop.wait(args.duration)
+        print(json.dumps(receiver.stats()), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import uuid
+import warnings
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+
+_DEFAULT_BATCH_SIZE = 512
+_OUTCOMES = {"passed": "pass", "failed": "fail", "skipped": "skip"}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("oracle", "oracle evidence")
+    group.addoption(
+        "--oracle-evidence",
+        action="store_true",
+        default=False,
+        help="emit one oracle pytest case span per test through the exporter configured in the environment",
+    )
+    group.addoption(
+        "--oracle-evidence-file",
+        default=None,
+        metavar="PATH",
+        help="like --oracle-evidence, but append JSONL spans to PATH (one file per xdist worker)",
+    )
+    group.addoption("--oracle-run-id", default=None, help="oracle.run_id for the emitted spans")
+    group.addoption("--oracle-run-label", default="pytest", help="oracle.run_label for the emitted spans")
+    group.addoption(
+        "--oracle-batch-size",
+        type=int,
+        default=_DEFAULT_BATCH_SIZE,
+        help="test reports handed to the background writer at a time",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    evidence_file = config.getoption("oracle_evidence_file")
+    if not (config.getoption("oracle_evidence") or evidence_file):
+        return
+    batch_size = config.getoption("oracle_batch_size")
+    if batch_size <= 0:
+        raise pytest.UsageError("--oracle-batch-size must be positive")
+    if _is_xdist_controller(config):
+        # Under `-n`, the workers run the tests and each writes its own file.
+        return
+
+    from oracle.otel_runtime import OTelRuntime
+    from oracle.span_store import RingSpanStore
+
+    workerinput = getattr(config, "workerinput", None) or {}
+    env = dict(os.environ)
+    path = None
+    if evidence_file:
+        # The writer thread encodes whole batches itself, so the runtime
+        # needs no exporter of its own.
+        env["OTEL_TRACES_EXPORTER"] = "none"
+        path = _worker_path(evidence_file, workerinput.get("workerid"))
+    try:
+        runtime = OTelRuntime.from_env(env, span_store=RingSpanStore(batch_size))
+    except ValueError as exc:
+        raise pytest.UsageError(f"oracle evidence: {exc}") from None
+    run_id = config.getoption("oracle_run_id") or workerinput.get("testrunuid") or uuid.uuid4().hex
+    plugin = OracleEvidencePlugin(
+        runtime, run_id=run_id, run_label=config.getoption("oracle_run_label"), batch_size=batch_size, path=path
+    )
+    config.pluginmanager.register(plugin, "oracle-evidence")
+
+
+def _is_xdist_controller(config: Any) -> bool:
+    return not hasattr(config, "workerinput") and bool(getattr(config.option, "numprocesses", None))
+
+
+def _worker_path(path: str, worker_id: str | None) -> str:
+    if worker_id is None:
+        return path
+    target = Path(path)
+    return str(target.with_name(f"{target.stem}.{worker_id}{target.suffix}"))
+
+
+def _failure_message(longrepr: Any) -> str | None:
+    if longrepr is None:
+        return None
+    crash = getattr(longrepr, "reprcrash", None)
+    if crash is not None:
+        return crash.message
+    if isinstance(longrepr, tuple) and len(longrepr) == 3:
+        return str(longrepr[2])
+    return str(longrepr)
+
+
+# Builds the case spans on a background thread, so the test process only pays
+# for appending a tuple per report. Batches arrive through a queue; a None
+# batch stops the thread. With a `path`, each batch is encoded and appended
+# with a single write.
+class _EvidenceWriter:
+    def __init__(self, runtime: Any, *, run_id: str, run_label: str, path: str | None = None):
+        self.runtime = runtime
+        self.run_id = run_id
+        self.run_label = run_label
+        self.path = path
+        self.written = 0
+        self.error: BaseException | None = None
+        self._queue: queue.SimpleQueue[list[tuple[Any, ...]] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="oracle-pytest-evidence", daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: list[tuple[Any, ...]]) -> None:
+        self._queue.put(batch)
+
+    def _run(self) -> None:
+        from oracle.adapters.pytest_hypothesis import emit_pytest_hypothesis_case
+        from oracle.span_codec import encode_span_json
+
+        handle = open(self.path, "ab") if self.path is not None else None
+        try:
+            while (batch := self._queue.get()) is not None:
+                if self.error is not None:
+                    continue
+                try:
+                    encoded = []
+                    for seq, nodeid, outcome, longrepr in batch:
+                        span = emit_pytest_hypothesis_case(
+                            self.runtime,
+                            run_id=self.run_id,
+                            seq=seq,
+                            nodeid=nodeid,
+                            outcome=outcome,
+                            failure_message=_failure_message(longrepr),
+                            run_label=self.run_label,
+                        )
+                        if handle is not None and self.runtime.records_spans:
+                            encoded.append(encode_span_json(span))
+                    if encoded:
+                        handle.write(b"".join(encoded))
+                    self.written += len(batch)
+                except Exception as exc:
+                    self.error = exc
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self.runtime.shutdown()
+
+
+# Registered by pytest_configure only when evidence is requested, so the
+# hooks below never run otherwise. `seq` is the test's 1-based position in
+# the collected items: every xdist worker collects the same list, so a test
+# gets the same seq whichever worker runs it. Reports forwarded to the xdist
+# controller carry `node` and are ignored there; the workers emit their own.
+# A case is recorded once its teardown report arrives, so a fixture that
+# fails in teardown turns an otherwise passing case into a failure.
+class OracleEvidencePlugin:
+    def __init__(
+        self,
+        runtime: Any,
+        *,
+        run_id: str,
+        run_label: str,
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+        path: str | None = None,
+    ):
+        self.runtime = runtime
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.seqs: dict[str, int] = {}
+        self._pending: dict[str, tuple[str, Any]] = {}
+        self._batch: list[tuple[Any, ...]] = []
+        self.writer = _EvidenceWriter(runtime, run_id=run_id, run_label=run_label, path=path)
+
+    def pytest_collection_finish(self, session: pytest.Session) -> None:
+        self.seqs = {item.nodeid: seq for seq, item in enumerate(session.items, start=1)}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if getattr(report, "node", None) is not None:
+            return
+        when = report.when
+        nodeid = report.nodeid
+        if when != "teardown":
+            if when == "call" or not report.passed:
+                self._pending[nodeid] = (_OUTCOMES[report.outcome], report.longrepr)
+            return
+        outcome, longrepr = self._pending.pop(nodeid, ("pass", None))
+        if report.failed and outcome != "fail":
+            outcome, longrepr = "fail", report.longrepr
+        self._batch.append((self.seqs.get(nodeid, 0), nodeid, outcome, longrepr))
+        if len(self._batch) >= self.batch_size:
+            self.writer.submit(self._batch)
+            self._batch = []
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if self._batch:
+            self.writer.submit(self._batch)
+            self._batch = []
+        self.writer.close()
+        if self.writer.error is not None:
+            warnings.warn(
+                pytest.PytestWarning(f"oracle evidence stopped after {self.writer.written} cases: {self.writer.error!r}")
+            )
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from typing import Any, BinaryIO, Iterator, Mapping
+
+from oracle.otel_runtime import EventRecord, SpanRecord
+
+
+SPAN_FILE_FORMATS = ("jsonl", "binary")
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def span_to_dict(span: SpanRecord) -> dict[str, Any]:
+    return {
+        "name": span.name,
+        "attributes": {key: _json_value(value) for key, value in span.attributes.items()},
+        "start_ns": span.start_ns,
+        "end_ns": span.end_ns,
+        "events": [
+            {
+                "name": event.name,
+                "time_ns": event.time_ns,
+                "attributes": {key: _json_value(value) for key, value in event.attributes.items()},
+            }
+            for event in span.events
+        ],
+    }
+
+
+def span_from_dict(data: Mapping[str, Any]) -> SpanRecord:
+    return SpanRecord(
+        name=str(data["name"]),
+        attributes=dict(data.get("attributes") or {}),
+        events=[
+            EventRecord(
+                name=str(event["name"]),
+                attributes=dict(event.get("attributes") or {}),
+                time_ns=int(event.get("time_ns") or 0),
+            )
+            for event in data.get("events") or ()
+        ],
+        start_ns=int(data.get("start_ns") or 0),
+        end_ns=int(data.get("end_ns") or 0),
+    )
+
+
+# Values JSON cannot represent (sets, arbitrary objects) are written as their
+# str(), the same fallback the binary encoding uses, so any span the runtime
+# accepted can be encoded.
+def encode_span_json(span: SpanRecord) -> bytes:
+    return json.dumps(span_to_dict(span), separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+def decode_span_json(line: bytes | str) -> SpanRecord:
+    return span_from_dict(json.loads(line))
+
+
+# Compact binary encoding: one length-prefixed frame per span. Values are
+# tagged; attribute keys are written once per frame and then referenced by
+# index, which keeps repeated `oracle.*` event keys cheap. Span start/end and
+# event timestamps are plain varints (perf_counter_ns values are non-negative).
+_FRAME_HEADER = struct.Struct(">I")
+_FLOAT = struct.Struct(">d")
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+_TAG_LIST = 6
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: memoryview, pos: int) -> tuple[int, int]:
+    shift = 0
+    result = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _write_str(out: bytearray, value: str) -> None:
+    raw = value.encode("utf-8")
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _read_str(data: memoryview, pos: int) -> tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    return bytes(data[pos : pos + length]).decode("utf-8"), pos + length
+
+
+def _write_value(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(_TAG_NONE)
+    elif value is True:
+        out.append(_TAG_TRUE)
+    elif value is False:
+        out.append(_TAG_FALSE)
+    elif isinstance(value, int):
+        out.append(_TAG_INT)
+        _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+    elif isinstance(value, float):
+        out.append(_TAG_FLOAT)
+        out += _FLOAT.pack(value)
+    elif isinstance(value, (list, tuple)):
+        out.append(_TAG_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _write_value(out, item)
+    else:
+        out.append(_TAG_STR)
+        _write_str(out, str(value))
+
+
+def _read_value(data: memoryview, pos: int) -> tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == _TAG_NONE:
+        return None, pos
+    if tag == _TAG_TRUE:
+        return True, pos
+    if tag == _TAG_FALSE:
+        return False, pos
+    if tag == _TAG_INT:
+        raw, pos = _read_varint(data, pos)
+        return (raw >> 1) ^ -(raw & 1), pos
+    if tag == _TAG_FLOAT:
+        return _FLOAT.unpack_from(data, pos)[0], pos + _FLOAT.size
+    if tag == _TAG_STR:
+        return _read_str(data, pos)
+    if tag == _TAG_LIST:
+        count, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _read_value(data, pos)
+            items.append(item)
+        return items, pos
+    raise ValueError(f"unknown value tag: {tag}")
+
+
+def _write_attributes(out: bytearray, attributes: Mapping[str, Any], keys: dict[str, int]) -> None:
+    _write_varint(out, len(attributes))
+    for key, value in attributes.items():
+        index = keys.get(key)
+        if index is None:
+            keys[key] = len(keys)
+            out.append(0)
+            _write_str(out, key)
+        else:
+            _write_varint(out, index + 1)
+        _write_value(out, value)
+
+
+def _read_attributes(data: memoryview, pos: int, keys: list[str]) -> tuple[dict[str, Any], int]:
+    count, pos = _read_varint(data, pos)
+    out: dict[str, Any] = {}
+    for _ in range(count):
+        ref, pos = _read_varint(data, pos)
+        if ref == 0:
+            key, pos = _read_str(data, pos)
+            keys.append(key)
+        else:
+            key = keys[ref - 1]
+        out[key], pos = _read_value(data, pos)
+    return out, pos
+
+
+def encode_span_binary(span: SpanRecord) -> bytes:
+    out = bytearray(_FRAME_HEADER.size)
+    keys: dict[str, int] = {}
+    _write_str(out, span.name)
+    _write_attributes(out, span.attributes, keys)
+    _write_varint(out, span.start_ns)
+    _write_varint(out, span.end_ns)
+    _write_varint(out, len(span.events))
+    for event in span.events:
+        _write_str(out, event.name)
+        _write_varint(out, event.time_ns)
+        _write_attributes(out, event.attributes, keys)
+    _FRAME_HEADER.pack_into(out, 0, len(out) - _FRAME_HEADER.size)
+    return bytes(out)
+
+
+def decode_span_binary(payload: bytes | memoryview) -> SpanRecord:
+    data = memoryview(payload)
+    keys: list[str] = []
+    name, pos = _read_str(data, 0)
+    attributes, pos = _read_attributes(data, pos, keys)
+    start_ns, pos = _read_varint(data, pos)
+    end_ns, pos = _read_varint(data, pos)
+    event_count, pos = _read_varint(data, pos)
+    events = []
+    for _ in range(event_count):
+        event_name, pos = _read_str(data, pos)
+        time_ns, pos = _read_varint(data, pos)
+        event_attrs, pos = _read_attributes(data, pos, keys)
+        events.append(EventRecord(event_name, event_attrs, time_ns))
+    return SpanRecord(name=name, attributes=attributes, events=events, start_ns=start_ns, end_ns=end_ns)
+
+
+def iter_binary_spans(stream: BinaryIO) -> Iterator[SpanRecord]:
+    while True:
+        header = stream.read(_FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < _FRAME_HEADER.size:
+            raise ValueError("truncated span frame header")
+        (length,) = _FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("truncated span frame")
+        yield decode_span_binary(payload)
+
+
+def read_span_file(path: str | os.PathLike[str], format: str = "jsonl") -> Iterator[SpanRecord]:
+    if format not in SPAN_FILE_FORMATS:
+        raise ValueError(f"unsupported span file format: {format}")
+    with open(path, "rb") as handle:
+        if format == "binary":
+            yield from iter_binary_spans(handle)
+            return
+        for line in handle:
+            if line.strip():
+                yield decode_span_json(line)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
+from oracle.otel_runtime import SpanRecord
+from oracle.span_codec import decode_span_json, encode_span_json
+
+
+# Rough per-object costs used to estimate resident size without walking the
+# object graph; good enough to decide when to spill.
+_SPAN_BASE_BYTES = 400
+_EVENT_BASE_BYTES = 200
+_ATTRIBUTE_BYTES = 120
+
+
+def estimate_span_bytes(span: SpanRecord) -> int:
+    total = _SPAN_BASE_BYTES + _ATTRIBUTE_BYTES * len(span.attributes)
+    for event in span.events:
+        total += _EVENT_BASE_BYTES + _ATTRIBUTE_BYTES * len(event.attributes)
+    return total
+
+
+class RingSpanStore:
+    def __init__(self, max_spans: int):
+        if max_spans <= 0:
+            raise ValueError("max_spans must be positive")
+        self.max_spans = max_spans
+        self.dropped = 0
+        self._spans: deque[SpanRecord] = deque(maxlen=max_spans)
+
+    def append(self, span: SpanRecord) -> None:
+        if len(self._spans) == self.max_spans:
+            self.dropped += 1
+        self._spans.append(span)
+
+    def __iter__(self) -> Iterator[SpanRecord]:
+        return iter(tuple(self._spans))
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+class SpillSpanStore:
+    def __init__(
+        self,
+        *,
+        memory_budget_bytes: int = 64 * 1024 * 1024,
+        segment_path: str | os.PathLike[str] | None = None,
+    ):
+        if memory_budget_bytes < 0:
+            raise ValueError("memory_budget_bytes must be non-negative")
+        self.memory_budget_bytes = memory_budget_bytes
+        self._owns_segment = segment_path is None
+        if segment_path is None:
+            fd, raw_path = tempfile.mkstemp(prefix="oracle-spans-", suffix=".jsonl")
+            os.close(fd)
+            segment_path = raw_path
+        self.segment_path = Path(segment_path)
+        self._segment = open(self.segment_path, "ab")
+        # A reused segment file keeps its earlier contents; only what this
+        # store appends after this offset is read back.
+        self._segment_start = self._segment.tell()
+        self._memory: deque[tuple[SpanRecord, int]] = deque()
+        self._memory_bytes = 0
+        self._spilled = 0
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def append(self, span: SpanRecord) -> None:
+        size = estimate_span_bytes(span)
+        self._memory.append((span, size))
+        self._memory_bytes += size
+        while self._memory and self._memory_bytes > self.memory_budget_bytes:
+            oldest, oldest_size = self._memory.popleft()
+            self._memory_bytes -= oldest_size
+            self._segment.write(encode_span_json(oldest))
+            self._spilled += 1
+
+    def _iter_segment(self) -> Iterator[SpanRecord]:
+        if not self._spilled:
+            return
+        self._segment.flush()
+        with open(self.segment_path, "rb") as handle:
+            handle.seek(self._segment_start)
+            for line in handle:
+                if line.strip():
+                    yield decode_span_json(line)
+
+    def __iter__(self) -> Iterator[SpanRecord]:
+        in_memory = [span for span, _ in self._memory]
+        yield from self._iter_segment()
+        yield from in_memory
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._memory)
+
+    def close(self) -> None:
+        if self._segment.closed:
+            return
+        self._segment.close()
+        if self._owns_segment:
+            self.segment_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> SpillSpanStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+BENCH_DIR = ROOT / "benchmarks"
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+import run_benchmarks
+
+
+def test_benchmark_suite_writes_comparable_json(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    assert run_benchmarks.main(["--scales", "1000", "--modes", "none", "--adapter-calls", "5", "--output", str(output)]) == 0
+
+    suite = json.loads(output.read_text(encoding="utf-8"))
+    kinds = {row["benchmark"] for row in suite["results"]}
+    assert kinds == {"runtime", "adapter", "materialize"}
+    runtime_row = next(row for row in suite["results"] if row["benchmark"] == "runtime")
+    assert runtime_row["events"] == 1000
+    assert runtime_row["emit_events_per_second"] > 0
+    assert runtime_row["bytes_per_event"] > 0
+
+    assert run_benchmarks.compare_results(suite, suite, tolerance=0.0) == []
+    slower = json.loads(json.dumps(suite))
+    for row in slower["results"]:
+        if row["benchmark"] == "materialize":
+            row["materialize_seconds"] *= 2
+            row["events_per_second"] /= 2
+    regressions = run_benchmarks.compare_results(suite, slower, tolerance=0.2)
+    assert any("materialize_seconds" in line for line in regressions)
+    assert any("events_per_second" in line for line in regressions)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime, materialize_dsa_steps
+from oracle.adapters import ingest_birdseye_db
+
+
+_EPOCH = datetime(2026, 1, 1, 12, 0, 0)
+
+
+# The subset of birdseye's schema the ingest path reads, with timestamps in
+# the form SQLAlchemy writes to SQLite.
+def _make_db(path: Path, calls: int, *, prefix: str = "") -> None:
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            f"CREATE TABLE {prefix}function (id INTEGER PRIMARY KEY, file TEXT, name TEXT, type TEXT,"
+            " html_body TEXT, lineno INTEGER, data TEXT, hash TEXT, body_hash TEXT)"
+        )
+        conn.execute(
+            f"CREATE TABLE {prefix}call (id VARCHAR(32) PRIMARY KEY, function_id INTEGER, arguments TEXT,"
+            " return_value TEXT, exception TEXT, traceback TEXT, data TEXT, start_time DATETIME)"
+        )
+        conn.execute(f"CREATE INDEX ix_{prefix}call_start_time ON {prefix}call (start_time)")
+        conn.executemany(
+            f"INSERT INTO {prefix}function (id, file, name, type, lineno) VALUES (?, ?, ?, 'function', ?)",
+            [(1, "/src/algos/heap.py", "push", 10), (2, "/src/algos/heap.py", "pop", 30), (3, "/src/algos/sort.py", "merge", 5)],
+        )
+        conn.executemany(
+            f"INSERT INTO {prefix}call (id, function_id, exception, start_time) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    f"call{n:05d}",
+                    n % 3 + 1,
+                    "IndexError" if n % 50 == 0 else None,
+                    # Pairs of calls share a timestamp to exercise the id tie-break.
+                    (_EPOCH + timedelta(milliseconds=n // 2)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                )
+                for n in range(calls)
+            ],
+        )
+
+
+def _frames(span) -> list[dict]:
+    return [dict(e.attributes) for e in span.events if e.name == "oracle.birdseye.frame"]
+
+
+def test_birdseye_db_streams_calls_in_pages(tmp_path: Path) -> None:
+    db = tmp_path / "birdseye.db"
+    _make_db(db, 1001)
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    span = ingest_birdseye_db(rt, db, run_id="run-birdseye-db", seq=1, page_size=64, run_label="db")
+
+    frames = _frames(span)
+    assert span.attributes["oracle.birdseye.count"] == len(frames) == 1001
+    assert [f["oracle.birdseye.call_id"] for f in frames] == [f"call{n:05d}" for n in range(1001)]
+    assert [f["oracle.adapter.seq"] for f in frames] == list(range(1, 1002))
+    first = frames[0]
+    assert (first["oracle.birdseye.module"], first["oracle.birdseye.function"]) == ("heap", "push")
+    assert (first["code.filepath"], first["code.lineno"]) == ("/src/algos/heap.py", 10)
+    assert first["oracle.birdseye.exception"] is True
+    assert span.attributes["oracle.birdseye.exceptions"] == 21
+
+    step = materialize_dsa_steps(rt.spans)["steps"][0]
+    assert step["adapter_source"] == "birdseye.db"
+    assert step["guards"][0]["status"] == "pass"
+
+
+def test_birdseye_db_filters_by_function_and_time_window(tmp_path: Path) -> None:
+    db = tmp_path / "birdseye.db"
+    _make_db(db, 300, prefix="be_")
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    span = ingest_birdseye_db(
+        rt,
+        db,
+        run_id="run-birdseye-db",
+        seq=2,
+        table_prefix="be_",
+        functions=["pop", "merge"],
+        since=_EPOCH + timedelta(milliseconds=10),
+        until=_EPOCH + timedelta(milliseconds=40),
+        page_size=7,
+    )
+    ids = [f["oracle.birdseye.call_id"] for f in _frames(span)]
+    assert ids == [f"call{n:05d}" for n in range(20, 80) if n % 3 != 0]
+
+    empty = ingest_birdseye_db(rt, db, run_id="run-birdseye-db", seq=3, table_prefix="be_", files=["/nope.py"])
+    assert empty.attributes["oracle.birdseye.count"] == 0
+    assert [e.attributes["oracle.guard.status"] for e in empty.events if e.name == "oracle.guard"] == ["skip"]
+
+    with pytest.raises(ValueError):
+        ingest_birdseye_db(rt, db, run_id="run-birdseye-db", seq=4, table_prefix='x"; DROP')
+
+
+def test_birdseye_db_skips_work_when_recording_is_off(tmp_path: Path) -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none", "ORACLE_RECORDING_LEVEL": "off"})
+    span = ingest_birdseye_db(rt, tmp_path / "missing.db", run_id="run-birdseye-db", seq=5)
+    assert span.events == () and rt.spans == []
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime, load_otel_config, materialize_dsa_steps
+from oracle.adapters import emit_hunter_events
+from oracle.collector import SpanCollector
+
+
+_WORKER_RUNTIME: OTelRuntime | None = None
+
+
+def _init_worker(env: dict[str, str]) -> None:
+    global _WORKER_RUNTIME
+    _WORKER_RUNTIME = OTelRuntime.from_env(env)
+
+
+def _emit_worker_step(seq: int) -> int:
+    assert _WORKER_RUNTIME is not None
+    emit_hunter_events(
+        _WORKER_RUNTIME,
+        run_id="run-pool",
+        seq=seq,
+        events=[{"kind": "call", "function": f"task_{seq}", "filepath": "algo.py", "lineno": seq}],
+        run_label="pool",
+    )
+    return seq
+
+
+def test_collector_exporter_requires_address() -> None:
+    with pytest.raises(ValueError):
+        load_otel_config({"OTEL_TRACES_EXPORTER": "collector"})
+    cfg = load_otel_config({"OTEL_TRACES_EXPORTER": "collector", "ORACLE_COLLECTOR_ADDRESS": "127.0.0.1:4999"})
+    assert cfg.collector_address == "127.0.0.1:4999"
+
+
+def test_collector_merges_process_pool_spans_in_seq_order() -> None:
+    with SpanCollector() as collector:
+        parent = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_sinks=[collector])
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(collector.worker_env(),),
+        ) as pool:
+            assert sorted(pool.map(_emit_worker_step, range(1, 9))) == list(range(1, 9))
+        emit_hunter_events(
+            parent,
+            run_id="run-pool",
+            seq=0,
+            events=[{"kind": "call", "function": "setup", "filepath": "algo.py", "lineno": 1}],
+            run_label="pool",
+        )
+
+    assert not collector.errors
+    materialized = materialize_dsa_steps(collector.spans)
+    assert [step["seq"] for step in materialized["steps"]] == list(range(0, 9))
+    assert all(step["guards"][0]["status"] == "pass" for step in materialized["steps"])
+
+
+def test_socket_sink_counts_unreachable_collector_and_reconnects() -> None:
+    from oracle import SpanRecord
+    from oracle.collector import SocketSpanSink
+
+    down = SpanCollector()
+    down.close()
+    sink = SocketSpanSink(down.address, timeout=1.0)
+    sink.export(SpanRecord(name="oracle.step", attributes={"oracle.seq": 1}))
+    assert (sink.sent, sink.dropped) == (0, 1)
+    assert sink.error is not None and sink._socket is None
+
+    with SpanCollector() as collector:
+        sink = SocketSpanSink(collector.address)
+        sink.export(SpanRecord(name="oracle.step", attributes={"oracle.run_id": "r", "oracle.seq": 1}))
+        sink._socket.close()  # the connection goes away under the sink
+        sink.export(SpanRecord(name="oracle.step", attributes={"oracle.run_id": "r", "oracle.seq": 2}))
+        sink.shutdown()
+        deadline = time.monotonic() + 5
+        while len(collector) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert (sink.sent, sink.dropped) == (2, 0)
+    assert [span.attributes["oracle.seq"] for span in collector.spans] == [1, 2]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import base64
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+from oracle.adapters import CoverageDBState, ingest_coverage_db
+
+coverage = pytest.importorskip("coverage")
+
+
+_MODULE = '''\
+def covered(n):
+    total = (
+        n
+        + 1
+    )
+    return total
+
+
+def partly(flag):
+    if flag:
+        return "yes"
+    return "no"
+
+
+def never():  # pragma: no cover
+    return None
+'''
+
+
+def _record(tmp_path: Path, *, branch: bool = False) -> tuple[Path, Path]:
+    module_path = tmp_path / "covmod.py"
+    module_path.write_text(_MODULE, encoding="utf-8")
+    data_file = tmp_path / ".coverage"
+    cov = coverage.Coverage(data_file=str(data_file), branch=branch, include=[str(module_path)])
+    sys.path.insert(0, str(tmp_path))
+    try:
+        cov.start()
+        cov.switch_context("test_covered")
+        import covmod
+
+        covmod.covered(1)
+        cov.switch_context("test_partly")
+        covmod.partly(True)
+        cov.stop()
+        cov.save()
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("covmod", None)
+    return data_file, module_path
+
+
+def _expected(data_file: Path, module_path: Path) -> tuple[int, int]:
+    cov = coverage.Coverage(data_file=str(data_file))
+    cov.load()
+    _, statements, _, missing, _ = cov.analysis2(str(module_path))
+    return len(statements) - len(missing), len(statements)
+
+
+def _file_events(span) -> list[dict]:
+    return [dict(e.attributes) for e in span.events if e.name == "oracle.coverage.file"]
+
+
+@pytest.mark.parametrize("branch", [False, True])
+def test_coverage_db_matches_coverage_analysis(tmp_path: Path, branch: bool) -> None:
+    data_file, module_path = _record(tmp_path, branch=branch)
+    covered, total = _expected(data_file, module_path)
+
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    span = ingest_coverage_db(rt, data_file, run_id="run-cov-db", seq=1, run_label="cov")
+    (event,) = _file_events(span)
+    assert event["code.filepath"] == str(module_path)
+    assert (event["oracle.coverage.covered_lines"], event["oracle.coverage.total_lines"]) == (covered, total)
+    assert event["oracle.coverage.source_parsed"] is True
+    numbits = base64.b64decode(event["oracle.coverage.lines_numbits"])
+    lines = [n for n in range(len(numbits) * 8) if numbits[n // 8] >> (n % 8) & 1]
+    assert len(lines) == covered and 12 not in lines
+    assert span.attributes["oracle.coverage.files"] == 1
+    assert span.attributes["oracle.coverage.contexts_read"] == 2
+
+    summary = [e.attributes for e in span.events if e.name == "oracle.coverage.summary"][0]
+    assert summary["oracle.coverage.total_lines"] == total
+
+
+def test_coverage_db_state_rereads_only_what_changed(tmp_path: Path) -> None:
+    data_file, module_path = _record(tmp_path)
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    state = CoverageDBState()
+
+    first = ingest_coverage_db(rt, data_file, run_id="run-cov-db", seq=1, state=state)
+    assert first.attributes["oracle.coverage.sources_parsed"] == 1
+
+    again = ingest_coverage_db(rt, data_file, run_id="run-cov-db", seq=2, state=state)
+    assert again.attributes["oracle.coverage.contexts_read"] == 0
+    assert again.attributes["oracle.coverage.sources_parsed"] == 0
+    assert _file_events(again) == [{**e, "oracle.adapter.seq": 1} for e in _file_events(first)]
+
+    one_context = ingest_coverage_db(rt, data_file, run_id="run-cov-db", seq=3, state=state, contexts=["test_partly"])
+    assert one_context.attributes["oracle.coverage.contexts_read"] == 1
+    assert one_context.attributes["oracle.coverage.covered_lines"] == first.attributes["oracle.coverage.covered_lines"]
+
+    stat = module_path.stat()
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    touched = ingest_coverage_db(rt, data_file, run_id="run-cov-db", seq=4, state=state)
+    assert touched.attributes["oracle.coverage.sources_parsed"] == 1
+
+
+def test_coverage_db_without_source_counts_executed_lines(tmp_path: Path) -> None:
+    data_file, module_path = _record(tmp_path)
+    module_path.unlink()
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    (event,) = _file_events(ingest_coverage_db(rt, data_file, run_id="run-cov-db", seq=1))
+    assert event["oracle.coverage.source_parsed"] is False
+    assert event["oracle.coverage.covered_lines"] == event["oracle.coverage.total_lines"] > 0
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import EventSamplingPolicy, OTelRuntime, materialize_dsa_steps
+from oracle.adapters import emit_hunter_events
+
+
+def _hunter_events(count: int) -> list[dict]:
+    return [{"kind": "call", "function": "dfs", "filepath": "algo.py", "lineno": idx} for idx in range(count)]
+
+
+def test_sampling_bounds_events_and_keeps_guard_evidence() -> None:
+    policy = EventSamplingPolicy(head=5, tail=5, reservoir=10)
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, event_sampling=policy)
+
+    step = emit_hunter_events(rt, run_id="run-sampled", seq=1, events=_hunter_events(10_000), run_label="sampled")
+
+    hunter_seqs = [e.attributes["oracle.adapter.seq"] for e in step.events if e.name == "oracle.hunter.event"]
+    assert len(hunter_seqs) == 20
+    assert hunter_seqs[:5] == [1, 2, 3, 4, 5]
+    assert hunter_seqs[-5:] == [9996, 9997, 9998, 9999, 10000]
+    assert hunter_seqs == sorted(hunter_seqs)
+    assert [e.name for e in step.events][-3:] == ["oracle.guard", "oracle.invariant", "oracle.explanation"]
+
+    assert step.attributes["oracle.sampling.events_seen"] == 10_003
+    assert step.attributes["oracle.sampling.events_kept"] == 23
+    assert step.attributes["oracle.sampling.events_dropped"] == 9_980
+    assert step.attributes["oracle.sampling.dropped_event_names"] == ["oracle.hunter.event"]
+    assert step.attributes["oracle.sampling.dropped_event_counts"] == [9_980]
+
+    materialized = materialize_dsa_steps(rt.spans)
+    assert materialized["steps"][0]["guards"][0]["status"] == "pass"
+
+
+def test_sampling_keeps_failing_events_and_is_deterministic() -> None:
+    policy = EventSamplingPolicy(head=1, tail=1, reservoir=2, seed=7)
+
+    def run() -> list[tuple[str, object]]:
+        rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, event_sampling=policy)
+        with rt.step_span(run_id="run-sampled", step_id="loop", seq=1, run_label="sampled") as span:
+            rt.emit_events("oracle.demo.event", ({"oracle.demo.n": n} for n in range(500)))
+            rt.emit_event("oracle.pytest.case", {"oracle.pytest.outcome": "fail"})
+            rt.emit_events("oracle.demo.event", ({"oracle.demo.n": n} for n in range(500, 1000)))
+        return [(e.name, dict(e.attributes)) for e in span.events]
+
+    first = run()
+    assert first == run()
+    assert ("oracle.pytest.case", {"oracle.pytest.outcome": "fail"}) in first
+    assert len(first) == 5
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import FileSpanSink, OTelRuntime, SpanRecord, load_otel_config, materialize_dsa_steps, read_span_file
+from oracle.adapters import emit_snoop_trace
+
+
+def test_file_exporter_config_from_env() -> None:
+    cfg = load_otel_config(
+        {
+            "OTEL_TRACES_EXPORTER": "file",
+            "ORACLE_TRACES_FILE": "out/spans.bin",
+            "ORACLE_TRACES_FILE_FORMAT": "binary",
+            "ORACLE_TRACES_FILE_QUEUE_SIZE": "64",
+            "ORACLE_TRACES_FILE_BACKPRESSURE": "drop",
+        }
+    )
+    assert cfg.traces_exporter == "file"
+    assert cfg.file_exporter is not None
+    assert cfg.file_exporter.path == "out/spans.bin"
+    assert cfg.file_exporter.format == "binary"
+    assert cfg.file_exporter.queue_size == 64
+    assert cfg.file_exporter.backpressure == "drop"
+
+    with pytest.raises(ValueError):
+        load_otel_config({"OTEL_TRACES_EXPORTER": "file", "ORACLE_TRACES_FILE_BACKPRESSURE": "retry"})
+
+
+@pytest.mark.parametrize("file_format", ["jsonl", "binary"])
+def test_file_exporter_round_trips_spans(tmp_path: Path, file_format: str) -> None:
+    path = tmp_path / f"spans.{file_format}"
+    rt = OTelRuntime.from_env(
+        {
+            "OTEL_TRACES_EXPORTER": "file",
+            "ORACLE_TRACES_FILE": str(path),
+            "ORACLE_TRACES_FILE_FORMAT": file_format,
+        }
+    )
+    rt.set_provenance_cell("nb-file", "cell-9")
+    emit_snoop_trace(
+        rt,
+        run_id="run-file",
+        seq=3,
+        records=[{"seq": 1, "message": "x=-1", "filepath": "algo.py", "lineno": 10}],
+        run_label="file",
+    )
+    rt.shutdown()
+
+    spans = list(read_span_file(path, file_format))
+    assert len(spans) == 1
+    assert spans[0].attributes == rt.spans[0].attributes
+    assert spans[0].events == rt.spans[0].events
+    assert (spans[0].start_ns, spans[0].end_ns) == (rt.spans[0].start_ns, rt.spans[0].end_ns)
+    assert [event.time_ns for event in spans[0].events] == [event.time_ns for event in rt.spans[0].events]
+    assert materialize_dsa_steps(spans) == materialize_dsa_steps(rt.spans)
+
+
+def test_count_backpressure_records_dropped_spans(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    sink = FileSpanSink(path, queue_size=1, backpressure="count")
+    entered = threading.Event()
+    release = threading.Event()
+    write = sink._write
+
+    def gated_write(span: SpanRecord) -> None:
+        entered.set()
+        release.wait(timeout=5)
+        write(span)
+
+    sink._write = gated_write
+    sink.export(SpanRecord(name="oracle.step", attributes={"oracle.seq": 1}))
+    assert entered.wait(timeout=5)
+    for seq in range(2, 6):
+        sink.export(SpanRecord(name="oracle.step", attributes={"oracle.seq": seq}))
+    release.set()
+    sink.shutdown()
+
+    spans = list(read_span_file(path))
+    assert sink.dropped == 3
+    assert [span.name for span in spans] == ["oracle.step", "oracle.sink.dropped", "oracle.step"]
+    assert spans[1].attributes["oracle.sink.dropped_spans"] == 3
+    assert spans[2].attributes["oracle.seq"] == 2
+
+
+def test_file_sink_survives_spans_that_fail_to_encode(tmp_path: Path) -> None:
+    class Unprintable:
+        def __str__(self) -> str:
+            raise ValueError("no text form")
+
+    path = tmp_path / "spans.jsonl"
+    sink = FileSpanSink(path, queue_size=2, backpressure="block")
+    sink.export(SpanRecord(name="oracle.step", attributes={"oracle.seq": 0, "oracle.bad": Unprintable()}))
+    for seq in range(1, 6):
+        sink.export(SpanRecord(name="oracle.step", attributes={"oracle.seq": seq}))
+    sink.shutdown()
+
+    assert sink.failed == 1
+    assert sink.error is not None and "no text form" in sink.error
+    assert [span.attributes["oracle.seq"] for span in read_span_file(path)] == [1, 2, 3, 4, 5]
+
+
+def test_block_backpressure_does_not_hang_on_a_dead_writer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(FileSpanSink, "_run", lambda self: None)
+    sink = FileSpanSink(tmp_path / "spans.jsonl", queue_size=1, backpressure="block")
+    sink._thread.join()
+
+    for seq in range(3):
+        sink.export(SpanRecord(name="oracle.step", attributes={"oracle.seq": seq}))
+    sink.flush()
+    sink.shutdown()
+
+    assert sink.dropped == 2
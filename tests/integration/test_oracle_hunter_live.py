@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+pytest.importorskip("hunter")
+
+from oracle import OTelRuntime, materialize_dsa_steps
+from oracle.adapters import trace_hunter
+
+
+def _fib(n: int) -> int:
+    return n if n < 2 else _fib(n - 1) + _fib(n - 2)
+
+
+def _event_names(span) -> list[str]:
+    return [event.name for event in span.events]
+
+
+def test_live_hunter_trace_feeds_step_span_in_batches() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    with trace_hunter(rt, run_id="run-live", seq=1, modules=(__name__,), buffer_size=8, flush_every=4, run_label="live") as live:
+        _fib(5)
+
+    span = live.span
+    calls = [e.attributes for e in span.events if e.name == "oracle.hunter.event"]
+    # fib(5) makes 15 calls, each with a call and a return event.
+    assert span.attributes["oracle.hunter.count"] == 30
+    assert len(calls) == 30
+    assert {attrs["oracle.hunter.kind"] for attrs in calls} == {"call", "return"}
+    assert {attrs["oracle.hunter.function"] for attrs in calls} == {"_fib"}
+    assert [attrs["oracle.adapter.seq"] for attrs in calls] == list(range(1, 31))
+    assert "oracle.hunter.dropped" not in span.attributes
+    assert _event_names(span)[-3:] == ["oracle.guard", "oracle.invariant", "oracle.explanation"]
+
+    step = materialize_dsa_steps(rt.spans)["steps"][0]
+    assert step["adapter_source"] == "hunter.live"
+    assert step["guards"][0]["status"] == "pass"
+
+
+def test_live_hunter_trace_filters_and_flight_recorder_ring() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    with trace_hunter(
+        rt,
+        run_id="run-live",
+        seq=2,
+        modules=(__name__,),
+        kinds=("call",),
+        max_depth=2,
+        buffer_size=5,
+        flush_every=None,
+    ) as live:
+        _fib(6)
+
+    span = live.span
+    calls = [e.attributes for e in span.events if e.name == "oracle.hunter.event"]
+    seen = span.attributes["oracle.hunter.count"]
+    assert 5 < seen < 25  # depth-limited: far fewer than the 25 calls of fib(6)
+    assert len(calls) == 5
+    assert [attrs["oracle.adapter.seq"] for attrs in calls] == list(range(seen - 4, seen + 1))
+    assert span.attributes["oracle.hunter.dropped"] == seen - 5
+    assert {attrs["oracle.hunter.kind"] for attrs in calls} == {"call"}
+
+
+def test_live_hunter_trace_is_inert_when_recording_is_off() -> None:
+    import hunter
+
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none", "ORACLE_RECORDING_LEVEL": "off"})
+    with trace_hunter(rt, run_id="run-live", seq=3, modules=(__name__,)) as live:
+        assert sys.gettrace() is None or not isinstance(sys.gettrace(), hunter.Tracer)
+        _fib(3)
+    assert live.tally.count == 0
+    assert len(rt.spans) == 0
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+
+# Cumulative `-X importtime` budget for `import oracle, oracle.adapters`. The
+# lazy package imports finish in a few milliseconds; the budget leaves room for
+# slow CI machines while still catching an eager runtime or SDK import.
+_COLD_START_BUDGET_US = 50_000
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": str(ORACLE_SRC)}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _cumulative_import_us(stderr: str, module: str) -> int:
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} missing from importtime output")
+
+
+def test_package_import_is_lazy_and_within_budget() -> None:
+    result = _run_python(
+        "import json, sys\n"
+        "import oracle, oracle.adapters\n"
+        "print(json.dumps(sorted(name for name in sys.modules if name.startswith(('oracle', 'opentelemetry')))))\n"
+    )
+    assert json.loads(result.stdout) == ["oracle", "oracle.adapters"]
+
+    elapsed_us = _cumulative_import_us(result.stderr, "oracle") + _cumulative_import_us(result.stderr, "oracle.adapters")
+    assert elapsed_us <= _COLD_START_BUDGET_US, f"cold import took {elapsed_us}us (budget {_COLD_START_BUDGET_US}us)"
+
+
+def test_lazy_exports_resolve_and_are_listed() -> None:
+    result = _run_python(
+        "import json, oracle, oracle.adapters\n"
+        "print(json.dumps([oracle.OTelRuntime.__module__, oracle.adapters.emit_snoop_trace.__module__,\n"
+        "                  'materialize_dsa_steps' in dir(oracle), hasattr(oracle, 'missing')]))\n"
+    )
+    assert json.loads(result.stdout) == ["oracle.otel_runtime", "oracle.adapters.snoop_birdseye", True, False]
+
+
+def test_otel_sdk_import_waits_for_first_span() -> None:
+    pytest.importorskip("opentelemetry.sdk")
+    result = _run_python(
+        "import json, os, sys\n"
+        "sys.stdout = open(os.devnull, 'w')\n"
+        "import oracle\n"
+        "rt = oracle.OTelRuntime.from_env({'OTEL_TRACES_EXPORTER': 'console'})\n"
+        "before = 'opentelemetry.sdk.trace' in sys.modules\n"
+        "with rt.step_span(run_id='run-lazy', step_id='s', seq=1, run_label='lazy'):\n"
+        "    pass\n"
+        "after = 'opentelemetry.sdk.trace' in sys.modules\n"
+        "sys.__stdout__.write(json.dumps([before, after, rt.otel_enabled]))\n"
+    )
+    assert json.loads(result.stdout) == [False, True, True]
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import json
 import sys
+import time
 from pathlib import Path
 
+import pytest
+
 
 ROOT = Path(__file__).resolve().parents[2]
 ORACLE_SRC = ROOT / "src"
@@ -13,6 +16,8 @@ if str(ORACLE_SRC) not in sys.path:
 
 from oracle import OTelRuntime, materialize_dsa_steps
 from oracle.adapters import (
+    HypothesisCaseAggregator,
+    HypothesisExampleTable,
     emit_birdseye_trace,
     emit_coverage_summary,
     emit_hunter_events,
@@ -168,3 +173,164 @@ def test_coverage_pytest_cov_adapter_path_emits_correlated_events() -> None:
     materialized = materialize_dsa_steps(rt.spans)
     assert materialized["steps"][0]["seq"] == 40
     assert materialized["steps"][0]["invariants"][0]["status"] == "pass"
+
+
+def test_adapters_skip_work_when_recording_is_off() -> None:
+    from oracle.otel_runtime import NULL_SPAN
+
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none", "ORACLE_RECORDING_LEVEL": "off"})
+    span = emit_snoop_trace(
+        rt,
+        run_id="run-off",
+        seq=1,
+        records=[{"seq": 1, "message": "x=1", "filepath": "algo.py", "lineno": 3}],
+        run_label="off",
+    )
+    assert span is NULL_SPAN
+    assert emit_pytest_hypothesis_case(rt, run_id="run-off", seq=2, nodeid="t::x", outcome="pass", run_label="off") is NULL_SPAN
+    assert len(rt.spans) == 0
+
+    guards = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none", "ORACLE_RECORDING_LEVEL": "guards"})
+    emit_coverage_summary(guards, run_id="run-guards", seq=1, covered_lines=5, total_lines=10, run_label="guards")
+    assert [event.name for event in guards.spans[0].events] == ["oracle.guard", "oracle.invariant"]
+
+
+def test_trace_adapters_stream_generators_in_one_pass() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    consumed: list[int] = []
+
+    def hunter_events(n: int):
+        for idx in range(n):
+            consumed.append(idx)
+            yield {"kind": "call", "function": "" if idx == 3 else f"f{idx}", "filepath": "algo.py", "lineno": idx}
+
+    hunter_step = emit_hunter_events(rt, run_id="run-stream", seq=1, events=hunter_events(5), run_label="stream")
+    assert consumed == [0, 1, 2, 3, 4]
+    assert hunter_step.attributes["oracle.hunter.count"] == 5
+    assert len([e for e in hunter_step.events if e.name == "oracle.hunter.event"]) == 5
+    assert _event_attrs(hunter_step, "oracle.invariant")["oracle.invariant.status"] == "fail"
+
+    snoop_step = emit_snoop_trace(
+        rt,
+        run_id="run-stream",
+        seq=2,
+        records=({"seq": seq, "message": "m"} for seq in (1, 2, 2, 1)),
+        run_label="stream",
+    )
+    assert snoop_step.attributes["oracle.snoop.count"] == 4
+    assert _event_attrs(snoop_step, "oracle.invariant")["oracle.invariant.status"] == "fail"
+
+    viz_step = emit_viztracer_trace(
+        rt,
+        run_id="run-stream",
+        seq=3,
+        records=iter([{"name": "f", "duration_us": 5}, {"name": "g", "duration_us": -1}]),
+        run_label="stream",
+    )
+    assert viz_step.attributes["oracle.viztracer.count"] == 2
+    assert _event_attrs(viz_step, "oracle.invariant")["oracle.invariant.status"] == "fail"
+
+    empty_step = emit_birdseye_trace(rt, run_id="run-stream", seq=4, frames=iter(()), run_label="stream")
+    assert empty_step.attributes["oracle.birdseye.count"] == 0
+    assert _event_attrs(empty_step, "oracle.guard")["oracle.guard.status"] == "skip"
+
+    guards = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none", "ORACLE_RECORDING_LEVEL": "guards"})
+    guard_step = emit_hunter_events(guards, run_id="run-stream", seq=5, events=hunter_events(2), run_label="stream")
+    assert guard_step.attributes["oracle.hunter.count"] == 2
+    assert [e.name for e in guard_step.events] == ["oracle.guard", "oracle.invariant"]
+
+
+def test_hypothesis_examples_are_stored_once_and_referenced_by_hash() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    table = HypothesisExampleTable(max_bytes=200, max_string=8, max_items=3)
+    examples = [{"xs": [3, 1, 2]}, {"xs": [3, 1, 2]}, {"xs": [1, 2]}, {"xs": [3, 1, 2]}]
+    steps = [
+        emit_pytest_hypothesis_case(
+            rt,
+            run_id="run-examples",
+            seq=seq,
+            nodeid="tests/test_sort.py::test_sorted",
+            outcome="fail",
+            hypothesis_example=example,
+            run_label="shrink",
+            example_table=table,
+        )
+        for seq, example in enumerate(examples, start=1)
+    ]
+
+    hashes = [_event_attrs(step, "oracle.pytest.case")["oracle.hypothesis.example_hash"] for step in steps]
+    assert hashes[0] == hashes[1] == hashes[3] != hashes[2]
+    assert all("oracle.hypothesis.example" not in _event_attrs(step, "oracle.pytest.case") for step in steps)
+    defined = [step for step in steps if any(e.name == "oracle.hypothesis.example" for e in step.events)]
+    assert defined == [steps[0], steps[2]]
+    assert _event_attrs(steps[0], "oracle.hypothesis.example")["oracle.hypothesis.example"] == '{"xs":[3,1,2]}'
+    assert len(table) == 2 and table.get(hashes[2]) == '{"xs":[1,2]}'
+    assert table.memo_hits == 2
+
+    digest, example_json, _ = table.add({"name": "a" * 20, "xs": list(range(5)), "big": {"k": "v"}, "z": 0})
+    assert json.loads(example_json) == {
+        "big": {"k": "v"},
+        "name": "aaaaaaaa...[+12 chars]",
+        "xs": [0, 1, 2, "...[+2 items]"],
+        "...": "+1 keys",
+    }
+    assert digest in table.truncated
+
+    tiny = HypothesisExampleTable(max_bytes=10)
+    _, cut, _ = tiny.add({"xs": list(range(20))})
+    assert json.loads(cut) == {"...": "+48 chars", "prefix": '{"xs":[0,1'}
+
+
+def test_hypothesis_aggregator_emits_one_summary_step_per_nodeid() -> None:
+    hypothesis = pytest.importorskip("hypothesis")
+    strategies = pytest.importorskip("hypothesis.strategies")
+
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    aggregator = HypothesisCaseAggregator(
+        rt, run_id="run-aggregate", seq_start=40, size_buckets=(8, 32), example_table=HypothesisExampleTable()
+    )
+    nodeid = "tests/test_sum.py::test_small_sum"
+
+    @hypothesis.settings(max_examples=200, database=None, derandomize=True)
+    @hypothesis.given(strategies.lists(strategies.integers(min_value=0, max_value=1000)))
+    def small_sum(xs: list[int]) -> None:
+        started = time.perf_counter_ns()
+        ok = sum(xs) < 100
+        aggregator.record(
+            nodeid,
+            "pass" if ok else "fail",
+            hypothesis_example={"xs": xs},
+            duration_ns=time.perf_counter_ns() - started,
+            failure_message=None if ok else f"sum {sum(xs)} >= 100",
+        )
+        assert ok
+
+    with pytest.raises(AssertionError):
+        small_sum()
+    aggregator.record("tests/test_sum.py::test_other", "skip")
+
+    with aggregator:
+        pass
+    assert aggregator.flush() == []
+    summary_step, other_step = rt.spans
+    assert summary_step.attributes["oracle.seq"] == 40 and other_step.attributes["oracle.seq"] == 41
+    examples = summary_step.attributes["oracle.hypothesis.examples"]
+    assert examples > 1 and summary_step.attributes["oracle.hypothesis.failed"] >= 1
+
+    summary = _event_attrs(summary_step, "oracle.hypothesis.summary")
+    assert summary["oracle.hypothesis.size_buckets"] == (8, 32)
+    assert sum(summary["oracle.hypothesis.size_histogram"]) == examples
+    assert len(summary["oracle.hypothesis.size_histogram"]) == 3
+    assert summary["oracle.hypothesis.duration_p50_ns"] <= summary["oracle.hypothesis.duration_max_ns"]
+
+    minimal = _event_attrs(summary_step, "oracle.pytest.case")
+    assert minimal["oracle.pytest.outcome"] == "fail"
+    assert minimal["oracle.pytest.failure_message"] == "sum 100 >= 100"
+    example = _event_attrs(summary_step, "oracle.hypothesis.example")
+    assert example["oracle.hypothesis.example_hash"] == minimal["oracle.hypothesis.example_hash"]
+    assert example["oracle.hypothesis.example"] == '{"xs":[100]}'
+    assert _event_attrs(summary_step, "oracle.guard")["oracle.guard.status"] == "fail"
+
+    other = _event_attrs(other_step, "oracle.hypothesis.summary")
+    assert other["oracle.hypothesis.skipped"] == 1 and "oracle.hypothesis.duration_p50_ns" not in other
+    assert _event_attrs(other_step, "oracle.guard")["oracle.guard.status"] == "skip"
@@ -104,3 +104,333 @@ def test_runtime_module_has_no_legacy_runtime_imports() -> None:
     source = inspect.getsource(runtime_mod)
     assert "oracle_api" not in source
     assert "oracle_tools" not in source
+
+
+def test_event_records_share_interned_key_shapes() -> None:
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    with rt.step_span(run_id="run-001", step_id="step-1", seq=1, run_label="baseline") as span:
+        rt.emit_guard("n > 0", "pass")
+        rt.emit_guard("n < 10", "fail")
+
+    first, second = span.events
+    assert not hasattr(first, "__dict__")
+    assert first._shape is second._shape
+    assert dict(second.attributes) == {"oracle.guard.condition": "n < 10", "oracle.guard.status": "fail"}
+    assert second.attributes.get("oracle.guard.status") == "fail"
+    assert "oracle.guard.condition" in first.attributes
+    assert first == runtime_mod.EventRecord("oracle.guard", dict(first.attributes))
+
+
+def test_emit_events_bulk_paths_merge_provenance_once_per_batch() -> None:
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    rt.set_provenance_cell("nb-bulk", "cell-2")
+
+    with rt.step_span(run_id="run-001", step_id="step-1", seq=1, run_label="baseline") as span:
+        emitted = rt.emit_events("oracle.demo.event", ({"oracle.demo.n": n} for n in range(3)))
+        emitted += rt.emit_events(
+            "oracle.demo.row",
+            ((n, "cell-override") for n in range(2)),
+            keys=("oracle.demo.n", "oracle.cell_id"),
+        )
+        with pytest.raises(ValueError):
+            rt.emit_events("oracle.demo.row", [(1,)], keys=("oracle.demo.n", "oracle.demo.m"))
+
+    assert emitted == 5
+    assert [event.name for event in span.events] == ["oracle.demo.event"] * 3 + ["oracle.demo.row"] * 2
+    assert [event.attributes["oracle.demo.n"] for event in span.events] == [0, 1, 2, 0, 1]
+    assert span.events[0].attributes["oracle.cell_id"] == "cell-2"
+    assert span.events[-1].attributes["oracle.cell_id"] == "cell-override"
+    assert span.events[-1].attributes["oracle.notebook_id"] == "nb-bulk"
+
+
+def test_emits_interleaved_with_a_bulk_batch_keep_their_own_names() -> None:
+    import threading
+
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+
+    def rows():
+        for n in range(4):
+            if n == 2:
+                rt.emit_guard("n == 2", "pass")
+            yield (n,)
+
+    with rt.step_span(run_id="run-interleave", step_id="s", seq=1) as span:
+        rt.emit_events("oracle.trace.event", rows(), keys=("n",))
+    events = list(span.events)
+    assert [event.name for event in events] == ["oracle.trace.event"] * 2 + ["oracle.guard"] + ["oracle.trace.event"] * 2
+    assert [event.attributes["n"] for event in events if event.name == "oracle.trace.event"] == [0, 1, 2, 3]
+
+    with rt.step_span(run_id="run-interleave", step_id="s", seq=2) as span:
+
+        def worker(name: str) -> None:
+            rt.emit_events(name, ((n, name) for n in range(5000)), keys=("n", "who"), span=span)
+
+        threads = [threading.Thread(target=worker, args=(f"oracle.worker.{idx}",)) for idx in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    events = list(span.events)
+    assert len(events) == 4 * 5000
+    assert all(event.attributes["who"] == event.name for event in events)
+
+
+def test_scoped_provenance_restores_previous_frame() -> None:
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    rt.set_provenance_cell("nb-outer", "cell-1")
+
+    with rt.provenance(filepath="algo.py", lineno=7, cell_id="cell-2") as merged:
+        assert merged["oracle.notebook_id"] == "nb-outer"
+        with rt.step_span(run_id="run-001", step_id="inner", seq=1, run_label="baseline") as inner:
+            rt.emit_explanation("inside scope")
+    with rt.step_span(run_id="run-001", step_id="outer", seq=2, run_label="baseline") as outer:
+        rt.emit_explanation("after scope")
+
+    assert inner.attributes["oracle.cell_id"] == "cell-2"
+    assert inner.attributes["code.lineno"] == 7
+    assert inner.events[0].attributes["code.filepath"] == "algo.py"
+    assert outer.attributes["oracle.cell_id"] == "cell-1"
+    assert "code.filepath" not in outer.attributes
+    assert "code.filepath" not in outer.events[0].attributes
+
+
+def test_high_frequency_provenance_updates_keep_frame_chain_bounded() -> None:
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    for lineno in range(1000):
+        rt.set_provenance_file("algo.py", lineno)
+        rt.set_provenance_cell("nb", f"cell-{lineno}")
+
+    frame = rt._provenance.get()
+    assert frame.depth <= 8
+    assert dict(frame.merged) == {
+        "code.filepath": "algo.py",
+        "code.lineno": 999,
+        "oracle.notebook_id": "nb",
+        "oracle.cell_id": "cell-999",
+    }
+
+
+def _bind_in_memory_tracer(rt):
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    rt._tracer = provider.get_tracer("test")
+    return provider, exporter
+
+
+def test_otel_events_land_on_bound_span_from_other_threads_and_nested_user_spans() -> None:
+    pytest.importorskip("opentelemetry.sdk")
+    import threading
+
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "console"})
+    assert rt.otel_enabled
+    provider, exporter = _bind_in_memory_tracer(rt)
+    user_tracer = provider.get_tracer("user")
+
+    with rt.run_span(run_id="run-otel", run_label="otel"):
+        with rt.step_span(run_id="run-otel", step_id="step-1", seq=1, run_label="otel") as step:
+            with user_tracer.start_as_current_span("user.helper"):
+                rt.emit_guard("n > 0", "pass")
+            worker = threading.Thread(target=lambda: rt.emit_explanation("from worker", span=step))
+            worker.start()
+            worker.join()
+
+    finished = {span.name: span for span in exporter.get_finished_spans()}
+    otel_step = finished["oracle.step"]
+    assert otel_step.attributes["oracle.step_id"] == "step-1"
+    assert [event.name for event in otel_step.events] == ["oracle.guard", "oracle.explanation"]
+    assert finished["user.helper"].events == ()
+    assert finished["user.helper"].parent.span_id == otel_step.context.span_id
+    assert otel_step.parent.span_id == finished["oracle.run"].context.span_id
+    assert [event.name for event in step.events] == ["oracle.guard", "oracle.explanation"]
+
+
+def test_spans_from_many_threads_merge_in_close_order() -> None:
+    import threading
+
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    barrier = threading.Barrier(8)
+
+    def worker(thread_idx: int) -> None:
+        barrier.wait()
+        for n in range(300):
+            with rt.step_span(run_id=f"run-{thread_idx}", step_id="s", seq=n, run_label="threads"):
+                rt.emit_guard("n >= 0", "pass")
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    spans = list(rt.spans)
+    assert len(spans) == 8 * 300
+    for thread_idx in range(8):
+        seqs = [span.attributes["oracle.seq"] for span in spans if span.attributes["oracle.run_id"] == f"run-{thread_idx}"]
+        assert seqs == list(range(300))
+
+    def close_step(step_id: str) -> None:
+        with rt.step_span(run_id="run-main", step_id=step_id, seq=0, run_label="threads"):
+            pass
+
+    close_step("a")
+    other = threading.Thread(target=close_step, args=("b",))
+    other.start()
+    other.join()
+    close_step("c")
+    assert [span.attributes["oracle.step_id"] for span in rt.spans][-3:] == ["a", "b", "c"]
+
+
+def test_span_shards_of_exited_threads_are_released() -> None:
+    import threading
+
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+
+    def close_step(seq: int) -> None:
+        with rt.step_span(run_id="run-churn", step_id="s", seq=seq):
+            pass
+
+    for seq in range(50):
+        thread = threading.Thread(target=close_step, args=(seq,))
+        thread.start()
+        thread.join()
+    close_step(50)
+
+    assert [span.attributes["oracle.seq"] for span in rt.spans] == list(range(51))
+    assert len(rt._shards._shards) == 1
+
+
+def test_failing_sink_is_counted_and_does_not_corrupt_the_span_stack() -> None:
+    runtime_mod = _load_runtime_module()
+
+    class BrokenSink:
+        def export(self, span):
+            raise ConnectionRefusedError("collector down")
+
+        def shutdown(self) -> None:
+            pass
+
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_sinks=[BrokenSink()])
+    with rt.step_span(run_id="run-sink", step_id="a", seq=1):
+        pass
+    assert rt._active_spans.get() == ()
+    with rt.step_span(run_id="run-sink", step_id="b", seq=2):
+        assert [span.attributes["oracle.step_id"] for span in rt._active_spans.get()] == ["b"]
+
+    assert rt.sink_errors == 2
+    assert "ConnectionRefusedError" in rt.sink_error
+    assert [span.attributes["oracle.step_id"] for span in rt.spans] == ["a", "b"]
+
+
+def test_spans_and_events_carry_monotonic_timing() -> None:
+    runtime_mod = _load_runtime_module()
+    rt = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+
+    with rt.step_span(run_id="run-timing", step_id="s", seq=1, run_label="timing"):
+        rt.emit_guard("x > 0", "pass")
+        rt.emit_events("oracle.trace.event", [(n,) for n in range(3)], keys=("n",))
+
+    span = rt.spans[0]
+    times = [event.time_ns for event in span.events]
+    assert span.start_ns > 0
+    assert span.start_ns <= times[0]
+    assert times == sorted(times)
+    assert times[-1] <= span.end_ns
+    assert span.duration_ns == span.end_ns - span.start_ns
+    assert runtime_mod.SpanRecord(name="untimed", attributes={}).duration_ns is None
+
+
+def test_recording_levels_gate_spans_and_events() -> None:
+    runtime_mod = _load_runtime_module()
+    assert runtime_mod.load_otel_config({"ORACLE_RECORDING_LEVEL": "guards"}).recording_level == "guards"
+    with pytest.raises(ValueError):
+        runtime_mod.load_otel_config({"ORACLE_RECORDING_LEVEL": "verbose"})
+
+    off = runtime_mod.OTelRuntime.from_env({"ORACLE_RECORDING_LEVEL": "off"})
+    first = off.step_span(run_id="run-off", step_id="s", seq=1, run_label="off")
+    assert first is off.run_span(run_id="run-off", seq=0) is runtime_mod.NULL_SPAN
+    with first as span:
+        off.emit_guard("x > 0", "pass")
+        off.emit_explanation("never recorded")
+        assert off.emit_events("oracle.demo", [(1,)], keys=("n",)) == 0
+    assert len(span.events) == 0
+    with pytest.raises(TypeError):
+        span.attributes["oracle.run_id"] = "mutated"
+    assert len(off.spans) == 0
+    assert isinstance(span, runtime_mod.SpanHandle)
+
+    full = runtime_mod.OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    with full.step_span(run_id="run-full", step_id="s", seq=1):
+        with pytest.raises(RuntimeError):
+            full.emit_guard("x > 0", "pass", span=span)
+
+    guards = runtime_mod.OTelRuntime.from_env({"ORACLE_RECORDING_LEVEL": "guards"})
+    with guards.step_span(run_id="run-guards", step_id="s", seq=1, run_label="guards"):
+        guards.emit_guard("x > 0", "pass")
+        guards.emit_invariant("inv", "x stays positive", "pass")
+        guards.emit_explanation("dropped")
+        guards.emit_event("oracle.demo", {"n": 1})
+        assert guards.emit_events("oracle.demo", [(1,)], keys=("n",)) == 0
+    assert [event.name for event in guards.spans[0].events] == ["oracle.guard", "oracle.invariant"]
+
+
+def test_batch_processor_settings_and_inmemory_dropped_spans() -> None:
+    import threading
+
+    pytest.importorskip("opentelemetry.sdk")
+    runtime_mod = _load_runtime_module()
+    config = runtime_mod.load_otel_config(
+        {
+            "OTEL_TRACES_EXPORTER": "inmemory",
+            "OTEL_BSP_MAX_QUEUE_SIZE": "2",
+            "OTEL_BSP_SCHEDULE_DELAY": "60000",
+            "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": "1",
+            "OTEL_BSP_EXPORT_TIMEOUT": "1000",
+        }
+    )
+    assert config.batch_processor == runtime_mod.BatchProcessorConfig(2, 60000, 1, 1000)
+    with pytest.raises(ValueError):
+        runtime_mod.load_otel_config({"OTEL_TRACES_EXPORTER": "otlp", "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": "4096"})
+    with pytest.raises(ValueError):
+        runtime_mod.load_otel_config({"OTEL_TRACES_EXPORTER": "console", "OTEL_BSP_SCHEDULE_DELAY": "soon"})
+
+    rt = runtime_mod.OTelRuntime(config)
+    exporter = rt.otel_exporter
+    entered = threading.Event()
+    release = threading.Event()
+    export = exporter.export
+
+    def blocking_export(spans):
+        entered.set()
+        release.wait(10)
+        return export(spans)
+
+    exporter.export = blocking_export
+
+    def step(seq: int) -> None:
+        with rt.step_span(run_id="run-bsp", step_id="s", seq=seq, run_label="bsp"):
+            pass
+
+    step(0)
+    assert entered.wait(10)
+    for seq in range(1, 8):
+        step(seq)
+    release.set()
+    rt.shutdown()
+
+    stats = rt.otel_export_stats()
+    assert stats == {"submitted": 8, "exported": 3, "failed": 0, "dropped": 5}
+    assert rt.otel_dropped_spans == 5
+    assert len(exporter.get_finished_spans()) == 3
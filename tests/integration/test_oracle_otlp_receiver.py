@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+from oracle.otlp_receiver import OTLPReceiver
+
+
+def _json_export_request(spans: int, events_per_span: int) -> bytes:
+    return json.dumps(
+        {
+            "resourceSpans": [
+                {
+                    "scopeSpans": [
+                        {
+                            "spans": [
+                                {"name": "oracle.step", "events": [{"name": "e"}] * events_per_span}
+                                for _ in range(spans)
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+    ).encode("utf-8")
+
+
+def _post(url: str, body: bytes) -> int:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status
+
+
+def test_otlp_exporter_delivers_spans_to_local_receiver() -> None:
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.http")
+    with OTLPReceiver() as receiver:
+        rt = OTelRuntime.from_env({**receiver.worker_env(), "OTEL_BSP_SCHEDULE_DELAY": "50"})
+        for seq in range(20):
+            with rt.step_span(run_id="run-otlp", step_id="s", seq=seq, run_label="otlp"):
+                rt.emit_guard("n >= 0", "pass")
+                rt.emit_explanation("step done")
+        rt.shutdown()
+
+        assert receiver.wait_for_spans(20)
+        stats = receiver.stats()
+        assert stats["spans"] == 20
+        assert stats["events"] == 40
+        assert stats["rejected"] == 0
+        assert stats["handle_latency"]["count"] == stats["requests"]
+        assert stats["export_lag"]["count"] == 20
+        assert rt.otel_export_stats() == {"submitted": 20, "exported": 20, "failed": 0, "dropped": 0}
+
+
+def test_receiver_injects_errors_and_delay() -> None:
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.http")
+    with OTLPReceiver(error_rate=1.0, error_status=400, delay_seconds=0.01) as receiver:
+        rt = OTelRuntime.from_env(receiver.worker_env())
+        with rt.step_span(run_id="run-otlp-err", step_id="s", seq=1, run_label="otlp"):
+            pass
+        rt.shutdown()
+
+        assert receiver.stats()["errors_injected"] >= 1
+        assert receiver.stats()["spans"] == 0
+        assert rt.otel_export_stats()["failed"] == 1
+
+
+def test_receiver_runs_as_subprocess_and_reports_stats() -> None:
+    env = {**os.environ, "PYTHONPATH": str(ORACLE_SRC)}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "oracle.otlp_receiver"],
+        stdout=subprocess.PIPE,
+        text=True,
+        env=env,
+    )
+    try:
+        endpoint = proc.stdout.readline().strip()
+        assert _post(endpoint + "/v1/traces", _json_export_request(spans=3, events_per_span=2)) == 200
+        with urllib.request.urlopen(endpoint + "/stats", timeout=10) as response:
+            live = json.loads(response.read())
+        assert (live["spans"], live["events"]) == (3, 6)
+    finally:
+        proc.terminate()
+        out, _ = proc.communicate(timeout=10)
+    final = json.loads(out.strip().splitlines()[-1])
+    assert final["spans"] == 3
+    assert final["requests"] == 1
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import sys
+from importlib.metadata import entry_points
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import read_span_file
+from oracle.pytest_plugin import _is_xdist_controller, _worker_path
+
+pytest_plugins = ["pytester"]
+
+# An installed package already loads the plugin through its `oracle` pytest11
+# entry point, and naming the module again with -p would register it twice;
+# from a source checkout it has to be named explicitly.
+if any(entry_point.name == "oracle" for entry_point in entry_points(group="pytest11")):
+    _PLUGIN_ARGS: tuple[str, ...] = ()
+else:
+    _PLUGIN_ARGS = ("-p", "oracle.pytest_plugin")
+
+
+_SUITE = """
+import pytest
+
+
+def test_ok():
+    pass
+
+
+def test_broken():
+    assert 1 == 2, "numbers differ"
+
+
+@pytest.mark.skip(reason="not today")
+def test_skipped():
+    pass
+
+
+@pytest.fixture
+def bad_fixture():
+    raise RuntimeError("setup exploded")
+
+
+def test_setup_error(bad_fixture):
+    pass
+
+
+@pytest.mark.parametrize("n", range(5))
+def test_many(n):
+    pass
+"""
+
+
+def _case_spans(path: Path) -> dict[str, object]:
+    return {span.attributes["oracle.pytest.nodeid"]: span for span in read_span_file(path)}
+
+
+def test_plugin_emits_one_case_span_per_test(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_suite=_SUITE)
+    evidence = pytester.path / "evidence.jsonl"
+    result = pytester.runpytest(
+        *_PLUGIN_ARGS, f"--oracle-evidence-file={evidence}", "--oracle-run-id=run-plugin",
+        "--oracle-batch-size=2",
+    )
+    result.assert_outcomes(passed=6, failed=1, skipped=1, errors=1)
+
+    spans = _case_spans(evidence)
+    assert len(spans) == 9
+    assert [spans[f"test_suite.py::test_many[{n}]"].attributes["oracle.seq"] for n in range(5)] == [5, 6, 7, 8, 9]
+    assert spans["test_suite.py::test_ok"].attributes["oracle.seq"] == 1
+    assert {span.attributes["oracle.run_id"] for span in spans.values()} == {"run-plugin"}
+
+    def case(nodeid: str) -> dict:
+        return next(e.attributes for e in spans[nodeid].events if e.name == "oracle.pytest.case")
+
+    assert case("test_suite.py::test_ok")["oracle.pytest.outcome"] == "pass"
+    assert case("test_suite.py::test_skipped")["oracle.pytest.outcome"] == "skip"
+    broken = case("test_suite.py::test_broken")
+    assert broken["oracle.pytest.outcome"] == "fail"
+    assert "numbers differ" in broken["oracle.pytest.failure_message"]
+    errored = case("test_suite.py::test_setup_error")
+    assert errored["oracle.pytest.outcome"] == "fail"
+    assert "setup exploded" in errored["oracle.pytest.failure_message"]
+
+
+def test_teardown_failure_marks_the_case_failed(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        test_teardown="""
+import pytest
+
+
+@pytest.fixture
+def leaky():
+    yield
+    raise RuntimeError("teardown exploded")
+
+
+def test_leaky(leaky):
+    pass
+
+
+def test_fine():
+    pass
+"""
+    )
+    evidence = pytester.path / "evidence.jsonl"
+    result = pytester.runpytest(*_PLUGIN_ARGS, f"--oracle-evidence-file={evidence}")
+    result.assert_outcomes(passed=2, errors=1)
+
+    spans = _case_spans(evidence)
+    assert len(spans) == 2
+
+    def case(nodeid: str) -> dict:
+        return next(e.attributes for e in spans[nodeid].events if e.name == "oracle.pytest.case")
+
+    leaky = case("test_teardown.py::test_leaky")
+    assert leaky["oracle.pytest.outcome"] == "fail"
+    assert "teardown exploded" in leaky["oracle.pytest.failure_message"]
+    assert case("test_teardown.py::test_fine")["oracle.pytest.outcome"] == "pass"
+
+
+def test_plugin_is_inert_without_options(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_suite=_SUITE)
+    result = pytester.runpytest(*_PLUGIN_ARGS)
+    result.assert_outcomes(passed=6, failed=1, skipped=1, errors=1)
+    assert pytester.parseconfig(*_PLUGIN_ARGS).pluginmanager.get_plugin("oracle-evidence") is None
+    assert not list(pytester.path.glob("*.jsonl"))
+
+
+def test_worker_files_are_suffixed_by_worker_id() -> None:
+    assert _worker_path("out/evidence.jsonl", None) == "out/evidence.jsonl"
+    assert _worker_path("out/evidence.jsonl", "gw3") == str(Path("out/evidence.gw3.jsonl"))
+
+
+def test_only_xdist_workers_write_evidence() -> None:
+    assert _is_xdist_controller(SimpleNamespace(option=SimpleNamespace(numprocesses=4)))
+    assert not _is_xdist_controller(SimpleNamespace(option=SimpleNamespace(numprocesses=4), workerinput={}))
+    assert not _is_xdist_controller(SimpleNamespace(option=SimpleNamespace(numprocesses=0)))
+    assert not _is_xdist_controller(SimpleNamespace(option=SimpleNamespace()))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime, materialize_dsa_steps
+from oracle.adapters import trace_snoop
+
+
+def _insertion_sort(items: list[int]) -> list[int]:
+    out = list(items)
+    for i in range(1, len(out)):
+        key = out[i]
+        j = i - 1
+        while j >= 0 and out[j] > key:
+            out[j + 1] = out[j]
+            j -= 1
+        out[j + 1] = key
+    return out
+
+
+def _attrs(span, name: str) -> list[dict]:
+    return [dict(e.attributes) for e in span.events if e.name == name]
+
+
+def test_live_snoop_block_records_lines_and_changed_variables() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    with trace_snoop(rt, run_id="run-snoop", seq=1, watch=("total",), batch_size=3, run_label="live") as live:
+        total = 0
+        for n in range(3):
+            total += n
+    assert total == 3
+
+    span = live.span
+    lines = _attrs(span, "oracle.snoop.event")
+    assert [attrs["oracle.snoop.message"] for attrs in lines[:3]] == ["total = 0", "for n in range(3):", "total += n"]
+    assert all(attrs["code.filepath"] == __file__ for attrs in lines)
+    variables = _attrs(span, "oracle.snoop.variable")
+    assert [(v["oracle.snoop.variable"], v["oracle.snoop.value"]) for v in variables] == [
+        ("total", "0"),
+        ("total", "1"),
+        ("total", "3"),
+    ]
+    traced = [e for e in span.events if e.name in ("oracle.snoop.event", "oracle.snoop.variable")]
+    seqs = [e.attributes["oracle.adapter.seq"] for e in traced]
+    assert seqs == list(range(1, span.attributes["oracle.snoop.count"] + 1))
+    assert [e.name for e in traced[:4]] == [
+        "oracle.snoop.event",
+        "oracle.snoop.event",
+        "oracle.snoop.variable",
+        "oracle.snoop.event",
+    ]
+    assert _attrs(span, "oracle.invariant")[0]["oracle.invariant.status"] == "pass"
+    assert span.attributes["oracle.snoop.sampled_out"] == 0
+    assert materialize_dsa_steps(rt.spans)["steps"][0]["adapter_source"] == "snoop.live"
+
+
+def test_live_snoop_decorator_samples_hot_lines() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    before = sys.gettrace()
+    traced = trace_snoop(rt, run_id="run-snoop", seq=2, watch=("out",), sample_every=5, max_per_line=2, max_repr=12)(
+        _insertion_sort
+    )
+    assert traced(list(range(60, 0, -1))) == list(range(1, 61))
+
+    (span,) = rt.spans
+    lines = _attrs(span, "oracle.snoop.event")
+    per_line: dict[int, int] = {}
+    for attrs in lines:
+        per_line[attrs["code.lineno"]] = per_line.get(attrs["code.lineno"], 0) + 1
+    assert max(per_line.values()) <= 2
+    assert lines[0]["oracle.snoop.message"] == ">>> call _insertion_sort"
+    assert span.attributes["oracle.snoop.seen"] > 3000
+    assert span.attributes["oracle.snoop.sampled_out"] > span.attributes["oracle.snoop.seen"] - 50
+    values = [v["oracle.snoop.value"] for v in _attrs(span, "oracle.snoop.variable")]
+    assert values and all(len(value) <= 12 for value in values)
+    assert sys.gettrace() is before
+
+
+def test_live_snoop_keeps_feeding_the_tracers_it_replaces() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    seen: list[tuple[str, str]] = []
+
+    def local(frame, event, arg):
+        seen.append((frame.f_code.co_name, event))
+        return local
+
+    def outer(frame, event, arg):
+        if frame.f_code is _insertion_sort.__code__:
+            return local
+        return None
+
+    before = sys.gettrace()
+    frame = sys._getframe()
+    sys.settrace(outer)
+    frame.f_trace = local
+    try:
+        with trace_snoop(rt, run_id="run-snoop", seq=4, depth=2) as live:
+            _insertion_sort([2, 1])
+        assert sys.gettrace() is outer
+        assert frame.f_trace is local
+    finally:
+        sys.settrace(before)
+        frame.f_trace = None
+
+    assert ("_insertion_sort", "line") in seen and ("_insertion_sort", "return") in seen
+    assert ("test_live_snoop_keeps_feeding_the_tracers_it_replaces", "line") in seen
+    messages = [attrs["oracle.snoop.message"] for attrs in _attrs(live.span, "oracle.snoop.event")]
+    assert ">>> call _insertion_sort" in messages
+    assert _attrs(live.span, "oracle.invariant")[0]["oracle.invariant.status"] == "pass"
+
+
+def test_live_snoop_is_inert_when_recording_is_off() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none", "ORACLE_RECORDING_LEVEL": "off"})
+    before = sys.gettrace()
+    with trace_snoop(rt, run_id="run-snoop", seq=3) as live:
+        assert sys.gettrace() is before
+        _insertion_sort([3, 2, 1])
+    assert live.tally.count == 0 and rt.spans == []
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime, RingSpanStore, SpillSpanStore, materialize_dsa_steps
+from oracle.adapters import emit_hunter_events
+
+
+def _emit_steps(rt: OTelRuntime, count: int) -> None:
+    for seq in range(1, count + 1):
+        emit_hunter_events(
+            rt,
+            run_id="run-store",
+            seq=seq,
+            events=[{"kind": "call", "function": "dfs", "filepath": "algo.py", "lineno": seq}],
+            run_label="store",
+        )
+
+
+def test_ring_span_store_caps_retained_spans() -> None:
+    store = RingSpanStore(max_spans=3)
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_store=store)
+
+    _emit_steps(rt, 5)
+
+    assert len(rt.spans) == 3
+    assert store.dropped == 2
+    materialized = materialize_dsa_steps(rt.spans)
+    assert [step["seq"] for step in materialized["steps"]] == [3, 4, 5]
+
+
+def test_spill_span_store_reads_back_spilled_spans(tmp_path: Path) -> None:
+    segment = tmp_path / "spans.jsonl"
+    with SpillSpanStore(memory_budget_bytes=4096, segment_path=segment) as store:
+        rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_store=store)
+        rt.set_provenance_cell("nb-spill", "cell-1")
+
+        _emit_steps(rt, 20)
+
+        assert len(rt.spans) == 20
+        assert store.spilled > 0
+        assert store.memory_bytes <= 4096
+        assert segment.stat().st_size > 0
+
+        materialized = materialize_dsa_steps(rt.spans)
+        assert [step["seq"] for step in materialized["steps"]] == list(range(1, 21))
+        assert materialized["steps"][0]["guards"][0]["status"] == "pass"
+        assert materialized["steps"][0]["provenance"]["oracle.notebook_id"] == "nb-spill"
+
+
+def test_spill_span_store_spills_values_json_cannot_represent(tmp_path: Path) -> None:
+    with SpillSpanStore(memory_budget_bytes=0, segment_path=tmp_path / "spans.jsonl") as store:
+        rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_store=store)
+        with rt.step_span(run_id="run-store", step_id="odd", seq=1, attributes={"oracle.tags": {"a"}}):
+            pass
+
+        assert store.spilled == 1
+        [span] = list(rt.spans)
+        assert span.attributes["oracle.tags"] == "{'a'}"
+
+
+def test_spill_span_store_ignores_earlier_contents_of_a_reused_segment(tmp_path: Path) -> None:
+    segment = tmp_path / "spans.jsonl"
+    for _ in range(2):
+        with SpillSpanStore(memory_budget_bytes=0, segment_path=segment) as store:
+            rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_store=store)
+            _emit_steps(rt, 3)
+
+            assert len(rt.spans) == 3
+            assert [span.attributes["oracle.seq"] for span in rt.spans] == [1, 2, 3]
+
+
+def test_bounded_stores_apply_their_limits_as_spans_close() -> None:
+    import threading
+
+    store = RingSpanStore(max_spans=4)
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"}, span_store=store)
+
+    def worker() -> None:
+        _emit_steps(rt, 10)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store) == 4
+    assert store.dropped == 36
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+ORACLE_SRC = ROOT / "src"
+if str(ORACLE_SRC) not in sys.path:
+    sys.path.insert(0, str(ORACLE_SRC))
+
+from oracle import OTelRuntime
+from oracle.adapters import ingest_viztracer_file
+from oracle.adapters.viztracer_file import iter_trace_events, iter_viztracer_records
+
+
+def _write_trace(path: Path, events: list[dict], *, wrapped: bool = True) -> None:
+    payload = {"traceEvents": events, "viztracer_metadata": {"version": "0.16"}} if wrapped else events
+    path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+
+
+def test_chrome_trace_events_map_to_viztracer_records(tmp_path: Path) -> None:
+    events = [
+        {"ph": "M", "name": "process_name", "pid": 1, "tid": 1, "args": {"name": "main"}},
+        {"ph": "X", "name": "sort ✓", "pid": 1, "tid": 1, "ts": 10.4, "dur": 5.6},
+        {"ph": "B", "name": "outer", "pid": 1, "tid": 1, "ts": 20},
+        {"ph": "B", "name": "inner", "pid": 1, "tid": 1, "ts": 22},
+        {"ph": "B", "name": "other-thread", "pid": 1, "tid": 2, "ts": 23},
+        {"ph": "E", "pid": 1, "tid": 1, "ts": 25},
+        {"ph": "E", "pid": 1, "tid": 2, "ts": 40},
+        {"ph": "E", "pid": 1, "tid": 1, "ts": 30},
+        {"ph": "E", "pid": 1, "tid": 3, "ts": 31},
+        {"ph": "i", "name": "mark", "pid": 1, "tid": 1, "ts": 32},
+    ]
+    path = tmp_path / "trace.json"
+    _write_trace(path, events)
+
+    # A tiny chunk size forces events and multi-byte characters across chunk boundaries.
+    assert list(iter_trace_events(path, chunk_size=7)) == events
+    records = list(iter_viztracer_records(iter_trace_events(path, chunk_size=7)))
+    assert records == [
+        {"name": "sort ✓", "start_us": 10, "duration_us": 6, "pid": 1, "tid": 1},
+        {"name": "inner", "start_us": 22, "duration_us": 3, "pid": 1, "tid": 1},
+        {"name": "other-thread", "start_us": 23, "duration_us": 17, "pid": 1, "tid": 2},
+        {"name": "outer", "start_us": 20, "duration_us": 10, "pid": 1, "tid": 1},
+    ]
+
+    bare = tmp_path / "bare.json"
+    _write_trace(bare, events, wrapped=False)
+    assert list(iter_trace_events(bare, chunk_size=5)) == events
+
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    span = ingest_viztracer_file(rt, path, run_id="run-viz-file", seq=1, run_label="viz", chunk_size=16)
+    assert span.attributes["oracle.viztracer.count"] == 4
+    names = [e.attributes["oracle.viztracer.name"] for e in span.events if e.name == "oracle.viztracer.event"]
+    assert names == ["sort ✓", "inner", "other-thread", "outer"]
+
+
+def test_rollup_summarizes_per_function_and_keeps_slowest_calls(tmp_path: Path) -> None:
+    # Two calls of `outer` each wrap two `inner` calls on thread 1; `worker`
+    # runs on thread 2 overlapping them, so it must not count as a child.
+    events = []
+    for base in (0, 100):
+        events += [
+            {"ph": "X", "name": "inner", "pid": 1, "tid": 1, "ts": base + 10, "dur": 5},
+            {"ph": "X", "name": "inner", "pid": 1, "tid": 1, "ts": base + 20, "dur": 15},
+            {"ph": "X", "name": "outer", "pid": 1, "tid": 1, "ts": base, "dur": 50},
+        ]
+    events.append({"ph": "X", "name": "worker", "pid": 1, "tid": 2, "ts": 5, "dur": 120})
+    path = tmp_path / "rollup.json"
+    _write_trace(path, events)
+
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    span = ingest_viztracer_file(rt, path, run_id="run-viz-rollup", seq=1, rollup=True, top_k=2)
+    assert span.attributes["oracle.viztracer.count"] == 7
+    assert span.attributes["oracle.viztracer.functions"] == 3
+
+    summaries = {
+        e.attributes["oracle.viztracer.name"]: e.attributes for e in span.events if e.name == "oracle.viztracer.rollup"
+    }
+    assert list(summaries) == ["worker", "outer", "inner"]
+    outer = summaries["outer"]
+    assert (outer["oracle.viztracer.count"], outer["oracle.viztracer.total_us"]) == (2, 100)
+    assert outer["oracle.viztracer.self_us"] == 60
+    inner = summaries["inner"]
+    assert inner["oracle.viztracer.self_us"] == inner["oracle.viztracer.total_us"] == 40
+    assert (inner["oracle.viztracer.min_us"], inner["oracle.viztracer.max_us"]) == (5, 15)
+    assert inner["oracle.viztracer.mean_us"] == 10
+    assert inner["oracle.viztracer.p95_us"] == 15
+    assert summaries["worker"]["oracle.viztracer.self_us"] == 120
+
+    slowest = [e.attributes for e in span.events if e.name == "oracle.viztracer.event"]
+    assert [(a["oracle.viztracer.name"], a["oracle.viztracer.duration_us"]) for a in slowest] == [
+        ("outer", 50),
+        ("worker", 120),
+    ]
+    assert [a["oracle.adapter.seq"] for a in slowest] == [3, 7]
+
+    with pytest.raises(ValueError):
+        ingest_viztracer_file(rt, path, run_id="run-viz-rollup", seq=2, rollup=True, top_k=-1)
+
+
+def test_truncated_trace_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "broken.json"
+    path.write_text('{"traceEvents": [{"ph": "X", "name": "a", "ts": 1, "dur": 2}, {"ph": "X"', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_trace_events(path, chunk_size=8))
+
+
+def test_streaming_parse_memory_stays_below_file_size(tmp_path: Path) -> None:
+    path = tmp_path / "large.json"
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write('{"traceEvents": [')
+        for n in range(60_000):
+            if n:
+                handle.write(",")
+            handle.write(json.dumps({"ph": "X", "name": f"func_{n % 50}", "pid": 1, "tid": 1, "ts": n, "dur": 1}))
+        handle.write("]}")
+    file_size = path.stat().st_size
+
+    tracemalloc.start()
+    count = sum(1 for _ in iter_viztracer_records(iter_trace_events(path, chunk_size=64 * 1024)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == 60_000
+    assert peak < file_size / 4
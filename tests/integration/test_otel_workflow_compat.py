@@ -166,3 +166,21 @@ def test_shared_env_config_model_supports_local_and_otlp() -> None:
     assert local_cfg.traces_exporter == "console"
     assert otlp_cfg.traces_exporter == "otlp"
     assert otlp_cfg.otlp_endpoint == "http://localhost:4318"
+
+
+def test_materialized_steps_report_per_step_latency() -> None:
+    rt = OTelRuntime.from_env({"OTEL_TRACES_EXPORTER": "none"})
+    for seq in range(1, 21):
+        with rt.step_span(run_id="run-latency", step_id="sort" if seq % 2 else "merge", seq=seq, run_label="latency"):
+            rt.emit_guard("n >= 0", "pass")
+
+    materialized = materialize_dsa_steps(rt.spans)
+    step = materialized["steps"][0]
+    assert step["duration_ns"] == step["end_ns"] - step["start_ns"] >= 0
+
+    latency = materialized["latency"]
+    assert set(latency) == {"sort", "merge"}
+    sort_durations = sorted(s["duration_ns"] for s in materialized["steps"] if s["step_id"] == "sort")
+    assert latency["sort"]["count"] == 10
+    assert latency["sort"]["p50_ns"] == sort_durations[4]
+    assert latency["sort"]["p95_ns"] == latency["sort"]["p99_ns"] == sort_durations[-1]